@@ -1,8 +1,25 @@
 """Versioning"""
 
-import importlib.metadata
+import importlib
 
-try:
-    __version__ = importlib.metadata.version(__name__)
-except importlib.metadata.PackageNotFoundError:
-    pass
+# The subpackages are imported on first access, like dolbyio_rest_apis.streaming
+_SUBPACKAGES = ('core', 'media', 'streaming')
+
+def __getattr__(name: str): # pylint: disable=invalid-name
+    if name == '__version__':
+        # importlib.metadata scans the installed packages, only do it when the version is requested
+        from importlib import metadata
+        try:
+            version = metadata.version(__name__)
+        except metadata.PackageNotFoundError as e:
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from e
+        globals()['__version__'] = version
+        return version
+
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f'{__name__}.{name}')
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__(): # pylint: disable=invalid-name
+    return sorted(list(globals()) + list(_SUBPACKAGES))
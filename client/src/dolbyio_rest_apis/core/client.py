@@ -0,0 +1,76 @@
+"""
+dolbyio_rest_apis.core.client
+~~~~~~~~~~~~~~~
+
+This module contains the base class for the long-lived API clients.
+"""
+
+import functools
+import inspect
+from types import ModuleType, TracebackType
+from typing import Any, Callable, Optional, Type
+from .http_context import HttpContext
+
+def _is_api_function(func: Any) -> bool:
+    # The API functions are coroutines, or asynchronous generators for the functions iterating over lists
+    return inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+
+class BoundModule:
+    r"""
+    Exposes the public functions of an API module bound to an HTTP context.
+
+    Calling `client.enhance.start(...)` is equivalent to calling
+    `enhance.start(..., http_context=client.http_context)`.
+    """
+
+    def __init__(self, module: ModuleType, http_context: HttpContext):
+        self._module = module
+        self._http_context = http_context
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        func = getattr(self._module, name)
+        if name.startswith('_') or not _is_api_function(func):
+            raise AttributeError(f'{self._module.__name__} has no API function named {name!r}')
+
+        bound_func = functools.partial(func, http_context=self._http_context)
+        # Cache the bound function for the next calls
+        setattr(self, name, bound_func)
+        return bound_func
+
+    def __dir__(self):
+        return [
+            name for name, value in vars(self._module).items()
+            if not name.startswith('_') and _is_api_function(value)
+        ]
+
+class Client:
+    r"""
+    Base class for the clients that own a single :class:`HttpContext` for their lifetime,
+    so the underlying connections are reused across API calls.
+    """
+
+    def __init__(self, http_context: HttpContext):
+        self._http_context = http_context
+
+    @property
+    def http_context(self) -> HttpContext:
+        r"""The HTTP context used by this client."""
+        return self._http_context
+
+    def _bind(self, module: ModuleType) -> BoundModule:
+        return BoundModule(module, self._http_context)
+
+    async def close(self):
+        r"""Closes the underlying HTTP context and its connections."""
+        await self._http_context.close()
+
+    async def __aenter__(self) -> 'Client':
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
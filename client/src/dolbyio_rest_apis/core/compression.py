@@ -0,0 +1,142 @@
+"""
+dolbyio_rest_apis.core.compression
+~~~~~~~~~~~~~~~
+
+This module contains the negotiation and decoding of the compressed responses.
+"""
+
+from dataclasses import dataclass, field
+import threading
+from typing import Dict
+import zlib
+
+try:
+    import brotli
+except ImportError: # Optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+def get_accept_encoding() -> str:
+    r"""Gets the value of the `Accept-Encoding` header for the JSON requests, brotli is only offered when installed."""
+
+    if brotli is not None:
+        return 'br, gzip'
+    return 'gzip'
+
+class ContentDecoder:
+    r"""Incremental decoder of a response body, according to its `Content-Encoding` header."""
+
+    def __init__(self, content_encoding: str | None):
+        r"""
+        Args:
+            content_encoding: Value of the `Content-Encoding` header of the response.
+
+        Raises:
+            ValueError: If the encoding is not supported.
+        """
+
+        self.encoding = (content_encoding or 'identity').strip().lower()
+        # First bytes of a deflate body, until its zlib header is checked
+        self._deflate_start: bytes | None = None
+
+        if self.encoding == 'identity':
+            self._decompressor = None
+        elif self.encoding in ('gzip', 'x-gzip'):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == 'deflate':
+            # Some servers send raw deflate data instead of the zlib format, told apart by the zlib header
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+            self._deflate_start = b''
+        elif self.encoding == 'br' and brotli is not None:
+            self._decompressor = brotli.Decompressor()
+        else:
+            raise ValueError(f'Unsupported content encoding {content_encoding!r}.')
+
+    def decompress(self, chunk: bytes) -> bytes:
+        r"""
+        Decodes the next part of the body.
+
+        Args:
+            chunk: Bytes received from the server.
+
+        Returns:
+            The decoded bytes available so far.
+        """
+
+        if self._decompressor is None:
+            return chunk
+        if self.encoding == 'br':
+            return self._decompressor.process(chunk)
+        if self._deflate_start is not None:
+            return self._decompress_deflate_start(chunk)
+        return self._decompressor.decompress(chunk)
+
+    def _decompress_deflate_start(self, chunk: bytes) -> bytes:
+        self._deflate_start += chunk
+        try:
+            data = self._decompressor.decompress(chunk)
+        except zlib.error:
+            # No zlib header, decode the raw deflate data received so far
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            self._deflate_start, chunk = None, self._deflate_start
+            return self._decompressor.decompress(chunk)
+
+        if len(self._deflate_start) >= 2:
+            # The zlib header is valid
+            self._deflate_start = None
+        return data
+
+    def flush(self) -> bytes:
+        r"""Decodes the end of the body, once all the bytes have been received."""
+
+        if self._decompressor is None or self.encoding == 'br':
+            return b''
+        return self._decompressor.flush()
+
+@dataclass
+class CompressionStats:
+    r"""
+    The :class:`CompressionStats` object, the number of bytes of the JSON responses as received and once decoded.
+
+    Attributes:
+        nb_responses: Number of responses read.
+        nb_compressed_responses: Number of responses received compressed.
+        wire_bytes: Number of bytes received from the server.
+        decoded_bytes: Number of bytes once decoded.
+        wire_bytes_per_encoding: Number of bytes received from the server, per content encoding.
+        decoded_bytes_per_encoding: Number of bytes once decoded, per content encoding.
+    """
+
+    nb_responses: int = 0
+    nb_compressed_responses: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    wire_bytes_per_encoding: Dict[str, int] = field(default_factory=dict)
+    decoded_bytes_per_encoding: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def saved_bytes(self) -> int:
+        r"""Number of bytes that did not have to be transferred thanks to the compression."""
+        return self.decoded_bytes - self.wire_bytes
+
+    def record(self, encoding: str, wire_bytes: int, decoded_bytes: int):
+        r"""
+        Adds a response to the statistics.
+
+        Args:
+            encoding: Content encoding of the response.
+            wire_bytes: Number of bytes received from the server.
+            decoded_bytes: Number of bytes once decoded.
+        """
+
+        with self._lock:
+            self.nb_responses += 1
+            if encoding != 'identity':
+                self.nb_compressed_responses += 1
+            self.wire_bytes += wire_bytes
+            self.decoded_bytes += decoded_bytes
+            self.wire_bytes_per_encoding[encoding] = self.wire_bytes_per_encoding.get(encoding, 0) + wire_bytes
+            self.decoded_bytes_per_encoding[encoding] = self.decoded_bytes_per_encoding.get(encoding, 0) + decoded_bytes
@@ -0,0 +1,52 @@
+"""
+dolbyio_rest_apis.core.connection_pool
+~~~~~~~~~~~~~~~
+
+This module contains the configuration of the HTTP connection pool.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import TCPConnector
+
+@dataclass(frozen=True)
+class ConnectionPoolConfig:
+    r"""
+    The :class:`ConnectionPoolConfig` object, the settings of the connection pool of an HTTP context.
+
+    Attributes:
+        limit: Maximum number of simultaneous connections, `0` for no limit.
+        limit_per_host: Maximum number of simultaneous connections to the same host, `0` for no limit.
+        keepalive_timeout: Number of seconds an idle connection is kept open to be reused.
+        ttl_dns_cache: Number of seconds the resolved DNS entries are cached, `None` to cache them forever.
+        force_close: Close the connections after each request instead of keeping them alive.
+        enable_cleanup_closed: Abort the SSL connections that the server did not close properly.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    ttl_dns_cache: int | None = 10
+    force_close: bool = False
+    enable_cleanup_closed: bool = False
+
+    def create_connector(self) -> 'TCPConnector':
+        r"""Creates the :class:`TCPConnector` matching this configuration."""
+
+        from aiohttp import TCPConnector
+
+        kwargs = {}
+        if not self.force_close:
+            # aiohttp refuses a keep-alive timeout on connections that are closed after each request
+            kwargs['keepalive_timeout'] = self.keepalive_timeout
+
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            force_close=self.force_close,
+            enable_cleanup_closed=self.enable_cleanup_closed,
+            **kwargs,
+        )
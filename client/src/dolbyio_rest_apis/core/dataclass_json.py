@@ -0,0 +1,428 @@
+"""
+dolbyio_rest_apis.core.dataclass_json
+~~~~~~~~~~~~~~~
+
+This module contains the conversion of the data classes of the models from and to JSON dictionaries,
+compatible with `dataclasses_json`.
+
+The `from_dict` and `to_dict` functions are generated once per class from its fields,
+where `dataclasses_json` inspects the fields and their types on every call.
+`dataclasses_json` is only imported on first use of `from_json`, `to_json` and `schema`,
+or for the types the generated functions do not support, through its public `DataClassJsonMixin` methods.
+
+The functions are compiled with `exec` from source code built only out of the names and the keys
+of the fields of the data classes of the models, written with `repr`, and of the names of local variables.
+The default values and the types are passed through the namespace of the functions, never as source code,
+and nothing received from the server is part of the code.
+"""
+
+import copy
+from collections.abc import Collection, Mapping
+import dataclasses
+import enum
+import re
+import threading
+import types
+import typing
+from typing import Any, Callable, Dict, List, Type, TypeVar
+import warnings
+
+T = TypeVar('T')
+
+class LetterCase(enum.Enum):
+    r"""Letter case of the JSON keys, the names of :class:`dataclasses_json.LetterCase`."""
+
+    CAMEL = 'camel'
+    KEBAB = 'kebab'
+    SNAKE = 'snake'
+    PASCAL = 'pascal'
+
+# Same conversions as dataclasses_json.stringcase, for the names of the fields
+def _camel_case(name: str) -> str:
+    name = re.sub(r'^[\-_\.]', '', name)
+    if not name:
+        return name
+    return name[0].lower() + re.sub(r'[\-_\.\s]([a-z0-9])', lambda matched: matched.group(1).upper(), name[1:])
+
+def _snake_case(name: str) -> str:
+    name = re.sub(r'[\-\.\s]', '_', name)
+    if not name:
+        return name
+    return name[0].lower() + re.sub(r'[A-Z0-9]', lambda matched: '_' + matched.group(0).lower(), name[1:])
+
+def _kebab_case(name: str) -> str:
+    return _snake_case(name).replace('_', '-')
+
+def _pascal_case(name: str) -> str:
+    name = _camel_case(name)
+    return name[:1].upper() + name[1:]
+
+_KEY_ENCODERS: Dict[LetterCase, Callable[[str], str]] = {
+    LetterCase.CAMEL: _camel_case,
+    LetterCase.KEBAB: _kebab_case,
+    LetterCase.SNAKE: _snake_case,
+    LetterCase.PASCAL: _pascal_case,
+}
+
+# Values encoded as they are, any other value goes through _encode_value
+_ATOMIC_TYPES = frozenset((str, int, float, bool, type(None)))
+
+_MISSING = object()
+
+_lock = threading.RLock()
+# Letter case of the models decorated with dataclass_json
+_letter_cases: Dict[type, LetterCase | None] = {}
+# Models still waiting for dataclasses_json
+_pending_classes: List[type] = []
+# Generated functions, None when a class is not supported
+_decoders: Dict[type, Callable[..., Any] | None] = {}
+_encoders: Dict[type, Callable[..., Any] | None] = {}
+
+class _UnsupportedType(Exception):
+    pass
+
+def _import_dataclasses_json():
+    r"""Imports dataclasses_json and applies it to the models, keeping the generated functions."""
+
+    with _lock:
+        import dataclasses_json
+
+        for cls in _pending_classes:
+            generated_methods = { name: cls.__dict__[name] for name in ('from_dict', 'to_dict') }
+            letter_case = _letter_cases[cls]
+            dataclasses_json.dataclass_json(
+                cls,
+                letter_case=None if letter_case is None else getattr(dataclasses_json.LetterCase, letter_case.name),
+            )
+            for name, method in generated_methods.items():
+                setattr(cls, name, method)
+        _pending_classes.clear()
+
+        return dataclasses_json
+
+# The methods of DataClassJsonMixin, called on any data class like the ones added by dataclasses_json.dataclass_json
+def _from_dict_with_dataclasses_json(cls: Type[T], kvs: Any, *, infer_missing: bool=False) -> T:
+    return _import_dataclasses_json().DataClassJsonMixin.from_dict.__func__(cls, kvs, infer_missing=infer_missing)
+
+def _to_dict_with_dataclasses_json(self: Any, encode_json: bool=False) -> Dict[str, Any]:
+    return _import_dataclasses_json().DataClassJsonMixin.to_dict(self, encode_json=encode_json)
+
+def _warn_none(cls: type, name: str, infer_missing: bool):
+    # Same warnings as dataclasses_json
+    warning = f'value of non-optional type {name} detected when decoding {cls.__name__}'
+    if infer_missing:
+        warnings.warn(
+            f'Missing {warning} and was defaulted to None by infer_missing=True. '
+            f'Set infer_missing=False (the default) to prevent this behavior.',
+            RuntimeWarning,
+        )
+    else:
+        warnings.warn(f'\'NoneType\' object {warning}.', RuntimeWarning)
+
+def _get_key_encoder(cls: type) -> Callable[[str], str] | None:
+    r"""Gets the conversion of the field names to the JSON keys, raises :class:`_UnsupportedType` for unknown classes."""
+
+    if cls in _letter_cases:
+        letter_case = _letter_cases[cls]
+        return None if letter_case is None else _KEY_ENCODERS[letter_case]
+
+    if not dataclasses.is_dataclass(cls) or getattr(cls, 'dataclass_json_config', None) is not None:
+        # Configured for dataclasses_json, let it handle the class
+        raise _UnsupportedType(cls)
+    # A data class without configuration uses the names of the fields
+    return None
+
+def _get_fields(cls: type) -> List[dataclasses.Field]:
+    fields = dataclasses.fields(cls)
+    if any('dataclasses_json' in field.metadata for field in fields):
+        # Field overrides, like encoders or exclusions, are only supported by dataclasses_json
+        raise _UnsupportedType(cls)
+    return fields
+
+def _is_optional(type_: Any) -> bool:
+    return typing.get_origin(type_) in (typing.Union, types.UnionType) and type(None) in typing.get_args(type_)
+
+def _add_to_namespace(namespace: Dict[str, Any], value: Any) -> str:
+    name = f'_v{len(namespace)}'
+    namespace[name] = value
+    return name
+
+def _get_decode_expression(type_: Any, var: str, namespace: Dict[str, Any], depth: int=0) -> str:
+    r"""Gets the Python expression decoding the value in the variable `var`, with the rules of dataclasses_json."""
+
+    if type_ is Any:
+        return var
+
+    origin = typing.get_origin(type_)
+    args = typing.get_args(type_)
+
+    def keep_none(expression: str) -> str:
+        # The null items of the lists are kept by dataclasses_json for the models, lists and dictionaries,
+        # the null values of the fields are already checked by the caller
+        return expression if depth == 0 else f'(None if {var} is None else {expression})'
+
+    if origin in (typing.Union, types.UnionType):
+        if len(args) == 2 and type(None) in args:
+            item_type = args[0] if args[1] is type(None) else args[1]
+            return f'(None if {var} is None else {_get_decode_expression(item_type, var, namespace, depth)})'
+        if dict in args and not any(dataclasses.is_dataclass(arg) for arg in args):
+            # Kept as it is by dataclasses_json
+            return var
+        raise _UnsupportedType(type_)
+
+    if type_ in (str, int, float, bool):
+        # dataclasses_json converts the values to the type of the field
+        type_name = _add_to_namespace(namespace, type_)
+        return f'({var} if isinstance({var}, {type_name}) else {type_name}({var}))'
+
+    if dataclasses.is_dataclass(type_) and isinstance(type_, type):
+        # The nested models are decoded by their own generated function, or by dataclasses_json
+        type_name = _add_to_namespace(namespace, type_)
+        return keep_none(
+            f'({var} if {var}.__class__ is not dict and _is_dataclass({var}) '
+            f'else _decode({type_name}, {var}, infer_missing))'
+        )
+
+    if type_ is list or origin is list:
+        if not args:
+            return keep_none(f'list({var})')
+        item_var = f'_x{depth}'
+        item_expression = _get_decode_expression(args[0], item_var, namespace, depth + 1)
+        if item_expression == item_var:
+            return keep_none(f'list({var})')
+        return keep_none(f'[{item_expression} for {item_var} in {var}]')
+
+    if type_ is dict or (origin is dict and not args):
+        return keep_none(f'dict({var})')
+
+    raise _UnsupportedType(type_)
+
+def _create_decoder(cls: type) -> Callable[..., Any]:
+    key_encoder = _get_key_encoder(cls)
+    type_hints = typing.get_type_hints(cls)
+
+    namespace = {
+        '_MISSING': _MISSING,
+        '_decode': _decode,
+        '_is_dataclass': dataclasses.is_dataclass,
+        '_warn_none': _warn_none,
+    }
+    lines = [
+        'def from_dict(cls, kvs, *, infer_missing=False):',
+        '    if isinstance(kvs, cls):',
+        '        return kvs',
+        '    if kvs is None and infer_missing:',
+        '        kvs = {}',
+        '    get = kvs.get',
+    ]
+    arguments = []
+
+    for index, field in enumerate(_get_fields(cls)):
+        if not field.init:
+            continue
+
+        var = f'f{index}'
+        key = field.name if key_encoder is None else key_encoder(field.name)
+        field_type = type_hints[field.name]
+
+        lines.append(f'    {var} = get({key!r}, _MISSING)')
+        if key != field.name:
+            # dataclasses_json also accepts the name of the field
+            lines.append(f'    if {var} is _MISSING:')
+            lines.append(f'        {var} = get({field.name!r}, _MISSING)')
+
+        lines.append(f'    if {var} is _MISSING:')
+        if field.default is not dataclasses.MISSING:
+            lines.append(f'        {var} = {_add_to_namespace(namespace, field.default)}')
+        elif field.default_factory is not dataclasses.MISSING:
+            lines.append(f'        {var} = {_add_to_namespace(namespace, field.default_factory)}()')
+        else:
+            lines.append('        if not infer_missing:')
+            lines.append(f'            raise KeyError({field.name!r})')
+            lines.append(f'        {var} = None')
+
+        if _is_optional(field_type):
+            args = typing.get_args(field_type)
+            if len(args) == 2:
+                field_type = args[0] if args[1] is type(None) else args[1]
+            lines.append(f'    if {var} is not None:')
+        else:
+            lines.append(f'    if {var} is None:')
+            lines.append(f'        _warn_none(cls, {field.name!r}, infer_missing)')
+            lines.append('    else:')
+
+        expression = _get_decode_expression(field_type, var, namespace)
+        if expression == var:
+            lines.append('        pass')
+        else:
+            lines.append(f'        {var} = {expression}')
+
+        arguments.append(f'{field.name}={var}')
+
+    lines.append(f'    return cls({", ".join(arguments)})')
+
+    exec('\n'.join(lines), namespace) # pylint: disable=exec-used
+    decoder = namespace['from_dict']
+    decoder.__doc__ = f'Creates a :class:`{cls.__name__}` from a JSON dictionary.'
+    return decoder
+
+def _create_encoder(cls: type) -> Callable[..., Any]:
+    key_encoder = _get_key_encoder(cls)
+
+    namespace = {
+        '_ATOMIC_TYPES': _ATOMIC_TYPES,
+        '_encode_value': _encode_value,
+        '_to_dict_with_dataclasses_json': _to_dict_with_dataclasses_json,
+    }
+    lines = [
+        'def to_dict(self, encode_json=False):',
+        '    if encode_json:',
+        '        return _to_dict_with_dataclasses_json(self, encode_json)',
+    ]
+    items = []
+    keys = set()
+
+    for index, field in enumerate(_get_fields(cls)):
+        var = f'f{index}'
+        key = field.name if key_encoder is None else key_encoder(field.name)
+        if key in keys:
+            # dataclasses_json raises the error
+            raise _UnsupportedType(cls)
+        keys.add(key)
+
+        lines.append(f'    {var} = self.{field.name}')
+        lines.append(f'    if {var}.__class__ not in _ATOMIC_TYPES:')
+        lines.append(f'        {var} = _encode_value({var})')
+        items.append(f'{key!r}: {var}')
+
+    lines.append(f'    return {{{", ".join(items)}}}')
+
+    exec('\n'.join(lines), namespace) # pylint: disable=exec-used
+    encoder = namespace['to_dict']
+    encoder.__doc__ = 'Converts this object to a JSON dictionary.'
+    return encoder
+
+def _get_decoder(cls: type) -> Callable[..., Any] | None:
+    r"""Gets the generated `from_dict` of a class, or `None` if it must be decoded by dataclasses_json."""
+
+    try:
+        return _decoders[cls]
+    except KeyError:
+        pass
+
+    with _lock:
+        if cls not in _decoders:
+            try:
+                _decoders[cls] = _create_decoder(cls)
+            except _UnsupportedType:
+                _decoders[cls] = None
+        return _decoders[cls]
+
+def _get_encoder(cls: type) -> Callable[..., Any] | None:
+    r"""Gets the generated `to_dict` of a class, or `None` if it must be encoded by dataclasses_json."""
+
+    try:
+        return _encoders[cls]
+    except KeyError:
+        pass
+
+    with _lock:
+        if cls not in _encoders:
+            try:
+                _encoders[cls] = _create_encoder(cls)
+            except _UnsupportedType:
+                _encoders[cls] = None
+        return _encoders[cls]
+
+def _decode(cls: Type[T], kvs: Any, infer_missing: bool) -> T:
+    decoder = _get_decoder(cls)
+    if decoder is None:
+        return _from_dict_with_dataclasses_json(cls, kvs, infer_missing=infer_missing)
+    return decoder(cls, kvs, infer_missing=infer_missing)
+
+def _encode_value(value: Any) -> Any:
+    r"""Encodes a value like dataclasses_json, from its type at runtime."""
+
+    cls = value.__class__
+    if cls in _ATOMIC_TYPES:
+        return value
+
+    # Fast paths for the lists and the dictionaries of the models
+    if cls is list:
+        return [item if item.__class__ in _ATOMIC_TYPES else _encode_value(item) for item in value]
+    if cls is dict:
+        return {
+            key if key.__class__ in _ATOMIC_TYPES else _encode_value(key): item if item.__class__ in _ATOMIC_TYPES else _encode_value(item)
+            for key, item in value.items()
+        }
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        encoder = _get_encoder(cls)
+        if encoder is None:
+            return _to_dict_with_dataclasses_json(value)
+        return encoder(value)
+
+    if isinstance(value, Mapping):
+        return { _encode_value(key): _encode_value(item) for key, item in value.items() }
+
+    if isinstance(value, Collection) and not isinstance(value, (str, bytes, enum.Enum)):
+        return [_encode_value(item) for item in value]
+
+    return copy.deepcopy(value)
+
+class _DataclassJsonMethod:
+    r"""Placeholder of a method provided by dataclasses_json, replaced by the real one on first access."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type) -> Callable[..., Any]:
+        _import_dataclasses_json()
+        return getattr(owner if instance is None else instance, self._name)
+
+class _GeneratedMethod:
+    r"""Placeholder of `from_dict` or `to_dict`, replaced by the generated function on first access."""
+
+    def __init__(self, cls: type, name: str):
+        self._cls = cls
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type) -> Callable[..., Any]:
+        cls = self._cls
+        with _lock:
+            if cls.__dict__.get(self._name) is self:
+                if self._name == 'from_dict':
+                    decoder = _get_decoder(cls)
+                    setattr(cls, 'from_dict', classmethod(_from_dict_with_dataclasses_json if decoder is None else decoder))
+                else:
+                    encoder = _get_encoder(cls)
+                    setattr(cls, 'to_dict', _to_dict_with_dataclasses_json if encoder is None else encoder)
+
+        return getattr(owner if instance is None else instance, self._name)
+
+def dataclass_json(cls: Type[T]=None, *, letter_case: LetterCase | None = None) -> Type[T]:
+    r"""
+    Adds `from_dict`, `to_dict`, `from_json`, `to_json` and `schema` to a data class,
+    like :func:`dataclasses_json.dataclass_json`.
+
+    `from_dict` and `to_dict` are generated on first use,
+    `dataclasses_json` is only imported when one of the other methods is used.
+
+    Args:
+        cls: The data class.
+        letter_case: (Optional) Letter case of the JSON keys.
+    """
+
+    def wrap(cls: Type[T]) -> Type[T]:
+        with _lock:
+            _letter_cases[cls] = letter_case
+            for name in ('from_dict', 'to_dict'):
+                setattr(cls, name, _GeneratedMethod(cls, name))
+            for name in ('from_json', 'to_json', 'schema'):
+                setattr(cls, name, _DataclassJsonMethod(name))
+            _pending_classes.append(cls)
+        return cls
+
+    if cls is None:
+        return wrap
+    return wrap(cls)
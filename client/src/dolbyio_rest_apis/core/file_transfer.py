@@ -0,0 +1,410 @@
+"""
+dolbyio_rest_apis.core.file_transfer
+~~~~~~~~~~~~~~~
+
+This module contains the helpers to read and write the files uploaded and downloaded
+without blocking the event loop, and to report the progress of the transfers.
+"""
+
+import asyncio
+import collections
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+import json
+import os
+import threading
+import time
+from typing import AsyncIterator, BinaryIO, Callable
+
+# Size of the chunks read from the files to upload
+UPLOAD_CHUNK_SIZE: int = 1024 * 1024 # 1 MB
+
+# Number of chunks read in advance while the previous ones are sent
+UPLOAD_READ_AHEAD: int = 4
+
+# Size of the chunks written to the files downloaded
+DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024 # 1 MB
+
+# Number of byte ranges of a file downloaded at the same time
+DOWNLOAD_PARTS: int = 4
+
+# Smallest byte range downloaded on its own connection
+DOWNLOAD_PART_MIN_SIZE: int = 16 * 1024 * 1024 # 16 MB
+
+# Number of bytes written between two saves of the manifest of a download
+DOWNLOAD_CHECKPOINT_SIZE: int = 64 * 1024 * 1024 # 64 MB
+
+# Added to the path of a file being downloaded to get the path of its manifest
+DOWNLOAD_MANIFEST_SUFFIX: str = '.dlbdownload'
+
+@dataclass
+class TransferProgress:
+    r"""
+    The :class:`TransferProgress` object, the progress of a file upload or download.
+
+    Attributes:
+        file_path: Path of the local file.
+        total_bytes: Size of the file, `None` if unknown.
+        transferred_bytes: Number of bytes transferred so far, during the current attempt.
+        attempt: Number of the attempt, starting at 1, a retry starts the transfer over.
+        elapsed: Number of seconds since the start of the current attempt.
+        resumed_bytes: Number of bytes of a download already written by a previous call, included in `transferred_bytes`.
+    """
+
+    file_path: str
+    total_bytes: int | None
+    transferred_bytes: int = 0
+    attempt: int = 1
+    elapsed: float = 0.0
+    resumed_bytes: int = 0
+    _start: float = field(default_factory=time.perf_counter, init=False, repr=False, compare=False)
+
+    @property
+    def bytes_per_second(self) -> float:
+        r"""Average throughput of the current attempt, in bytes per second."""
+        return (self.transferred_bytes - self.resumed_bytes) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def done(self) -> bool:
+        r"""All the bytes of the file were transferred."""
+        return self.total_bytes is not None and self.transferred_bytes >= self.total_bytes
+
+    def restart(self, attempt: int):
+        r"""
+        Starts the progress over for a new attempt of the transfer.
+
+        Args:
+            attempt: Number of the attempt.
+        """
+
+        self.attempt = attempt
+        self.transferred_bytes = 0
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+
+    def advance(self, nb_bytes: int):
+        r"""
+        Adds bytes to the ones transferred, and updates the elapsed time.
+
+        Args:
+            nb_bytes: Number of bytes transferred.
+        """
+
+        self.transferred_bytes += nb_bytes
+        self.elapsed = time.perf_counter() - self._start
+
+TransferProgressCallback = Callable[[TransferProgress], None]
+
+class _FileReader:
+    r"""Reads the chunks of a file at any position, from several threads."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._use_pread = hasattr(os, 'pread')
+        self._lock = threading.Lock()
+
+    def read(self, offset: int, size: int) -> bytes:
+        if self._use_pread:
+            return os.pread(self._file.fileno(), size, offset)
+
+        # No positional reads on this platform, the threads share the position of the file
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+async def iter_file_chunks(
+        file: BinaryIO,
+        size: int,
+        chunk_size: int=UPLOAD_CHUNK_SIZE,
+        read_ahead: int=UPLOAD_READ_AHEAD,
+        executor: Executor=None,
+    ) -> AsyncIterator[bytes]:
+    r"""
+    Reads a file in a thread pool, without blocking the event loop,
+    while the next chunks are read in advance.
+
+    Args:
+        file: File opened in binary mode.
+        size: Number of bytes to read from the start of the file.
+        chunk_size: (Optional) Size of the chunks.
+        read_ahead: (Optional) Maximum number of chunks read in advance.
+        executor: (Optional) Thread pool where to read the file, the default executor of the event loop if not set.
+
+    Returns:
+        An asynchronous iterator over the chunks of the file, in order.
+    """
+
+    loop = asyncio.get_running_loop()
+    reader = _FileReader(file)
+    reads = collections.deque()
+    next_offset = 0
+
+    try:
+        while next_offset < size or reads:
+            while next_offset < size and len(reads) < max(read_ahead, 1):
+                length = min(chunk_size, size - next_offset)
+                reads.append((loop.run_in_executor(executor, reader.read, next_offset, length), length))
+                next_offset += length
+
+            read, length = reads.popleft()
+            chunk = await read
+            if len(chunk) != length:
+                raise EOFError(f'The file {getattr(file, "name", file)} is shorter than {size} bytes.')
+            yield chunk
+    finally:
+        # Stopped early, wait for the pending reads before the file is closed
+        pending = [read for read, _ in reads]
+        for read in pending:
+            read.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+class DownloadManifest:
+    r"""
+    The byte ranges of a file already downloaded, saved next to the file while it is downloaded
+    so the download can resume from there after an error or in another process.
+
+    Attributes:
+        file_path: Path of the file being downloaded.
+        source: URL the file is downloaded from, with its query parameters.
+        size: Size of the file.
+        etag: `ETag` header of the file on the server, if any.
+        last_modified: `Last-Modified` header of the file on the server, if any.
+        ranges: Byte ranges already written, sorted, as `[start, end]` with `end` excluded.
+    """
+
+    VERSION = 1
+
+    def __init__(
+            self,
+            file_path: str,
+            source: str,
+            size: int,
+            etag: str=None,
+            last_modified: str=None,
+            ranges: list[list[int]]=None,
+        ):
+        self.file_path = file_path
+        self.source = source
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ranges = [] if ranges is None else ranges
+
+    @property
+    def manifest_path(self) -> str:
+        return self.file_path + DOWNLOAD_MANIFEST_SUFFIX
+
+    @property
+    def completed_bytes(self) -> int:
+        r"""Number of bytes already written."""
+        return sum(end - start for start, end in self.ranges)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'DownloadManifest | None':
+        r"""
+        Reads the manifest of a file left by a previous download.
+
+        Args:
+            file_path: Path of the file being downloaded.
+
+        Returns:
+            The manifest, or `None` if there is none, or if it does not match the file on disk.
+        """
+
+        try:
+            with open(file_path + DOWNLOAD_MANIFEST_SUFFIX, 'rb') as manifest_file:
+                data = json.load(manifest_file)
+            if data['version'] != cls.VERSION:
+                return None
+            manifest = cls(
+                file_path,
+                data['source'],
+                int(data['size']),
+                data.get('etag'),
+                data.get('last_modified'),
+                sorted([ int(start), int(end) ] for start, end in data['ranges']),
+            )
+            if os.path.getsize(file_path) != manifest.size:
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        return manifest
+
+    def matches(self, source: str, size: int, etag: str | None, last_modified: str | None) -> bool:
+        r"""Tells if the file on the server is still the one this manifest was made for."""
+        return self.source == source and self.size == size and self.etag == etag and self.last_modified == last_modified
+
+    def add(self, start: int, end: int):
+        r"""Records that the bytes from `start` to `end`, excluded, are written."""
+
+        ranges = []
+        for current in self.ranges:
+            if current[1] < start or end < current[0]:
+                ranges.append(current)
+            else:
+                # Overlapping or touching, merged with the new range
+                start = min(start, current[0])
+                end = max(end, current[1])
+        ranges.append([ start, end ])
+        ranges.sort()
+        self.ranges = ranges
+
+    def missing_ranges(self) -> list[tuple[int, int]]:
+        r"""Gets the byte ranges not written yet, as `(start, end)` with `end` excluded."""
+
+        missing = []
+        offset = 0
+        for start, end in self.ranges:
+            if offset < start:
+                missing.append((offset, start))
+            offset = max(offset, end)
+        if offset < self.size:
+            missing.append((offset, self.size))
+        return missing
+
+    def save(self, ranges: list[list[int]]=None):
+        r"""
+        Writes the manifest next to the file, replacing the previous one at once.
+
+        Args:
+            ranges: (Optional) Ranges to save instead of the current ones.
+        """
+
+        data = {
+            'version': self.VERSION,
+            'source': self.source,
+            'size': self.size,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'ranges': self.ranges if ranges is None else ranges,
+        }
+
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(data, manifest_file)
+        os.replace(temp_path, self.manifest_path)
+
+    def delete(self):
+        r"""Deletes the manifest, if any."""
+
+        try:
+            os.remove(self.manifest_path)
+        except FileNotFoundError:
+            pass
+
+class FileWriter:
+    r"""
+    Writes the chunks of a file at any position, in a thread pool, without blocking the event loop.
+    Several byte ranges of the file can be written at the same time.
+
+    With a :class:`DownloadManifest`, the ranges written are recorded in the manifest,
+    saved every :data:`DOWNLOAD_CHECKPOINT_SIZE` bytes once the data is flushed to the disk.
+    """
+
+    def __init__(self, file: BinaryIO, executor: Executor=None, manifest: DownloadManifest=None):
+        self._file = file
+        self._executor = executor
+        self._use_pwrite = hasattr(os, 'pwrite')
+        self._lock = threading.Lock()
+        self._manifest = manifest
+        self._manifest_lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._unsaved_bytes = 0
+
+    @classmethod
+    async def open(
+            cls,
+            file_path: str,
+            size: int=None,
+            executor: Executor=None,
+            manifest: DownloadManifest=None,
+        ) -> 'FileWriter':
+        r"""
+        Creates or truncates a file, or opens it to resume a download when the manifest has ranges already written.
+
+        Args:
+            file_path: Path of the file.
+            size: (Optional) Size of the file, allocated upfront when known.
+            executor: (Optional) Thread pool where to write the file, the default executor of the event loop if not set.
+            manifest: (Optional) Manifest where to record the ranges written.
+        """
+
+        def open_file() -> BinaryIO:
+            # The file is closed by the caller, once the download ends
+            if manifest is not None and manifest.ranges:
+                return open(file_path, 'r+b')
+
+            file = open(file_path, 'wb') # pylint: disable=consider-using-with
+            if size:
+                file.truncate(size)
+            return file
+
+        loop = asyncio.get_running_loop()
+        return cls(await loop.run_in_executor(executor, open_file), executor, manifest)
+
+    def _write(self, offset: int, data: bytes):
+        if self._use_pwrite:
+            view = memoryview(data)
+            position = offset
+            while view:
+                written = os.pwrite(self._file.fileno(), view, position)
+                view = view[written:]
+                position += written
+        else:
+            # No positional writes on this platform, the threads share the position of the file
+            with self._lock:
+                self._file.seek(offset)
+                self._file.write(data)
+
+        if self._manifest is not None:
+            with self._manifest_lock:
+                self._manifest.add(offset, offset + len(data))
+                self._unsaved_bytes += len(data)
+                due = self._unsaved_bytes >= DOWNLOAD_CHECKPOINT_SIZE
+            # The other threads keep writing while one saves the manifest, which a with statement cannot do
+            if due and self._checkpoint_lock.acquire(blocking=False): # pylint: disable=consider-using-with
+                try:
+                    self._checkpoint()
+                finally:
+                    self._checkpoint_lock.release()
+
+    def _checkpoint(self):
+        with self._manifest_lock:
+            # The ranges are replaced, not changed, when a write is recorded
+            ranges = self._manifest.ranges
+            self._unsaved_bytes = 0
+
+        # The data must be on the disk before the manifest says it is written
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._manifest.save(ranges)
+
+    def _close(self):
+        try:
+            if self._manifest is not None:
+                with self._checkpoint_lock:
+                    if not self._manifest.missing_ranges():
+                        self._manifest.delete()
+                    elif self._unsaved_bytes > 0:
+                        self._checkpoint()
+        finally:
+            self._file.close()
+
+    async def write(self, offset: int, data: bytes):
+        r"""
+        Writes data at a position of the file.
+
+        Args:
+            offset: Position in the file, in bytes.
+            data: Data to write.
+        """
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write, offset, data)
+
+    async def close(self):
+        r"""
+        Closes the file. With a manifest, the manifest is deleted when the file is complete,
+        otherwise it is saved to resume the download later.
+        """
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
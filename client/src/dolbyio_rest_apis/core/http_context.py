@@ -5,35 +5,230 @@ dolbyio_rest_apis.core.http_context
 This module contains the HTTP Context class.
 """
 
-import aiofiles
-from aiohttp import BasicAuth, ClientResponse, ClientTimeout, ServerTimeoutError, ContentTypeError
-from aiohttp_retry import RetryClient, JitterRetry
-import certifi
+import asyncio
+import contextlib
 import datetime
-import importlib
 import logging
+import mimetypes
+import os
 import platform
-from .rate_limiter import RATE_LIMITER
+import re
+from .compression import CompressionStats, ContentDecoder, get_accept_encoding
+from .connection_pool import ConnectionPoolConfig
+from .file_transfer import (
+    DOWNLOAD_CHUNK_SIZE, DOWNLOAD_PART_MIN_SIZE, DOWNLOAD_PARTS, UPLOAD_CHUNK_SIZE, UPLOAD_READ_AHEAD,
+    DownloadManifest, FileWriter, TransferProgress, TransferProgressCallback, iter_file_chunks,
+)
+from .http_request_error import HttpRequestError
+from .metrics import HttpMetrics, MetricsRegistry
+from .rate_limiter import RATE_LIMITERS, Priority, RateLimiter, RateLimiterRegistry
+from .request_timing import RequestTiming, RequestTimingCallback, create_trace_config
+from .response_mode import ResponseMode, get_response_mode
+from .serializer import JsonSerializer, get_default_serializer
+from .single_flight import SingleFlight
+from . import telemetry
 import ssl
-from typing import Any, Mapping, Optional, Type
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Mapping, Optional, Type, TypeVar, TYPE_CHECKING
 from types import TracebackType
+from urllib.parse import urlencode, urlsplit
+from .urls import get_endpoint_template
+
+if TYPE_CHECKING:
+    # aiohttp and the other HTTP packages are only imported when the first HTTP context is created
+    from aiohttp import BasicAuth, ClientResponse, ClientTimeout
+    from yarl import URL
 
 TOTAL_REQUEST_TIMEOUT: int = 60 # seconds
 TOTAL_REQUEST_DOWNLOAD_FILE_TIMEOUT: int = 30 * 60 # 30 minutes
+TOTAL_REQUEST_UPLOAD_FILE_TIMEOUT: int = 30 * 60 # 30 minutes
 CONNECT_REQUEST_TIMEOUT: int = 25 # seconds
 
 RETRY_MAX_ATTEMPTS: int = 3
 RETRY_START_TIMEOUT: float = 1.0
 
+# Server errors after which a file upload or a range of a file download is sent again
+TRANSFER_RETRY_STATUSES = frozenset([ 500, 502, 503, 504 ])
+
+# Value of the endpoint label of the metrics of the uploads, the pre-signed URLs are all different
+UPLOAD_ENDPOINT = '{upload}'
+
+# Value of the endpoint label of the metrics of the downloads
+DOWNLOAD_ENDPOINT = '{download}'
+
+# Shortest wait for the rate limiter recorded as a span, the requests let through immediately are not recorded
+RATE_LIMITER_WAIT_SPAN_THRESHOLD: float = 0.001 # seconds
+
 PACKAGE_NAME = 'dolbyio_rest_apis'
 
+T = TypeVar('T')
+
+_JSON_CONTENT_TYPE = re.compile(r'^application/(?:[\w.+-]+?\+)?json')
+_CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+# Process-wide values shared by all the HTTP contexts, built on first use
+_cache_lock = threading.Lock()
+_ssl_context: ssl.SSLContext | None = None
+_ca_bundle: str | None = None
+_default_headers: Mapping[str, str] | None = None
+
+def set_ca_bundle(cafile: str | None) -> None:
+    r"""
+    Sets the CA bundle used to verify the server certificates.
+
+    Args:
+        cafile: Path to the CA bundle file, or `None` to use the bundle provided by `certifi`.
+    """
+
+    global _ssl_context, _ca_bundle
+    with _cache_lock:
+        _ca_bundle = cafile
+        _ssl_context = None
+
+def set_ssl_context(ssl_context: ssl.SSLContext | None) -> None:
+    r"""
+    Sets the SSL context used for all the requests.
+
+    Args:
+        ssl_context: SSL context to use, or `None` to build the default one again.
+    """
+
+    global _ssl_context
+    with _cache_lock:
+        _ssl_context = ssl_context
+
+def get_ssl_context() -> ssl.SSLContext:
+    r"""Gets the SSL context shared by all the requests, loading the CA bundle only once."""
+
+    global _ssl_context
+    ssl_context = _ssl_context
+    if ssl_context is None:
+        with _cache_lock:
+            if _ssl_context is None:
+                import certifi
+                cafile = certifi.where() if _ca_bundle is None else _ca_bundle
+                _ssl_context = ssl.create_default_context(cafile=cafile)
+            ssl_context = _ssl_context
+
+    return ssl_context
+
+def get_default_headers() -> Mapping[str, str]:
+    r"""Gets the headers added to all the requests."""
+
+    global _default_headers
+    default_headers = _default_headers
+    if default_headers is None:
+        with _cache_lock:
+            if _default_headers is None:
+                import importlib.metadata
+                try:
+                    version = importlib.metadata.version(PACKAGE_NAME)
+                except importlib.metadata.PackageNotFoundError:
+                    version = 'unknown'
+                _default_headers = {
+                    'User-Agent': f'DolbyIoRestApiSdk/{version}; Python/{platform.python_version()}',
+                }
+            default_headers = _default_headers
+
+    return default_headers
+
+def _parse_retry_after(value: str | None) -> float | None:
+    r"""Gets the number of seconds to wait from a `Retry-After` header, in seconds or as an HTTP date."""
+
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    import email.utils
+
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+    return max((retry_date - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+def _parse_content_range(http_response: 'ClientResponse') -> tuple[int, int, int] | None:
+    r"""Gets the first and last positions, and the size of the file, from the `Content-Range` header of a response."""
+
+    match = _CONTENT_RANGE.match(http_response.headers.get('Content-Range', ''))
+    if match is None or match.group(3) == '*':
+        return None
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+def _split_range(start: int, end: int, nb_parts: int) -> list[tuple[int, int]]:
+    r"""Splits the bytes from `start` to `end`, excluded, in up to `nb_parts` ranges of at least :data:`DOWNLOAD_PART_MIN_SIZE` bytes."""
+
+    size = end - start
+    if size <= 0:
+        return []
+
+    nb_parts = max(min(nb_parts, -(-size // DOWNLOAD_PART_MIN_SIZE)), 1)
+    part_size = -(-size // nb_parts)
+    return [ (offset, min(offset + part_size, end)) for offset in range(start, end, part_size) ]
+
 class HttpContext:
     """
     HTTP Context used to send HTTP requests.
     """
 
-    def __init__(self):
+    DEFAULT_POOL_CONFIG = ConnectionPoolConfig()
+
+    # Value of the api label of the metrics
+    API_FAMILY = 'core'
+
+    def __init__(
+            self,
+            pool_config: ConnectionPoolConfig=None,
+            rate_limiters: RateLimiterRegistry=None,
+            priority: Priority=Priority.NORMAL,
+            coalesce_requests: bool=False,
+            serializer: JsonSerializer=None,
+            on_request_timing: RequestTimingCallback=None,
+            metrics: MetricsRegistry=None,
+            response_mode: ResponseMode=ResponseMode.MODEL,
+        ):
+        r"""
+        Args:
+            pool_config: (Optional) Settings of the connection pool.
+                If not set, :attr:`DEFAULT_POOL_CONFIG` is used.
+            rate_limiters: (Optional) Registry of the rate limiters to use for the requests.
+                If not set, the registry shared by the whole process is used.
+            priority: (Optional) Lane of the rate limiters used by the requests,
+                use :attr:`Priority.INTERACTIVE` for latency sensitive calls and :attr:`Priority.BATCH` for background jobs.
+            coalesce_requests: (Optional) Send a single request when identical GET requests are made at the same time,
+                all the callers get the same response. The decoded JSON is shared by the callers and must not be modified.
+            serializer: (Optional) Serializer of the JSON bodies of the requests and responses.
+                If not set, the fastest serializer installed is used, see :func:`get_default_serializer`.
+            on_request_timing: (Optional) Function called with the :class:`RequestTiming` of each request,
+                the duration of the DNS resolution, connection, time to first byte and body.
+            metrics: (Optional) Registry where to record the metrics of the requests:
+                latency, retries, rate limiter waits, bytes transferred and errors.
+            response_mode: (Optional) What the API functions return, the models by default.
+                It can be changed for some calls with :func:`response_mode`.
+        """
+
+        from aiohttp import ServerTimeoutError
+        from aiohttp_retry import JitterRetry, RetryClient
+
         self._logger = logging.getLogger(HttpContext.__name__)
+        self._rate_limiters = RATE_LIMITERS if rate_limiters is None else rate_limiters
+        self._priority = priority
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self._serializer = get_default_serializer() if serializer is None else serializer
+        self._compression_stats = CompressionStats()
+        self._on_request_timing = on_request_timing
+        self._metrics = None if metrics is None else HttpMetrics(metrics)
+        self._response_mode = response_mode
+
+        if pool_config is None:
+            pool_config = self.DEFAULT_POOL_CONFIG
 
         retry_options = JitterRetry(
             attempts=RETRY_MAX_ATTEMPTS,
@@ -43,11 +238,68 @@ class HttpContext:
             exceptions=[ ServerTimeoutError ],
         )
 
+        # Only trace the requests when the timings are used
+        traced_requests = on_request_timing is not None or metrics is not None or telemetry.is_enabled()
+
         self._session = RetryClient(
             raise_for_status=False,
             retry_options=retry_options,
+            connector=pool_config.create_connector(),
+            # The responses are decoded by the context to count the bytes received from the server
+            auto_decompress=False,
+            trace_configs=[create_trace_config()] if traced_requests else None,
         )
 
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def use(cls, http_context: Optional['HttpContext']=None) -> AsyncIterator['HttpContext']:
+        r"""
+        Provides an HTTP context for the duration of an API call.
+
+        Args:
+            http_context: (Optional) HTTP context to reuse, it will not be closed on exit.
+                If not set, a new context is created and closed on exit.
+        """
+
+        if http_context is not None:
+            yield http_context
+        else:
+            async with cls() as new_http_context:
+                yield new_http_context
+
+    @property
+    def single_flight(self) -> SingleFlight | None:
+        r"""The coalescing of the identical GET requests, with its counters, or `None` if it is disabled."""
+        return self._single_flight
+
+    @property
+    def compression_stats(self) -> CompressionStats:
+        r"""The number of bytes of the JSON responses received from the server and once decoded."""
+        return self._compression_stats
+
+    @property
+    def response_mode(self) -> ResponseMode:
+        r"""What the API functions return: the mode set by :func:`response_mode` if any, otherwise the mode of this context."""
+        mode = get_response_mode()
+        return self._response_mode if mode is None else mode
+
+    def build_response(self, data: Any, build: Callable[..., T], *args: Any) -> T | Any:
+        r"""
+        Builds the model of a response, unless the response mode asks for the JSON or the body of the response.
+
+        Args:
+            data: The decoded JSON, or the body of the response.
+            build: Function building the model, called with `args` followed by `data`.
+            args: (Optional) First arguments of `build`.
+
+        Returns:
+            The model, or `data` if the response mode is not :attr:`ResponseMode.MODEL`.
+        """
+
+        if self.response_mode is not ResponseMode.MODEL:
+            return data
+        return build(*args, data)
+
     async def close(self):
         if not self._session is None:
             await self._session.close()
@@ -82,61 +334,364 @@ class HttpContext:
             headers: Mapping[str, str],
             file_path: str,
             params: Mapping[str, str]=None,
+            on_progress: TransferProgressCallback=None,
+            parallel_parts: int=DOWNLOAD_PARTS,
         ):
-        self._logger.debug('GET %s', url)
+        r"""
+        Downloads a file, in several byte ranges fetched at the same time when the server supports the `Range` header.
+
+        The first request asks for the first range of the file and tells its size.
+        The rest of the file is split in ranges, up to `parallel_parts` downloaded at the same time,
+        each written at its position in the file. When the server ignores the `Range` header,
+        the file is written from the body of the first response.
+
+        The ranges written are recorded in a :class:`DownloadManifest` next to the file.
+        A range resumes where it stopped after a connection error, a timeout or a server error,
+        and a later call resumes the download from the manifest, if the file did not change on the server.
+        The manifest is deleted once the file is complete. A complete file left with its manifest is kept,
+        once its `ETag` or `Last-Modified` header, if any, is checked on the server.
+
+        Args:
+            url: Where to send the request to.
+            headers: Headers of the request.
+            file_path: Where to save the file.
+            params: (Optional) URL query parameters.
+            on_progress: (Optional) Function called with the :class:`TransferProgress` after each chunk is written.
+            parallel_parts: (Optional) Number of ranges downloaded at the same time,
+                set to 1 to download the file with a single request.
+        """
+
+        from aiohttp import ClientPayloadError, ClientTimeout
+        from yarl import URL
 
-        version = importlib.metadata.version(PACKAGE_NAME)
-        user_agent = f'DolbyIoRestApiSdk/{version}; Python/{platform.python_version()}'
-        if headers is None:
-            headers = {
-                'User-Agent': user_agent,
-            }
-        else:
-            headers['User-Agent'] = user_agent
-
-        sslcontext = ssl.create_default_context(cafile=certifi.where())
-
-        async with self._session.get(
-            url,
-            params=params,
-            headers=headers,
-            ssl=sslcontext,
-            timeout=ClientTimeout(total=TOTAL_REQUEST_DOWNLOAD_FILE_TIMEOUT, connect=CONNECT_REQUEST_TIMEOUT),
-        ) as http_response:
-            await self._raise_for_status(http_response)
-
-            total_kb = 0
+        self._logger.debug('GET %s', url)
 
-            async with aiofiles.open(file_path, mode='wb') as output_file:
-                async for chunk in http_response.content.iter_chunked(1024):
-                    total_kb += 1
-                    if total_kb % 10240 == 0:
-                        # Only print every 10 MB
-                        self._logger.debug('Downloading %s - %.1f MB', file_path, total_kb / 1024)
-                    await output_file.write(chunk)
+        headers = self._add_default_headers(headers)
+        # Never compress the media files, they are written as received
+        headers['Accept-Encoding'] = 'identity'
+        timeout = ClientTimeout(total=TOTAL_REQUEST_DOWNLOAD_FILE_TIMEOUT, connect=CONNECT_REQUEST_TIMEOUT)
+        parallel_parts = max(parallel_parts, 1)
+
+        # Same file on the server as the manifest left by a previous call
+        source = url if not params else f'{url}?{urlencode(sorted(params.items()))}'
+
+        loop = asyncio.get_running_loop()
+        manifest = await loop.run_in_executor(None, DownloadManifest.load, file_path)
+        if manifest is not None and not manifest.missing_ranges() and manifest.etag is None and manifest.last_modified is None:
+            # Stopped after the last write, before deleting the manifest, and the manifest was loaded with the size of the file on disk
+            self._logger.debug('Downloaded %s - already complete', file_path)
+            await loop.run_in_executor(None, manifest.delete)
+            return
+
+        while True:
+            if manifest is None:
+                first_start, first_end = 0, DOWNLOAD_PART_MIN_SIZE if parallel_parts > 1 else None
+            elif not manifest.missing_ranges():
+                # The file is complete, only checks that it did not change on the server
+                first_start, first_end = 0, 1
+            else:
+                first_start, first_end = manifest.missing_ranges()[0]
+                if parallel_parts > 1:
+                    first_end = min(first_end, first_start + DOWNLOAD_PART_MIN_SIZE)
+                self._logger.debug(
+                    'Resuming the download of %s - %i bytes of %i already written', file_path, manifest.completed_bytes, manifest.size,
+                )
+
+            first_headers = dict(headers)
+            first_headers['Range'] = f'bytes={first_start}-' if first_end is None else f'bytes={first_start}-{first_end - 1}'
+
+            async with self._session.get(
+                url,
+                params=params,
+                headers=first_headers,
+                ssl=get_ssl_context(),
+                timeout=timeout,
+            ) as http_response:
+                if http_response.status == 416 and manifest is None:
+                    # Nothing to download in the first range, the file is empty
+                    self._logger.debug('Downloaded %s - empty file', file_path)
+                    writer = await FileWriter.open(file_path)
+                    await writer.close()
+                    return
+
+                if http_response.status != 416:
+                    await self._raise_for_status(http_response)
+
+                content_range = _parse_content_range(http_response)
+                if http_response.status == 206:
+                    if content_range is None or content_range[0] != first_start:
+                        raise ClientPayloadError(f'The server did not return the range {first_headers["Range"]}.')
+                    total = content_range[2]
+                    # The server can send less than requested, the rest is downloaded with the other ranges
+                    first_end = content_range[1] + 1
+                else:
+                    # The server does not support the ranges, the whole file is in this response
+                    content_range = None
+                    total = http_response.content_length
+
+                etag = http_response.headers.get('ETag')
+                last_modified = http_response.headers.get('Last-Modified')
+
+                if manifest is not None and (content_range is None or not manifest.matches(source, total, etag, last_modified)):
+                    self._logger.info('The file %s changed on the server since the previous download, starting over.', file_path)
+                    await loop.run_in_executor(None, manifest.delete)
+                    manifest = None
+                    continue
+
+                if manifest is not None and not manifest.missing_ranges():
+                    self._logger.debug('Downloaded %s - already complete', file_path)
+                    await loop.run_in_executor(None, manifest.delete)
+                    return
+
+                if manifest is None and content_range is not None:
+                    manifest = DownloadManifest(file_path, source, total, etag, last_modified)
+
+                progress = TransferProgress(file_path, total)
+                if manifest is not None:
+                    progress.resumed_bytes = progress.transferred_bytes = manifest.completed_bytes
+
+                writer = await FileWriter.open(file_path, total, manifest=manifest)
+                try:
+                    if content_range is None:
+                        await self._download_range(None, headers, timeout, writer, 0, total, progress, on_progress, http_response)
+                    else:
+                        # Send the other requests to the final location, without the credentials if it is on another host
+                        parts_url = http_response.url
+                        parts_headers = dict(headers)
+                        if str(parts_url.origin()) != str(URL(url).origin()):
+                            parts_headers.pop('Authorization', None)
+
+                        ranges = []
+                        for start, end in manifest.missing_ranges():
+                            start = max(start, first_end) if start == first_start else start
+                            ranges.extend(_split_range(start, end, parallel_parts))
+                        self._logger.debug('Downloading %s - %i bytes in %i ranges', file_path, total, len(ranges) + 1)
+
+                        # The first range is downloaded first, the others wait for one of the parallel downloads to end
+                        semaphore = asyncio.Semaphore(parallel_parts)
+
+                        async def download_range(start: int, end: int, first_response: 'ClientResponse'=None):
+                            async with semaphore:
+                                await self._download_range(
+                                    parts_url, parts_headers, timeout, writer, start, end, progress, on_progress, first_response,
+                                )
+
+                        tasks = [ asyncio.ensure_future(download_range(first_start, first_end, http_response)) ]
+                        tasks.extend(asyncio.ensure_future(download_range(start, end)) for start, end in ranges)
+                        try:
+                            # The first error stops the other ranges
+                            await asyncio.gather(*tasks)
+                        finally:
+                            for task in tasks:
+                                task.cancel()
+                            await asyncio.gather(*tasks, return_exceptions=True)
+                finally:
+                    # Saves the manifest of an incomplete download to resume it later
+                    await writer.close()
+
+            break
+
+        if total is not None and progress.transferred_bytes != total:
+            raise ClientPayloadError(f'Downloaded {progress.transferred_bytes} bytes of {file_path} instead of {total}.')
+
+        self._logger.debug(
+            'Downloaded %s - %.1f MB in %.1f seconds, %.1f MB/s',
+            file_path,
+            (progress.transferred_bytes - progress.resumed_bytes) / 1024 / 1024,
+            progress.elapsed,
+            progress.bytes_per_second / 1024 / 1024,
+        )
 
-            self._logger.debug('Downloaded %s - %.1f MB', file_path, total_kb / 1024)
+    async def _download_range(
+            self,
+            url: Optional['URL'],
+            headers: Mapping[str, str],
+            timeout: 'ClientTimeout',
+            writer: FileWriter,
+            start: int,
+            end: int | None,
+            progress: TransferProgress,
+            on_progress: TransferProgressCallback | None,
+            http_response: 'ClientResponse'=None,
+        ):
+        r"""
+        Downloads the bytes from `start` to `end`, excluded, of a file with a `Range` request.
+        After a connection error, a timeout or a server error, the range resumes from the last byte written.
+
+        Args:
+            url: Where to send the requests to, `None` if the server does not support the ranges.
+            http_response: (Optional) Response already received for this range, read before sending any request.
+        """
+
+        from aiohttp import ClientConnectionError, ClientPayloadError, ClientResponseError
+
+        offset = start
+        attempt = 1
+        while True:
+            attempt_offset = offset
+            reason = None
+            try:
+                async with contextlib.AsyncExitStack() as stack:
+                    if http_response is None:
+                        range_headers = dict(headers)
+                        range_headers['Range'] = f'bytes={offset}-{end - 1}'
+                        http_response = await stack.enter_async_context(self._session.get(
+                            url,
+                            headers=range_headers,
+                            ssl=get_ssl_context(),
+                            timeout=timeout,
+                        ))
+
+                        if http_response.status in TRANSFER_RETRY_STATUSES and attempt < RETRY_MAX_ATTEMPTS:
+                            self._logger.warning(
+                                'The download of the range %i-%i failed with the status %i, attempt %i out of %i.',
+                                offset, end, http_response.status, attempt, RETRY_MAX_ATTEMPTS,
+                            )
+                            reason = 'server_error'
+                        else:
+                            await self._raise_for_status(http_response)
+
+                            content_range = _parse_content_range(http_response)
+                            if http_response.status != 206 or content_range is None or content_range[0] != offset:
+                                raise ClientResponseError(
+                                    http_response.request_info,
+                                    http_response.history,
+                                    status=http_response.status,
+                                    message=f'The server did not return the range {range_headers["Range"]}.',
+                                )
+
+                    if reason is None:
+                        try:
+                            async for chunk in http_response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                await writer.write(offset, chunk)
+                                offset += len(chunk)
+                                progress.advance(len(chunk))
+                                self._report_progress(on_progress, progress)
+                        finally:
+                            if self._metrics is not None:
+                                self._metrics.received_bytes.inc(
+                                    offset - attempt_offset, api=self.API_FAMILY, endpoint=DOWNLOAD_ENDPOINT, encoding='identity',
+                                )
+
+                        if end is not None and offset != end:
+                            raise ClientPayloadError(
+                                f'Received {offset - start} bytes instead of {end - start} for the range starting at {start}.'
+                            )
+                        return
+            except (ClientConnectionError, ClientPayloadError, asyncio.TimeoutError) as e:
+                if url is None:
+                    # The server does not support the ranges, the download cannot resume
+                    raise
+                if offset > attempt_offset:
+                    # Only the attempts that did not receive anything are counted
+                    attempt = 1
+                elif attempt >= RETRY_MAX_ATTEMPTS:
+                    raise
+                self._logger.warning(
+                    'The download of the range %i-%i failed at %i: %r, attempt %i out of %i.',
+                    start, end, offset, e, attempt, RETRY_MAX_ATTEMPTS,
+                )
+                reason = 'connection_error'
+            finally:
+                http_response = None
+
+            if self._metrics is not None:
+                self._metrics.retries.inc(api=self.API_FAMILY, endpoint=DOWNLOAD_ENDPOINT, reason=reason)
+            await asyncio.sleep(RETRY_START_TIMEOUT * 2 ** (attempt - 1))
+            attempt += 1
 
     async def _upload_file(
             self,
             url: str,
             file_path: str,
+            on_progress: TransferProgressCallback=None,
+            chunk_size: int=UPLOAD_CHUNK_SIZE,
+            read_ahead: int=UPLOAD_READ_AHEAD,
         ):
-        self._logger.debug('PUT %s', url)
-
-        version = importlib.metadata.version(PACKAGE_NAME)
-        headers = {
-            'User-Agent': f'DolbyIoRestApiSdk/{version}; Python/{platform.python_version()}',
-        }
-
-        with open(file_path, 'rb') as input_file:
-            sslcontext = ssl.create_default_context(cafile=certifi.where())
-            await self._session.put(
-                url,
-                headers=headers,
-                ssl=sslcontext,
-                data=input_file,
-            )
+        r"""
+        Uploads a file with a PUT request, reading it in a thread pool while the previous chunks are sent.
+        The upload starts over after a connection error, a timeout or a server error.
+
+        Args:
+            url: Where to upload the file to.
+            file_path: Path of the file to upload.
+            on_progress: (Optional) Function called with the :class:`TransferProgress` after each chunk is sent.
+            chunk_size: (Optional) Size of the chunks read from the file.
+            read_ahead: (Optional) Maximum number of chunks read in advance.
+        """
+
+        from aiohttp import ClientConnectionError, ClientTimeout
+        from aiohttp.helpers import content_disposition_header
+        from aiohttp_retry import ExponentialRetry
+
+        loop = asyncio.get_running_loop()
+        input_file = await loop.run_in_executor(None, open, file_path, 'rb')
+        try:
+            size = (await loop.run_in_executor(None, os.fstat, input_file.fileno())).st_size
+            progress = TransferProgress(file_path, size)
+
+            headers = self._add_default_headers({
+                # Same headers as aiohttp sends for a file object, the storage may have signed them
+                'Content-Type': mimetypes.guess_type(file_path)[0] or 'application/octet-stream',
+                'Content-Disposition': content_disposition_header('attachment', filename=os.path.basename(file_path)),
+                # The length is known, the pre-signed URLs do not support the chunked transfer encoding
+                'Content-Length': str(size),
+            })
+
+            async def iter_body() -> AsyncIterator[bytes]:
+                async for chunk in iter_file_chunks(input_file, size, chunk_size, read_ahead):
+                    yield chunk
+                    progress.advance(len(chunk))
+                    self._report_progress(on_progress, progress)
+
+            attempt = 1
+            while True:
+                self._logger.debug('PUT %s - %s, %i bytes, attempt %i', url, file_path, size, attempt)
+                progress.restart(attempt)
+                try:
+                    async with self._session.put(
+                        url,
+                        headers=headers,
+                        ssl=get_ssl_context(),
+                        data=iter_body(),
+                        timeout=ClientTimeout(total=TOTAL_REQUEST_UPLOAD_FILE_TIMEOUT, connect=CONNECT_REQUEST_TIMEOUT),
+                        # The body can only be read once, the retries are made here
+                        retry_options=ExponentialRetry(attempts=1),
+                    ) as http_response:
+                        if http_response.status not in TRANSFER_RETRY_STATUSES or attempt >= RETRY_MAX_ATTEMPTS:
+                            await self._raise_for_status(http_response)
+                            self._logger.debug(
+                                'Uploaded %s - %.1f MB in %.1f seconds, %.1f MB/s',
+                                file_path, size / 1024 / 1024, progress.elapsed, progress.bytes_per_second / 1024 / 1024,
+                            )
+                            if self._metrics is not None:
+                                self._metrics.sent_bytes.inc(size, api=self.API_FAMILY, endpoint=UPLOAD_ENDPOINT)
+                            return
+                        self._logger.warning(
+                            'The upload of %s failed with the status %i, attempt %i out of %i.',
+                            file_path, http_response.status, attempt, RETRY_MAX_ATTEMPTS,
+                        )
+                        reason = 'server_error'
+                except (ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt >= RETRY_MAX_ATTEMPTS:
+                        raise
+                    self._logger.warning('The upload of %s failed: %r, attempt %i out of %i.', file_path, e, attempt, RETRY_MAX_ATTEMPTS)
+                    reason = 'connection_error'
+
+                if self._metrics is not None:
+                    self._metrics.retries.inc(api=self.API_FAMILY, endpoint=UPLOAD_ENDPOINT, reason=reason)
+                await asyncio.sleep(RETRY_START_TIMEOUT * 2 ** (attempt - 1))
+                attempt += 1
+        finally:
+            await loop.run_in_executor(None, input_file.close)
+
+    def _report_progress(self, on_progress: TransferProgressCallback | None, progress: TransferProgress):
+        if on_progress is not None:
+            try:
+                on_progress(progress)
+            except Exception: # pylint: disable=broad-exception-caught
+                # A failing callback of the application must not stop the transfer
+                self._logger.exception('The progress callback failed.')
 
     async def _send_request(
             self,
@@ -144,53 +699,257 @@ class HttpContext:
             url: str,
             headers: Mapping[str, str],
             params: Mapping[str, str]=None,
-            auth: BasicAuth=None,
+            auth: 'BasicAuth'=None,
             data: Any=None,
+            raw_body: bool=False,
         ) -> Any | None:
+        r"""
+        Sends a request and reads its JSON response.
+
+        Args:
+            raw_body: (Optional) Return the body of the response as received, instead of the decoded JSON.
+        """
+
         if params is None:
             self._logger.debug('%s %s', method, url)
         else:
             self._logger.debug('%s %s %s', method, url, params)
-        start = datetime.datetime.now()
 
-        version = importlib.metadata.version(PACKAGE_NAME)
-        user_agent = f'DolbyIoRestApiSdk/{version}; Python/{platform.python_version()}'
-        if headers is None:
-            headers = {
-                'User-Agent': user_agent,
-            }
-        else:
-            headers['User-Agent'] = user_agent
+        headers = self._add_default_headers(headers)
 
-        try:
-            # Use the rate limited to let request going through
-            await RATE_LIMITER.wait_until_allowed()
-
-            sslcontext = ssl.create_default_context(cafile=certifi.where())
+        if self._single_flight is not None and method == 'GET':
+            key = (
+                method,
+                url,
+                None if params is None else tuple(sorted(params.items())),
+                headers.get('Authorization'),
+                None if auth is None else auth.encode(),
+                raw_body,
+            )
+            return await self._single_flight.do(
+                key,
+                lambda: self._send_request_once(method, url, headers, params, auth, data, raw_body),
+            )
 
-            async with self._session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                auth=auth,
-                data=data,
-                ssl=sslcontext,
-                timeout=ClientTimeout(total=TOTAL_REQUEST_TIMEOUT, connect=CONNECT_REQUEST_TIMEOUT),
-            ) as http_response:
-                end = datetime.datetime.now()
-                span = end - start
-                self._logger.debug('Elapsed %.3f seconds', span.total_seconds())
+        return await self._send_request_once(method, url, headers, params, auth, data, raw_body)
 
-                await self._raise_for_status(http_response)
+    async def _send_request_once(
+            self,
+            method: str,
+            url: str,
+            headers: Mapping[str, str],
+            params: Mapping[str, str]=None,
+            auth: 'BasicAuth'=None,
+            data: Any=None,
+            raw_body: bool=False,
+        ) -> Any | None:
+        from aiohttp import ContentTypeError
 
-                return await http_response.json()
+        try:
+            async with self._request(method, url, headers, params, auth, data) as http_response:
+                return await self._read_json(http_response, raw_body)
         except ContentTypeError:
             return None # No JSON content
+
+    @contextlib.asynccontextmanager
+    async def _request(
+            self,
+            method: str,
+            url: str,
+            headers: Mapping[str, str],
+            params: Mapping[str, str]=None,
+            auth: 'BasicAuth'=None,
+            data: Any=None,
+        ) -> AsyncIterator['ClientResponse']:
+        r"""
+        Sends a request through the rate limiter, retrying it when throttled,
+        and provides the successful response before its body is read.
+        """
+
+        from aiohttp import ClientResponseError, ClientTimeout, ServerTimeoutError
+
+        start = time.perf_counter()
+        rate_limiter = self._get_rate_limiter(url, headers, auth)
+        headers.setdefault('Accept-Encoding', get_accept_encoding())
+        metrics = self._metrics
+        path = urlsplit(url).path
+        endpoint = get_endpoint_template(path) if metrics is None else metrics.get_endpoint(path)
+
+        try:
+            attempt = 1
+            while True:
+                # Use the rate limiter to let request going through
+                wait_start = time.perf_counter()
+                wait_start_ns = time.time_ns()
+                await rate_limiter.wait_until_allowed(self._priority)
+                wait = time.perf_counter() - wait_start
+                if wait >= RATE_LIMITER_WAIT_SPAN_THRESHOLD:
+                    telemetry.record_rate_limiter_wait(wait_start_ns, time.time_ns(), self._priority.value)
+                if metrics is not None:
+                    metrics.throttle_wait.observe(wait, api=self.API_FAMILY, endpoint=endpoint, priority=self._priority.value)
+                    if isinstance(data, (bytes, str)):
+                        metrics.sent_bytes.inc(len(data), api=self.API_FAMILY, endpoint=endpoint)
+
+                timing = None
+                if self._on_request_timing is not None or metrics is not None or telemetry.is_enabled():
+                    timing = RequestTiming(method, url, endpoint)
+
+                # The span of the request is the parent of the server spans, through the traceparent header
+                with telemetry.start_http_span(method, url, headers, attempt) as span:
+                    try:
+                        async with self._session.request(
+                            method=method,
+                            url=url,
+                            headers=headers,
+                            params=params,
+                            auth=auth,
+                            data=data,
+                            ssl=get_ssl_context(),
+                            timeout=ClientTimeout(total=TOTAL_REQUEST_TIMEOUT, connect=CONNECT_REQUEST_TIMEOUT),
+                            trace_request_ctx=None if timing is None else {'timing': timing},
+                        ) as http_response:
+                            self._logger.debug('Elapsed %.3f seconds', time.perf_counter() - start)
+                            telemetry.set_http_response(span, http_response.status, 1 if timing is None else timing.attempts)
+
+                            if http_response.status == 429:
+                                retry_after = _parse_retry_after(http_response.headers.get('Retry-After'))
+                                rate_limiter.on_throttled(retry_after)
+                                if attempt < RETRY_MAX_ATTEMPTS:
+                                    self._logger.warning('The request to %s was throttled, attempt %i out of %i.',
+                                                         url, attempt, RETRY_MAX_ATTEMPTS)
+                                    if metrics is not None:
+                                        metrics.retries.inc(api=self.API_FAMILY, endpoint=endpoint, reason='throttled')
+                                    attempt += 1
+                                    continue
+                            elif http_response.status < 400:
+                                rate_limiter.on_success()
+
+                            try:
+                                await self._raise_for_status(http_response)
+                            except HttpRequestError as e:
+                                if metrics is not None:
+                                    metrics.errors.inc(api=self.API_FAMILY, endpoint=endpoint, status=e.status_code, code=e.error_code)
+                                raise
+                            except ClientResponseError as e:
+                                if metrics is not None:
+                                    metrics.errors.inc(api=self.API_FAMILY, endpoint=endpoint, status=e.status, code='')
+                                raise
+
+                            yield http_response
+                            return
+                    finally:
+                        if timing is not None:
+                            self._report_timing(timing)
         except ServerTimeoutError:
             self._logger.error('Unable to get data from the url %s because of a timeout.', url)
             self._logger.error('Timeout is set to %i seconds.', TOTAL_REQUEST_TIMEOUT)
             raise
 
-    async def _raise_for_status(self, http_response: ClientResponse):
+    def _report_timing(self, timing: RequestTiming):
+        timing.response_read()
+
+        metrics = self._metrics
+        if metrics is not None:
+            status = 'error' if timing.status is None else timing.status
+            metrics.requests.inc(api=self.API_FAMILY, endpoint=timing.endpoint, method=timing.method, status=status)
+            metrics.latency.observe(timing.total, api=self.API_FAMILY, endpoint=timing.endpoint, method=timing.method)
+            if timing.attempts > 1:
+                metrics.retries.inc(timing.attempts - 1, api=self.API_FAMILY, endpoint=timing.endpoint, reason='server_error')
+
+        if self._on_request_timing is not None:
+            try:
+                self._on_request_timing(timing)
+            except Exception: # pylint: disable=broad-exception-caught
+                # A failing callback of the application must not fail the request
+                self._logger.exception('The request timing callback failed.')
+
+    async def _iter_body(self, http_response: 'ClientResponse') -> AsyncIterator[bytes]:
+        r"""Provides the decoded body of a response as it is received, and counts the bytes received."""
+
+        decoder = ContentDecoder(http_response.headers.get('Content-Encoding'))
+        wire_bytes = 0
+        decoded_bytes = 0
+
+        async for chunk in http_response.content.iter_any():
+            wire_bytes += len(chunk)
+            chunk = decoder.decompress(chunk)
+            if chunk:
+                decoded_bytes += len(chunk)
+                yield chunk
+
+        chunk = decoder.flush()
+        if chunk:
+            decoded_bytes += len(chunk)
+            yield chunk
+
+        self._logger.debug('Received %i bytes, %i bytes decoded (%s)', wire_bytes, decoded_bytes, decoder.encoding)
+        self._compression_stats.record(decoder.encoding, wire_bytes, decoded_bytes)
+        if self._metrics is not None:
+            endpoint = self._metrics.get_endpoint(http_response.url.path)
+            self._metrics.received_bytes.inc(wire_bytes, api=self.API_FAMILY, endpoint=endpoint, encoding=decoder.encoding)
+
+    async def _read_body(self, http_response: 'ClientResponse') -> bytes:
+        r"""Reads the decoded body of a response."""
+
+        return b''.join([chunk async for chunk in self._iter_body(http_response)])
+
+    async def _read_json(self, http_response: 'ClientResponse', raw_body: bool=False) -> Any | None:
+        r"""
+        Reads the JSON body of a response.
+
+        Args:
+            http_response: The response.
+            raw_body: (Optional) Return the body as received, without decoding it.
+
+        Returns:
+            The deserialized body, or the body itself when `raw_body` is set, or `None` if the body is empty.
+
+        Raises:
+            ContentTypeError: If the response is not a JSON document.
+            ValueError: If the body is not valid JSON.
+        """
+
+        body = await self._read_body(http_response)
+
+        if not _JSON_CONTENT_TYPE.match(http_response.content_type):
+            from aiohttp import ContentTypeError
+            raise ContentTypeError(
+                http_response.request_info,
+                http_response.history,
+                status=http_response.status,
+                message=f'Attempt to decode JSON with unexpected mimetype: {http_response.content_type}',
+                headers=http_response.headers,
+            )
+
+        if not body.strip():
+            return None
+        if raw_body:
+            return body
+        return self._serializer.loads(body)
+
+    def _get_rate_limiter(
+            self,
+            url: str,
+            headers: Mapping[str, str],
+            auth: 'BasicAuth'=None,
+        ) -> RateLimiter:
+        if auth is not None:
+            credential = auth.login
+        else:
+            # Remove the authorization scheme, Bearer, to only keep the API secret or access token
+            credential = headers.get('Authorization')
+            if credential is not None:
+                credential = credential.rpartition(' ')[2]
+
+        return self._rate_limiters.get(urlsplit(url).hostname, credential)
+
+    @staticmethod
+    def _add_default_headers(headers: Mapping[str, str] | None) -> Mapping[str, str]:
+        if headers is None:
+            return dict(get_default_headers())
+
+        headers.update(get_default_headers())
+        return headers
+
+    async def _raise_for_status(self, http_response: 'ClientResponse'):
         raise NotImplementedError()
@@ -5,13 +5,16 @@ dolbyio_rest_apis.core.http_request_error
 This module contains the model HttpRequestError.
 """
 
-from aiohttp import ClientResponse
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
 
 class HttpRequestError(Exception):
     r"""HTTP exception raised from a client request."""
 
     def __init__(self,
-            http_response: ClientResponse,
+            http_response: 'ClientResponse',
             error_type: str,
             error_code: int,
             error_reason: str,
@@ -0,0 +1,199 @@
+"""
+dolbyio_rest_apis.core.json_stream
+~~~~~~~~~~~~~~~
+
+This module contains the incremental parser of the large list responses.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, List
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITERS = frozenset(' \t\n\r,]}')
+
+_STATE_START = 0
+_STATE_KEY = 1
+_STATE_COLON = 2
+_STATE_VALUE = 3
+_STATE_ITEMS = 4
+_STATE_DONE = 5
+
+class JsonArrayParser:
+    r"""
+    Incremental parser of a JSON document that provides the items of an array as soon as they are received,
+    without keeping the whole document in memory.
+
+    The array is either the document itself or the value of a key of the top level object,
+    like `data` in `{"status": "success", "data": [...]}`.
+    """
+
+    def __init__(self, key: str | None = 'data'):
+        r"""
+        Args:
+            key: (Optional) Key of the top level object holding the array,
+                `None` if the document is the array.
+        """
+
+        self._key = key
+        self._utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._state = _STATE_START
+        self._current_key: str | None = None
+        self._expect_item = True
+        self._closed = False
+
+    @property
+    def done(self) -> bool:
+        r"""`True` when the end of the array has been reached."""
+        return self._state == _STATE_DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        r"""
+        Parses the next part of the document.
+
+        Args:
+            chunk: Next bytes of the document.
+
+        Returns:
+            The items of the array completed by this part.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+
+        if self._state == _STATE_DONE:
+            return []
+
+        self._buffer += self._utf8_decoder.decode(chunk)
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        r"""
+        Parses the end of the document, once all the bytes have been received.
+
+        Returns:
+            The last items of the array.
+
+        Raises:
+            ValueError: If the document is not valid JSON or is incomplete.
+        """
+
+        self._closed = True
+        if self._state == _STATE_DONE:
+            return []
+
+        self._buffer += self._utf8_decoder.decode(b'', final=True)
+        items = self._parse()
+        if self._state != _STATE_DONE:
+            raise ValueError('The JSON document ended before the end of the array.')
+        return items
+
+    def _parse(self) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        pos = 0
+
+        while self._state != _STATE_DONE:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+            if self._state == _STATE_START:
+                expected = '{' if self._key is not None else '['
+                if char != expected:
+                    raise ValueError(f'Expected {expected!r} at the start of the JSON document, got {char!r}.')
+                pos += 1
+                self._state = _STATE_KEY if self._key is not None else _STATE_ITEMS
+            elif self._state == _STATE_KEY:
+                if char == ',':
+                    pos += 1
+                    continue
+                if char == '}':
+                    # The object does not contain the array
+                    self._state = _STATE_DONE
+                    break
+                if char != '"':
+                    raise ValueError(f'Expected a key in the JSON object, got {char!r}.')
+                try:
+                    self._current_key, pos = json.decoder.scanstring(buffer, pos + 1)
+                except json.JSONDecodeError:
+                    if self._closed:
+                        raise
+                    break # Wait for the end of the key
+                self._state = _STATE_COLON
+            elif self._state == _STATE_COLON:
+                if char != ':':
+                    raise ValueError(f'Expected \':\' after a key in the JSON object, got {char!r}.')
+                pos += 1
+                self._state = _STATE_VALUE
+            elif self._state == _STATE_VALUE:
+                if self._current_key == self._key and char == '[':
+                    pos += 1
+                    self._state = _STATE_ITEMS
+                    continue
+                value_end = self._decode(buffer, pos)
+                if value_end is None:
+                    break
+                pos = value_end[1]
+                self._state = _STATE_KEY
+            elif self._state == _STATE_ITEMS:
+                if char == ']':
+                    pos += 1
+                    self._state = _STATE_DONE
+                    break
+                if char == ',' and not self._expect_item:
+                    pos += 1
+                    self._expect_item = True
+                    continue
+                if not self._expect_item:
+                    raise ValueError(f'Expected \',\' or \']\' in the JSON array, got {char!r}.')
+                item_end = self._decode(buffer, pos)
+                if item_end is None:
+                    break
+                items.append(item_end[0])
+                pos = item_end[1]
+                self._expect_item = False
+
+        # Only keep what has not been parsed yet
+        self._buffer = buffer[pos:]
+        return items
+
+    def _decode(self, buffer: str, pos: int) -> tuple[Any, int] | None:
+        try:
+            value, end = self._json_decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if self._closed:
+                raise
+            return None # Wait for the end of the value
+
+        if not self._closed and (end >= len(buffer) or buffer[end] not in _DELIMITERS):
+            # A number at the end of the buffer may continue in the next part, like 1 in 1.5
+            return None
+        return value, end
+
+async def iter_json_array(chunks: AsyncIterable[bytes], key: str | None = 'data') -> AsyncIterator[Any]:
+    r"""
+    Provides the items of an array of a JSON document as the document is received.
+
+    Args:
+        chunks: Parts of the JSON document.
+        key: (Optional) Key of the top level object holding the array,
+            `None` if the document is the array.
+
+    Returns:
+        An asynchronous iterator over the items of the array.
+
+    Raises:
+        ValueError: If the document is not valid JSON or is incomplete.
+    """
+
+    parser = JsonArrayParser(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -0,0 +1,388 @@
+"""
+dolbyio_rest_apis.core.metrics
+~~~~~~~~~~~~~~~
+
+This module contains the in-process registry of the metrics of the HTTP requests.
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Mapping, Sequence, Set, Tuple, TYPE_CHECKING
+from .urls import get_endpoint_template
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Maximum number of distinct values of a label, the other values are replaced by OTHER_LABEL_VALUE
+MAX_LABEL_VALUES: int = 200
+OTHER_LABEL_VALUE = '{other}'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str='') -> str:
+    labels = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    if not labels:
+        return ''
+    return '{' + ','.join(labels) + '}'
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    r"""Base class of a family of metrics, one per combination of label values."""
+
+    type: str = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _get_key(self, labels: Mapping[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        r"""Gets the current values, one dictionary per combination of label values."""
+        raise NotImplementedError()
+
+    def to_openmetrics(self) -> List[str]:
+        r"""Gets the lines of the OpenMetrics text format describing this family."""
+        raise NotImplementedError()
+
+class Counter(Metric):
+    r"""Monotonic counter."""
+
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]=()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float=1, **labels: Any):
+        r"""
+        Increments the counter.
+
+        Args:
+            amount: (Optional) Value to add, must not be negative.
+            labels: Values of the labels.
+        """
+
+        key = self._get_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        r"""Gets the value of the counter for some label values."""
+        return self._values.get(self._get_key(labels), 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            { 'labels': dict(zip(self.label_names, key)), 'value': value }
+            for key, value in items
+        ]
+
+    def to_openmetrics(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [
+            f'# TYPE {self.name} counter',
+            f'# HELP {self.name} {_escape(self.documentation)}',
+        ]
+        for key, value in items:
+            lines.append(f'{self.name}_total{_format_labels(self.label_names, key)} {_format_number(value)}')
+        return lines
+
+class HistogramValues:
+    r"""
+    Log-linear histogram, like HDR histograms: each power of two is split into the same number of linear buckets,
+    so the relative error of the percentiles is bounded whatever the magnitude of the values.
+    """
+
+    SUB_BUCKET_BITS = 4 # 16 buckets per power of two, at most 6.25% of error
+
+    def __init__(self, resolution: float):
+        self._resolution = resolution
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        units = max(int(value / self._resolution), 0)
+        shift = max(units.bit_length() - self.SUB_BUCKET_BITS - 1, 0)
+        index = (shift << self.SUB_BUCKET_BITS) + (units >> shift)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _get_upper_bound(self, index: int) -> float:
+        shift = max((index >> self.SUB_BUCKET_BITS) - 1, 0)
+        mantissa = index - (shift << self.SUB_BUCKET_BITS)
+        return ((mantissa + 1) << shift) * self._resolution
+
+    def get_percentile(self, percentile: float) -> float:
+        r"""Gets the value under which a percentage, from 0 to 100, of the values are."""
+
+        if self.count == 0:
+            return math.nan
+
+        target = max(math.ceil(self.count * percentile / 100), 1)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._get_upper_bound(index), self.max)
+        return self.max
+
+    def get_cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        r"""Gets the number of values lower or equal to each bound."""
+
+        buckets = sorted((self._get_upper_bound(index), count) for index, count in self._counts.items())
+        counts = []
+        position = 0
+        seen = 0
+        for bound in bounds:
+            while position < len(buckets) and buckets[position][0] <= bound:
+                seen += buckets[position][1]
+                position += 1
+            counts.append(seen)
+        return counts
+
+class Histogram(Metric):
+    r"""Distribution of values, like the latency of the requests."""
+
+    type = 'histogram'
+
+    # Bounds of the buckets exported in the OpenMetrics format, the same for all the label values
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str]=(),
+            resolution: float=1e-6,
+            buckets: Sequence[float]=DEFAULT_BUCKETS,
+        ):
+        r"""
+        Args:
+            name: Name of the metric.
+            documentation: Description of the metric.
+            label_names: (Optional) Names of the labels.
+            resolution: (Optional) Smallest difference between two values, one microsecond by default.
+            buckets: (Optional) Bounds of the buckets exported in the OpenMetrics format.
+        """
+
+        super().__init__(name, documentation, label_names)
+        self._resolution = resolution
+        self._buckets = tuple(buckets)
+        self._values: Dict[Tuple[str, ...], HistogramValues] = {}
+
+    def observe(self, value: float, **labels: Any):
+        r"""
+        Adds a value to the histogram.
+
+        Args:
+            value: The value, like a duration in seconds.
+            labels: Values of the labels.
+        """
+
+        key = self._get_key(labels)
+        with self._lock:
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = HistogramValues(self._resolution)
+            values.record(value)
+
+    def get(self, **labels: Any) -> HistogramValues | None:
+        r"""Gets the values of the histogram for some label values."""
+        return self._values.get(self._get_key(labels))
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    'labels': dict(zip(self.label_names, key)),
+                    'count': values.count,
+                    'sum': values.sum,
+                    'min': values.min,
+                    'max': values.max,
+                    'p50': values.get_percentile(50),
+                    'p90': values.get_percentile(90),
+                    'p99': values.get_percentile(99),
+                }
+                for key, values in self._values.items()
+            ]
+
+    def to_openmetrics(self) -> List[str]:
+        lines = [
+            f'# TYPE {self.name} histogram',
+            f'# HELP {self.name} {_escape(self.documentation)}',
+        ]
+        bounds = self._buckets + (math.inf,)
+        with self._lock:
+            for key, values in sorted(self._values.items()):
+                counts = values.get_cumulative_counts(bounds)
+                for bound, count in zip(bounds, counts):
+                    labels = _format_labels(self.label_names, key, f'le="{_format_number(bound)}"')
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.label_names, key)
+                lines.append(f'{self.name}_count{labels} {values.count}')
+                lines.append(f'{self.name}_sum{labels} {_format_number(values.sum)}')
+        return lines
+
+class MetricsRegistry:
+    r"""
+    Registry of the metrics, with a snapshot API and an exporter to the OpenMetrics text format.
+
+    The exporter can be mounted in an aiohttp application:
+
+    .. code-block:: python
+
+        app.router.add_get('/metrics', registry.handle_openmetrics)
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self._label_values: Dict[str, Set[str]] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                    raise ValueError(f'The metric {metric.name} is already registered with a different type or labels.')
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str]=()) -> Counter:
+        r"""Gets or creates a counter."""
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str]=(),
+            resolution: float=1e-6,
+            buckets: Sequence[float]=Histogram.DEFAULT_BUCKETS,
+        ) -> Histogram:
+        r"""Gets or creates a histogram."""
+        return self._register(Histogram(name, documentation, label_names, resolution, buckets))
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        r"""Gets the current values of all the metrics, by name."""
+
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return { metric.name: metric.snapshot() for metric in metrics }
+
+    def to_openmetrics(self) -> str:
+        r"""Exports all the metrics in the OpenMetrics text format."""
+
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.to_openmetrics())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def limit_label_values(self, label_name: str, value: str, max_values: int=MAX_LABEL_VALUES) -> str:
+        r"""
+        Bounds the number of distinct values of a label across all the metrics of the registry.
+
+        Args:
+            label_name: Name of the label.
+            value: Value of the label.
+            max_values: (Optional) Maximum number of distinct values.
+
+        Returns:
+            The value, or :data:`OTHER_LABEL_VALUE` once `max_values` other values were seen.
+        """
+
+        with self._lock:
+            values = self._label_values.setdefault(label_name, set())
+            if value in values:
+                return value
+            if len(values) >= max_values:
+                return OTHER_LABEL_VALUE
+            values.add(value)
+            return value
+
+    async def handle_openmetrics(self, unused_request: 'web.Request') -> 'web.Response':
+        r"""aiohttp request handler exporting the metrics in the OpenMetrics text format."""
+
+        from aiohttp import web
+
+        return web.Response(
+            body=self.to_openmetrics().encode('utf-8'),
+            headers={ 'Content-Type': OPENMETRICS_CONTENT_TYPE },
+        )
+
+class HttpMetrics:
+    r"""
+    The metrics of the HTTP requests, labelled by API family, like `media` or `streaming`, and endpoint template.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self._registry = registry
+        self.requests = registry.counter(
+            'dolbyio_requests',
+            'Number of HTTP requests sent.',
+            ('api', 'endpoint', 'method', 'status'),
+        )
+        self.latency = registry.histogram(
+            'dolbyio_request_duration_seconds',
+            'Duration of the HTTP requests, until the body of the response is read.',
+            ('api', 'endpoint', 'method'),
+        )
+        self.retries = registry.counter(
+            'dolbyio_retries',
+            'Number of HTTP requests sent again after a throttling or server error.',
+            ('api', 'endpoint', 'reason'),
+        )
+        self.throttle_wait = registry.histogram(
+            'dolbyio_rate_limiter_wait_seconds',
+            'Time spent waiting for the rate limiter before sending a request.',
+            ('api', 'endpoint', 'priority'),
+        )
+        self.sent_bytes = registry.counter(
+            'dolbyio_sent_bytes',
+            'Number of bytes of the bodies of the requests.',
+            ('api', 'endpoint'),
+        )
+        self.received_bytes = registry.counter(
+            'dolbyio_received_bytes',
+            'Number of bytes of the bodies of the responses, as received from the server.',
+            ('api', 'endpoint', 'encoding'),
+        )
+        self.errors = registry.counter(
+            'dolbyio_errors',
+            'Number of requests that failed, by HTTP status and error code of the API.',
+            ('api', 'endpoint', 'status', 'code'),
+        )
+
+    def get_endpoint(self, path: str) -> str:
+        r"""
+        Gets the value of the endpoint label of a URL path, its template,
+        or :data:`OTHER_LABEL_VALUE` once :data:`MAX_LABEL_VALUES` endpoints were seen, like the paths of the storage.
+        """
+        return self._registry.limit_label_values('endpoint', get_endpoint_template(path))
@@ -5,45 +5,548 @@ dolbyio_rest_apis.core.rate_limiter
 This module contains the rate limiter for the HTTP requests.
 """
 
-import logging
 import asyncio
+from collections import deque, OrderedDict
+import enum
+import hashlib
+import logging
+import threading
 import time
+from typing import Deque, Dict, Tuple
+from .rate_limiter_backends import RateLimiterBackend
+
+def _get_running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+class Priority(enum.Enum):
+    r"""Lanes of the rate limiter, from the most latency sensitive requests to the background ones."""
+
+    INTERACTIVE = 'interactive'
+    NORMAL = 'normal'
+    BATCH = 'batch'
 
 class RateLimiter:
-    """
-    Rate limiter for HTTP requests.
+    r"""
+    Token bucket rate limiter for HTTP requests.
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens per second.
+    Each request takes one token. When the bucket is empty, the requests wait in FIFO order
+    within their :class:`Priority` lane and are released exactly when the next token becomes available.
+    The tokens are shared between the lanes with a smooth weighted round robin, following :attr:`LANE_WEIGHTS`,
+    and a request waiting for more than :attr:`STARVATION_TIMEOUT` seconds goes before all the others.
+
+    When the server throttles a request, :meth:`on_throttled` empties the bucket
+    and pauses it for the duration requested by the server.
+
+    A rate limiter can be shared by several threads, each running its own event loop:
+    the waiting requests are released on the event loop they are waiting on.
     """
 
     MAX_REQUESTS_PER_SECOND: int = 50
 
-    def __init__(self):
+    LANE_WEIGHTS = {
+        Priority.INTERACTIVE: 8,
+        Priority.NORMAL: 4,
+        Priority.BATCH: 1,
+    }
+    STARVATION_TIMEOUT: float = 10.0 # seconds
+
+    def __init__(self, rate: float=None, burst: int=None):
+        r"""
+        Args:
+            rate: (Optional) Number of requests allowed per second.
+                If not set, :attr:`MAX_REQUESTS_PER_SECOND` is used.
+            burst: (Optional) Maximum number of requests that can go through at once after an idle period.
+                If not set, the burst is equal to the rate.
+        """
+
         self._logger = logging.getLogger(RateLimiter.__name__)
-        self._nb_requests_left = self.MAX_REQUESTS_PER_SECOND
+
+        self._rate = float(rate if rate is not None else self.MAX_REQUESTS_PER_SECOND)
+        if self._rate <= 0:
+            raise ValueError('The rate must be greater than zero.')
+        self._burst = max(1, int(burst if burst is not None else self._rate))
+
+        self._tokens = float(self._burst)
         self._last_update = time.monotonic()
+        self._waiters: Dict[Priority, Deque[Tuple[asyncio.Future, float]]] = { priority: deque() for priority in Priority }
+        self._credits: Dict[Priority, int] = { priority: 0 for priority in Priority }
+        # Reentrant, the subclasses change the rate while the bucket is locked
+        self._lock = threading.RLock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+        # Incremented to ignore the timers scheduled before, on another event loop
+        self._timer_id = 0
 
-    async def wait_until_allowed(self):
-        """
+    @property
+    def rate(self) -> float:
+        r"""Current number of requests allowed per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        r"""Maximum number of requests that can go through at once."""
+        return self._burst
+
+    @property
+    def nb_waiting(self) -> int:
+        r"""Number of requests waiting to go through."""
+        with self._lock:
+            return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def wait_until_allowed(self, priority: Priority=Priority.NORMAL):
+        r"""
         Wait until the request is allowed to go through.
+
+        Args:
+            priority: (Optional) Lane of the request.
         """
 
-        log_printed = False
-        while self._nb_requests_left <= 0:
-            if not log_printed:
-                # Only print that message once
-                log_printed = True
-                self._logger.debug('This request is being throttled.')
+        with self._lock:
+            # Fast path, do not overtake the requests already waiting
+            if self.nb_waiting == 0 and self._try_acquire() == 0.0:
+                return
 
-            self._add_new_request()
-            await asyncio.sleep(0.1)
+            self._logger.debug('This request is being throttled.')
 
-        self._nb_requests_left -= 1
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[priority].append((waiter, time.monotonic()))
+            self._schedule_wake_up()
 
-    def _add_new_request(self):
-        now = time.monotonic()
-        left = self._nb_requests_left + now - self._last_update
-        if left > 0:
-            self._nb_requests_left = min(left, self.MAX_REQUESTS_PER_SECOND)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The token was granted but the request is cancelled, give it back
+                self._give_back_token()
+            raise
+
+    def on_success(self):
+        r"""Notifies the limiter that a request went through."""
+
+    def on_throttled(self, retry_after: float | None=None):
+        r"""
+        Notifies the limiter that the server rejected a request because of the rate, with a 429 status code.
+
+        Args:
+            retry_after: (Optional) Number of seconds the server asked to wait before sending another request.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after is not None and retry_after > 0:
+                # No token is added to the bucket until the server accepts requests again
+                self._last_update = max(self._last_update, now + retry_after)
+
+            self._schedule_wake_up()
+
+    def _set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = rate
+
+    def _give_back_token(self):
+        with self._lock:
+            self._tokens = min(self._tokens + 1, self._burst)
+            self._schedule_wake_up()
+
+    def _refill(self, now: float):
+        if now > self._last_update:
+            self._tokens = min(self._tokens + (now - self._last_update) * self._rate, self._burst)
             self._last_update = now
 
-# Instance of the rate limiter to share across all APIs
-RATE_LIMITER = RateLimiter()
+    def _try_acquire(self) -> float:
+        r"""Takes a token if one is available, returns `0.0` in that case, or the number of seconds until the next token."""
+
+        now = time.monotonic()
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        return max(self._last_update - now, 0.0) + (1 - self._tokens) / self._rate
+
+    def _schedule_wake_up(self):
+        with self._lock:
+            self._cancel_timer()
+            self._wake_up_waiters()
+
+    def _cancel_timer(self):
+        # The timer may belong to the event loop of another thread, it is then ignored when it fires
+        self._timer_id += 1
+        if self._timer is not None and self._timer_loop is _get_running_loop():
+            self._timer.cancel()
+        self._timer = None
+        self._timer_loop = None
+
+    def _on_timer(self, timer_id: int):
+        with self._lock:
+            if timer_id == self._timer_id:
+                self._timer = None
+                self._timer_loop = None
+                self._wake_up_waiters()
+
+    def _wake_up_waiters(self):
+        running_loop = _get_running_loop()
+
+        while True:
+            lanes = self._get_waiting_lanes()
+            if not lanes:
+                return
+
+            delay = self._try_acquire()
+            if delay > 0:
+                self._start_timer(lanes[0][0][0].get_loop(), delay, running_loop)
+                return
+
+            waiter, _ = self._select_lane(lanes).popleft()
+            loop = waiter.get_loop()
+            if loop is running_loop:
+                waiter.set_result(None)
+                continue
+
+            try:
+                loop.call_soon_threadsafe(self._grant, waiter)
+            except RuntimeError:
+                # The event loop of the request is closed
+                self._tokens = min(self._tokens + 1, self._burst)
+
+    def _start_timer(self, loop: asyncio.AbstractEventLoop, delay: float, running_loop: asyncio.AbstractEventLoop | None):
+        self._timer_id += 1
+        if loop is running_loop:
+            self._timer = loop.call_later(delay, self._on_timer, self._timer_id)
+            self._timer_loop = loop
+            return
+
+        try:
+            loop.call_soon_threadsafe(loop.call_later, delay, self._on_timer, self._timer_id)
+        except RuntimeError:
+            # The event loop of the next request is closed, its request will never be awaited
+            self._drop_waiters(loop)
+            self._wake_up_waiters()
+
+    def _grant(self, waiter: asyncio.Future):
+        # Runs on the event loop of the request
+        if waiter.done():
+            # Cancelled after the token was taken for it
+            self._give_back_token()
+        else:
+            waiter.set_result(None)
+
+    def _drop_waiters(self, loop: asyncio.AbstractEventLoop):
+        for waiters in self._waiters.values():
+            for item in [ item for item in waiters if item[0].get_loop() is loop ]:
+                waiters.remove(item)
+
+    def _get_waiting_lanes(self) -> list[Deque[Tuple[asyncio.Future, float]]]:
+        lanes = []
+        for priority, waiters in self._waiters.items():
+            while waiters and waiters[0][0].done():
+                # The request was cancelled while waiting
+                waiters.popleft()
+
+            if waiters:
+                lanes.append(waiters)
+            else:
+                self._credits[priority] = 0
+
+        return lanes
+
+    def _select_lane(self, lanes: list[Deque[Tuple[asyncio.Future, float]]]) -> Deque[Tuple[asyncio.Future, float]]:
+        # Starvation protection, the oldest request goes first when it waited for too long
+        oldest_lane = min(lanes, key=lambda waiters: waiters[0][1])
+        if time.monotonic() - oldest_lane[0][1] >= self.STARVATION_TIMEOUT:
+            return oldest_lane
+
+        if len(lanes) == 1:
+            return lanes[0]
+
+        # Smooth weighted round robin between the lanes with waiting requests
+        total_weight = 0
+        selected_priority = None
+        for priority, waiters in self._waiters.items():
+            if not waiters:
+                continue
+
+            weight = self.LANE_WEIGHTS[priority]
+            total_weight += weight
+            self._credits[priority] += weight
+            if selected_priority is None or self._credits[priority] > self._credits[selected_priority]:
+                selected_priority = priority
+
+        self._credits[selected_priority] -= total_weight
+        return self._waiters[selected_priority]
+
+class AdaptiveRateLimiter(RateLimiter):
+    r"""
+    Token bucket rate limiter that adjusts its rate to what the server accepts.
+
+    The rate is divided by two every time the server throttles the requests,
+    and increased by :attr:`INCREASE_STEP` requests per second, every second, while the requests go through,
+    up to the maximum rate (AIMD).
+    """
+
+    DECREASE_FACTOR: float = 0.5
+    INCREASE_STEP: float = 1.0
+
+    def __init__(
+            self,
+            rate: float=None,
+            burst: int=None,
+            min_rate: float=1.0,
+            max_rate: float=None,
+        ):
+        r"""
+        Args:
+            rate: (Optional) Initial number of requests allowed per second.
+                If not set, :attr:`MAX_REQUESTS_PER_SECOND` is used.
+            burst: (Optional) Maximum number of requests that can go through at once after an idle period.
+                If not set, the burst is equal to the initial rate.
+            min_rate: (Optional) The rate never goes below this number of requests per second.
+            max_rate: (Optional) The rate never goes above this number of requests per second.
+                If not set, the initial rate is the maximum.
+        """
+
+        super().__init__(rate, burst)
+
+        self._min_rate = min(min_rate, self._rate)
+        self._max_rate = self._rate if max_rate is None else max(max_rate, self._rate)
+        self._last_change = time.monotonic()
+
+    @property
+    def min_rate(self) -> float:
+        r"""Minimum number of requests allowed per second."""
+        return self._min_rate
+
+    @property
+    def max_rate(self) -> float:
+        r"""Maximum number of requests allowed per second."""
+        return self._max_rate
+
+    def on_success(self):
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_change
+            if elapsed < 1.0 or self._rate >= self._max_rate:
+                return
+
+            self._set_rate(min(self._rate + self.INCREASE_STEP * int(elapsed), self._max_rate))
+            self._last_change = now
+
+    def on_throttled(self, retry_after: float | None=None):
+        with self._lock:
+            now = time.monotonic()
+            # The requests already in flight are throttled as well, only slow down once for all of them
+            if self._last_change <= now:
+                new_rate = max(self._rate * self.DECREASE_FACTOR, self._min_rate)
+                if new_rate != self._rate:
+                    self._logger.info('Requests are throttled by the server, reducing the rate to %.1f requests per second.', new_rate)
+                self._set_rate(new_rate)
+                self._last_change = now + max(retry_after or 0.0, 1.0)
+
+            super().on_throttled(retry_after)
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    r"""
+    Rate limiter whose token bucket is stored in a :class:`RateLimiterBackend`,
+    so all the processes using the same backend and key share the same budget.
+
+    The requests of a process first go through a local bucket, in FIFO order within their :class:`Priority` lane,
+    then wait for a token of the shared bucket without blocking the event loop.
+    """
+
+    def __init__(
+            self,
+            backend: RateLimiterBackend,
+            key: str,
+            rate: float=None,
+            burst: int=None,
+            min_rate: float=1.0,
+            max_rate: float=None,
+            adaptive: bool=True,
+        ):
+        r"""
+        Args:
+            backend: Storage of the shared token bucket.
+            key: Identifier of the shared token bucket.
+            rate: (Optional) Initial number of requests allowed per second, for all the processes.
+                If not set, :attr:`MAX_REQUESTS_PER_SECOND` is used.
+            burst: (Optional) Maximum number of requests that can go through at once after an idle period.
+                If not set, the burst is equal to the initial rate.
+            min_rate: (Optional) The rate never goes below this number of requests per second.
+            max_rate: (Optional) The rate never goes above this number of requests per second.
+                If not set, the initial rate is the maximum.
+            adaptive: (Optional) Adjust the rate when the server throttles the requests,
+                like :class:`AdaptiveRateLimiter`. If `False`, the rate is fixed.
+        """
+
+        super().__init__(rate, burst, min_rate, max_rate)
+
+        self._backend = backend
+        self._key = key
+        self._adaptive = adaptive
+        # Keeps the pause requests sent to the backend from being garbage collected
+        self._pending_pauses = set()
+
+    @property
+    def adaptive(self) -> bool:
+        r"""The rate is adjusted when the server throttles the requests."""
+        return self._adaptive
+
+    async def wait_until_allowed(self, priority: Priority=Priority.NORMAL):
+        await super().wait_until_allowed(priority)
+
+        try:
+            while True:
+                delay = await self._backend.acquire(self._key, self._rate, self._burst)
+                if delay <= 0.0:
+                    return
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # No token of the shared bucket was taken, give back the local one
+            self._give_back_token()
+            raise
+
+    def on_success(self):
+        if self._adaptive:
+            super().on_success()
+
+    def on_throttled(self, retry_after: float | None=None):
+        if self._adaptive:
+            super().on_throttled(retry_after)
+        else:
+            RateLimiter.on_throttled(self, retry_after)
+
+        # Let the other processes know they must wait as well
+        task = asyncio.get_running_loop().create_task(self._backend.pause(self._key, retry_after if retry_after is not None else 0.0))
+        self._pending_pauses.add(task)
+        task.add_done_callback(self._pending_pauses.discard)
+
+class RateLimiterRegistry:
+    r"""
+    Registry of the rate limiters, with one :class:`RateLimiter` per host and credential,
+    so the requests made for different accounts or to different APIs do not share the same budget.
+    """
+
+    MAX_LIMITERS: int = 1024
+
+    def __init__(
+            self,
+            rate: float=None,
+            burst: int=None,
+            max_rate: float=None,
+            adaptive: bool=True,
+            backend: RateLimiterBackend=None,
+        ):
+        r"""
+        Args:
+            rate: (Optional) Default number of requests allowed per second for each host and credential.
+                If not set, :attr:`RateLimiter.MAX_REQUESTS_PER_SECOND` is used.
+            burst: (Optional) Default burst size. If not set, the burst is equal to the rate.
+            max_rate: (Optional) Default maximum rate of the adaptive rate limiters.
+                If not set, the rate is the maximum.
+            adaptive: (Optional) Use :class:`AdaptiveRateLimiter` objects that adjust their rate
+                when the server throttles the requests, instead of a fixed rate.
+            backend: (Optional) Storage to share the token buckets with the other processes
+                using the same backend, with :class:`SharedRateLimiter` objects.
+        """
+
+        self._adaptive = adaptive
+        self._backend = backend
+        self._default_settings = (rate, burst, max_rate)
+        self._settings: Dict[Tuple[str, str | None], Tuple[float | None, int | None, float | None]] = {}
+        self._limiters: OrderedDict[Tuple[str, str | None], RateLimiter] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(credential: str | None) -> str | None:
+        # Do not keep the secrets in memory longer than needed
+        if credential is None:
+            return None
+        return hashlib.sha256(credential.encode('utf-8')).hexdigest()
+
+    def configure(
+            self,
+            host: str,
+            rate: float=None,
+            burst: int=None,
+            credential: str=None,
+            max_rate: float=None,
+        ) -> None:
+        r"""
+        Sets the rate for a host, or for a single credential on that host.
+
+        Args:
+            host: Host name of the API, for example `api.millicast.com`.
+            rate: (Optional) Number of requests allowed per second.
+                If not set, :attr:`RateLimiter.MAX_REQUESTS_PER_SECOND` is used.
+            burst: (Optional) Maximum number of requests that can go through at once.
+                If not set, the burst is equal to the rate.
+            credential: (Optional) API secret or access token these settings apply to.
+                If not set, the settings apply to all the credentials without specific settings.
+            max_rate: (Optional) Maximum rate of the adaptive rate limiters.
+                If not set, the rate is the maximum.
+        """
+
+        fingerprint = self._fingerprint(credential)
+        with self._lock:
+            self._settings[(host, fingerprint)] = (rate, burst, max_rate)
+
+            # Drop the existing limiters so the new settings apply to the next requests
+            for key in [key for key in self._limiters if key[0] == host and (credential is None or key[1] == fingerprint)]:
+                del self._limiters[key]
+
+    def get(self, host: str, credential: str | None) -> RateLimiter:
+        r"""
+        Gets the rate limiter for a host and a credential.
+
+        Args:
+            host: Host name of the API.
+            credential: API secret, access token or app key used for the request.
+
+        Returns:
+            The :class:`RateLimiter` object.
+        """
+
+        key = (host, self._fingerprint(credential))
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is not None:
+                self._limiters.move_to_end(key)
+                return limiter
+
+            settings = self._settings.get(key) or self._settings.get((host, None)) or self._default_settings
+            rate, burst, max_rate = settings
+            if self._backend is not None:
+                limiter = SharedRateLimiter(
+                    self._backend,
+                    f'{host}:{key[1]}',
+                    rate=rate,
+                    burst=burst,
+                    max_rate=max_rate,
+                    adaptive=self._adaptive,
+                )
+            elif self._adaptive:
+                limiter = AdaptiveRateLimiter(rate=rate, burst=burst, max_rate=max_rate)
+            else:
+                limiter = RateLimiter(rate=rate, burst=burst)
+            self._limiters[key] = limiter
+            self._evict()
+
+        return limiter
+
+    def _evict(self):
+        # Access tokens expire and get renewed, forget the least recently used idle limiters
+        for key in list(self._limiters):
+            if len(self._limiters) <= self.MAX_LIMITERS:
+                break
+            if self._limiters[key].nb_waiting == 0:
+                del self._limiters[key]
+
+# Registry of the rate limiters to share across all APIs
+RATE_LIMITERS = RateLimiterRegistry()
@@ -0,0 +1,209 @@
+"""
+dolbyio_rest_apis.core.rate_limiter_backends
+~~~~~~~~~~~~~~~
+
+This module contains the storages used to share the token buckets of the rate limiters across processes.
+"""
+
+import asyncio
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict
+
+try:
+    import fcntl
+except ImportError: # Not available on Windows
+    fcntl = None
+
+class RateLimiterBackend:
+    r"""
+    Interface of a storage that holds token buckets shared by several processes.
+
+    The methods are coroutines awaited on the event loop of the requests, they must never block it.
+    """
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        r"""
+        Takes a token from a shared bucket.
+
+        Args:
+            key: Identifier of the bucket.
+            rate: Number of tokens added to the bucket per second.
+            burst: Maximum number of tokens in the bucket.
+
+        Returns:
+            `0.0` if a token was taken, otherwise the number of seconds until the next token is available.
+        """
+        raise NotImplementedError()
+
+    async def pause(self, key: str, seconds: float) -> None:
+        r"""
+        Empties a shared bucket and stops refilling it for some time, when the server throttled a request.
+
+        Args:
+            key: Identifier of the bucket.
+            seconds: Number of seconds before the bucket starts being refilled again.
+        """
+        raise NotImplementedError()
+
+class FileRateLimiterBackend(RateLimiterBackend):
+    r"""
+    Shares the token buckets between the processes of a machine using small files locked with `flock`.
+
+    Each bucket is stored in its own file, in the provided directory, as two doubles:
+    the number of tokens and the time of the last refill. Only available on POSIX systems.
+
+    The files are locked without waiting, a bucket locked by another process is retried after a short sleep.
+    """
+
+    _STATE = struct.Struct('=dd')
+
+    LOCK_RETRY_DELAY: float = 0.001 # seconds
+    LOCK_MAX_RETRY_DELAY: float = 0.05 # seconds
+
+    def __init__(self, directory: str):
+        r"""
+        Args:
+            directory: Directory where to store the buckets, it must be the same for all the processes.
+        """
+
+        if fcntl is None:
+            raise NotImplementedError('The file rate limiter backend requires a POSIX system.')
+
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._fds: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # The threads of the process share the file descriptors, the file locks do not exclude them from each other
+        self._update_lock = threading.Lock()
+
+    def _get_fd(self, key: str) -> int:
+        fd = self._fds.get(key)
+        if fd is None:
+            with self._lock:
+                fd = self._fds.get(key)
+                if fd is None:
+                    file_name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+                    fd = os.open(os.path.join(self._directory, file_name), os.O_RDWR | os.O_CREAT, 0o600)
+                    self._fds[key] = fd
+        return fd
+
+    def _try_lock(self, fd: int) -> bool:
+        # Both locks are released by _update, once the bucket is written
+        if not self._update_lock.acquire(blocking=False): # pylint: disable=consider-using-with
+            return False
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._update_lock.release()
+            return False
+        return True
+
+    async def _update(self, key: str, burst: float, update) -> Any:
+        fd = self._get_fd(key)
+        delay = self.LOCK_RETRY_DELAY
+        while not self._try_lock(fd):
+            # The bucket is only locked for the few microseconds of an update
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.LOCK_MAX_RETRY_DELAY)
+
+        try:
+            data = os.pread(fd, self._STATE.size, 0)
+            now = time.time()
+            if len(data) == self._STATE.size:
+                tokens, last_update = self._STATE.unpack(data)
+            else:
+                tokens, last_update = burst, now
+
+            tokens, last_update, result = update(tokens, last_update, now)
+            os.pwrite(fd, self._STATE.pack(tokens, last_update), 0)
+            return result
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            self._update_lock.release()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        def update(tokens: float, last_update: float, now: float):
+            if now > last_update:
+                tokens = min(tokens + (now - last_update) * rate, burst)
+                last_update = now
+            if tokens >= 1:
+                return tokens - 1, last_update, 0.0
+            return tokens, last_update, max(last_update - now, 0.0) + (1 - tokens) / rate
+
+        return await self._update(key, burst, update)
+
+    async def pause(self, key: str, seconds: float) -> None:
+        def update(tokens: float, last_update: float, now: float):
+            return min(tokens, 0.0), max(last_update, now + seconds), None
+
+        await self._update(key, 0.0, update)
+
+    def close(self):
+        r"""Closes the files of the buckets."""
+
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+class RedisRateLimiterBackend(RateLimiterBackend):
+    r"""
+    Shares the token buckets through a Redis compatible server, using a Lua script to update a bucket atomically.
+
+    Any asynchronous client exposing an `eval(script, numkeys, *keys_and_args)` coroutine can be used,
+    like `redis.asyncio.Redis`.
+    """
+
+    _ACQUIRE_SCRIPT = '''
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_update')
+local tokens = tonumber(state[1]) or burst
+local last_update = tonumber(state[2]) or now
+if now > last_update then
+    tokens = math.min(tokens + (now - last_update) * rate, burst)
+    last_update = now
+end
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.max(last_update - now, 0) + (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_update', tostring(last_update))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+'''
+
+    _PAUSE_SCRIPT = '''
+local until_time = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_update')
+local tokens = math.min(tonumber(state[1]) or 0, 0)
+local last_update = math.max(tonumber(state[2]) or 0, until_time)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_update', tostring(last_update))
+redis.call('EXPIRE', KEYS[1], 3600)
+return 0
+'''
+
+    def __init__(self, client: Any, prefix: str='dolbyio_rest_apis:rate_limiter:'):
+        r"""
+        Args:
+            client: Asynchronous Redis compatible client.
+            prefix: (Optional) Prefix of the keys where the buckets are stored.
+        """
+
+        self._client = client
+        self._prefix = prefix
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        wait = await self._client.eval(self._ACQUIRE_SCRIPT, 1, self._prefix + key, rate, burst, time.time())
+        return float(wait)
+
+    async def pause(self, key: str, seconds: float) -> None:
+        await self._client.eval(self._PAUSE_SCRIPT, 1, self._prefix + key, time.time() + seconds)
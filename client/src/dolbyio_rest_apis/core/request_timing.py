@@ -0,0 +1,141 @@
+"""
+dolbyio_rest_apis.core.request_timing
+~~~~~~~~~~~~~~~
+
+This module contains the measure of the duration of each phase of the HTTP requests.
+"""
+
+from dataclasses import dataclass, field
+import time
+from typing import Callable, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import TraceConfig
+
+@dataclass
+class RequestTiming:
+    r"""
+    The :class:`RequestTiming` object, the duration of each phase of an HTTP request.
+
+    The durations are in seconds, measured with :func:`time.perf_counter`,
+    and are `None` when the phase did not happen, like the DNS resolution for a reused connection.
+
+    Attributes:
+        method: HTTP method of the request.
+        url: URL of the request, without the query parameters.
+        endpoint: Template of the endpoint, where the numeric identifiers are replaced by `{id}`.
+        status: HTTP status code of the response, `None` if no response was received.
+        attempts: Number of attempts, including the retries after a server error.
+        reused_connection: The request was sent on a connection kept alive from a previous request.
+        queued: Time spent waiting for a free connection in the connection pool.
+        dns: Time spent resolving the host name.
+        connect: Time spent opening the connection, including the TLS handshake.
+        ttfb: Time to first byte, from the start of the request until the response headers are received.
+        body: Time spent reading the body of the response.
+        total: Time from the start of the request until the body of the response is read.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    status: int | None = None
+    attempts: int = 1
+    reused_connection: bool = False
+    queued: float | None = None
+    dns: float | None = None
+    connect: float | None = None
+    ttfb: float | None = None
+    body: float | None = None
+    total: float | None = None
+    _start: float = field(default_factory=time.perf_counter, init=False, repr=False, compare=False)
+    _phase_starts: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _attempt_start: float = field(default=0.0, init=False, repr=False, compare=False)
+    _headers_received: float | None = field(default=None, init=False, repr=False, compare=False)
+
+    def start_attempt(self, attempt: int):
+        r"""Records the start of an attempt, only the phases of the last attempt are kept."""
+
+        self._attempt_start = time.perf_counter()
+        self.attempts = attempt
+        self.reused_connection = False
+        self.queued = self.dns = self.connect = self.ttfb = None
+        self._phase_starts.clear()
+
+    def start_phase(self, phase: str):
+        r"""Records the start of a phase, `queued`, `dns` or `connect`."""
+        self._phase_starts[phase] = time.perf_counter()
+
+    def end_phase(self, phase: str):
+        r"""Records the end of a phase, `queued`, `dns` or `connect`."""
+        if phase in self._phase_starts:
+            setattr(self, phase, time.perf_counter() - self._phase_starts[phase])
+
+    def headers_received(self, status: int):
+        r"""Records the reception of the headers of the response."""
+
+        self._headers_received = time.perf_counter()
+        self.ttfb = self._headers_received - self._attempt_start
+        self.status = status
+
+    def response_read(self):
+        r"""Records the end of the body of the response, and of the request."""
+
+        now = time.perf_counter()
+        if self._headers_received is not None:
+            self.body = now - self._headers_received
+        self.total = now - self._start
+
+RequestTimingCallback = Callable[[RequestTiming], None]
+
+def _get_timing(trace_config_ctx) -> RequestTiming | None:
+    # The retry client wraps the context of the request in a dictionary
+    trace_request_ctx = trace_config_ctx.trace_request_ctx
+    if isinstance(trace_request_ctx, dict):
+        return trace_request_ctx.get('timing')
+    return None
+
+async def _on_request_start(unused_session, trace_config_ctx, unused_params):
+    timing = _get_timing(trace_config_ctx)
+    if timing is not None:
+        timing.start_attempt(trace_config_ctx.trace_request_ctx.get('current_attempt', 1))
+
+def _on_phase_start(phase: str):
+    async def on_phase_start(unused_session, trace_config_ctx, unused_params):
+        timing = _get_timing(trace_config_ctx)
+        if timing is not None:
+            timing.start_phase(phase)
+    return on_phase_start
+
+def _on_phase_end(phase: str):
+    async def on_phase_end(unused_session, trace_config_ctx, unused_params):
+        timing = _get_timing(trace_config_ctx)
+        if timing is not None:
+            timing.end_phase(phase)
+    return on_phase_end
+
+async def _on_connection_reuse(unused_session, trace_config_ctx, unused_params):
+    timing = _get_timing(trace_config_ctx)
+    if timing is not None:
+        timing.reused_connection = True
+
+async def _on_request_end(unused_session, trace_config_ctx, params):
+    timing = _get_timing(trace_config_ctx)
+    if timing is not None:
+        timing.headers_received(params.response.status)
+
+def create_trace_config() -> 'TraceConfig':
+    r"""Creates the :class:`TraceConfig` filling the :class:`RequestTiming` objects of the requests."""
+
+    from aiohttp import TraceConfig
+
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_queued_start.append(_on_phase_start('queued'))
+    trace_config.on_connection_queued_end.append(_on_phase_end('queued'))
+    trace_config.on_dns_resolvehost_start.append(_on_phase_start('dns'))
+    trace_config.on_dns_resolvehost_end.append(_on_phase_end('dns'))
+    trace_config.on_connection_create_start.append(_on_phase_start('connect'))
+    trace_config.on_connection_create_end.append(_on_phase_end('connect'))
+    trace_config.on_connection_reuseconn.append(_on_connection_reuse)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
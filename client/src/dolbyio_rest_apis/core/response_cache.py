@@ -0,0 +1,138 @@
+"""
+dolbyio_rest_apis.core.response_cache
+~~~~~~~~~~~~~~~
+
+This module contains the caches for the responses of the read-mostly endpoints.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Dict, Iterable, Set, Tuple
+
+class ResponseCache:
+    r"""
+    Interface of a cache for the responses of the API.
+
+    The entries are tagged so that all the responses of a family of resources can be invalidated at once,
+    when one of them is modified.
+    """
+
+    def get(self, key: str) -> Any | None:
+        r"""
+        Gets a response from the cache.
+
+        Args:
+            key: Identifier of the response.
+
+        Returns:
+            The cached response or `None` if it is not in the cache or has expired.
+        """
+        raise NotImplementedError()
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]=()) -> None:
+        r"""
+        Adds a response to the cache.
+
+        Args:
+            key: Identifier of the response.
+            value: The response, it must not be `None`.
+            ttl: Number of seconds the response can be used.
+            tags: (Optional) Tags used to invalidate the response.
+        """
+        raise NotImplementedError()
+
+    def invalidate(self, tag: str) -> None:
+        r"""
+        Removes all the responses with a tag from the cache.
+
+        Args:
+            tag: Tag of the responses to remove.
+        """
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        r"""Removes all the responses from the cache."""
+        raise NotImplementedError()
+
+class MemoryResponseCache(ResponseCache):
+    r"""
+    In-memory cache that keeps the most recently used responses, up to a maximum number of entries.
+    """
+
+    def __init__(self, max_entries: int=1024):
+        r"""
+        Args:
+            max_entries: (Optional) Maximum number of responses to keep,
+                the least recently used responses are removed first.
+        """
+
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]] = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._nb_hits = 0
+        self._nb_misses = 0
+
+    @property
+    def nb_hits(self) -> int:
+        r"""Number of responses found in the cache."""
+        return self._nb_hits
+
+    @property
+    def nb_misses(self) -> int:
+        r"""Number of responses not found in the cache, or expired."""
+        return self._nb_misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._nb_misses += 1
+                return None
+
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._nb_misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._nb_hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]=()) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tag: str) -> None:
+        with self._lock:
+            for key in self._tags.pop(tag, ()):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,53 @@
+"""
+dolbyio_rest_apis.core.response_mode
+~~~~~~~~~~~~~~~
+
+This module contains the modes in which the API functions return the responses.
+"""
+
+import contextlib
+from contextvars import ContextVar
+from enum import Enum
+from typing import Iterator
+
+class ResponseMode(Enum):
+    r"""What the API functions return for the responses of the server."""
+
+    MODEL = 'model'
+    r'''The models, like :class:`PublishToken` or :class:`EnhanceJob`.'''
+
+    JSON = 'json'
+    r'''The decoded JSON, made of dictionaries and lists, the models are not built.'''
+
+    BYTES = 'bytes'
+    r'''
+    The body of the response, as received, the JSON is not decoded.
+    The functions that need to read the response, like the ones listing all the jobs
+    or iterating over a list, return the decoded JSON instead.
+    '''
+
+_response_mode: ContextVar[ResponseMode | None] = ContextVar('dolbyio_rest_apis_response_mode', default=None)
+
+def get_response_mode() -> ResponseMode | None:
+    r"""Gets the response mode set by :func:`response_mode` for the current context, if any."""
+    return _response_mode.get()
+
+@contextlib.contextmanager
+def response_mode(mode: ResponseMode) -> Iterator[None]:
+    r"""
+    Sets the response mode of the API calls made in this block, instead of the mode of their HTTP context.
+
+    .. code-block:: python
+
+        with response_mode(ResponseMode.JSON):
+            token = await publish_token.read(api_secret, token_id)
+
+    Args:
+        mode: The response mode.
+    """
+
+    token = _response_mode.set(mode)
+    try:
+        yield
+    finally:
+        _response_mode.reset(token)
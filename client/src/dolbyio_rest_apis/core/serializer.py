@@ -0,0 +1,138 @@
+"""
+dolbyio_rest_apis.core.serializer
+~~~~~~~~~~~~~~~
+
+This module contains the JSON serializers used for the bodies of the requests and responses.
+"""
+
+import json
+from typing import Any
+
+# Optional packages, faster than the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class JsonSerializer:
+    r"""
+    Interface of a JSON serializer.
+
+    The serializers must produce compact JSON, the bodies are not meant to be read by humans.
+    """
+
+    name: str = ''
+
+    def dumps(self, obj: Any) -> str | bytes:
+        r"""
+        Serializes an object to JSON.
+
+        Args:
+            obj: Object to serialize, made of dictionaries, lists and primitive types.
+
+        Returns:
+            The JSON document, as a UTF-8 encoded string or bytes.
+        """
+        raise NotImplementedError()
+
+    def loads(self, data: str | bytes) -> Any:
+        r"""
+        Deserializes a JSON document.
+
+        Args:
+            data: The JSON document.
+
+        Returns:
+            The deserialized object.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+        raise NotImplementedError()
+
+class StdlibJsonSerializer(JsonSerializer):
+    r"""Serializer based on the :mod:`json` module of the standard library."""
+
+    name = 'json'
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        self._decoder = json.JSONDecoder()
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return self._decoder.decode(data)
+
+class OrjsonSerializer(JsonSerializer):
+    r"""Serializer based on the `orjson` package."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('The orjson package is not installed.')
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+class MsgspecSerializer(JsonSerializer):
+    r"""Serializer based on the `msgspec` package."""
+
+    name = 'msgspec'
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError('The msgspec package is not installed.')
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Raise the same error as the other serializers
+            raise ValueError(str(e)) from e
+
+_default_serializer: JsonSerializer | None = None
+
+def get_default_serializer() -> JsonSerializer:
+    r"""
+    Gets the serializer used when none is provided to an HTTP context:
+    `orjson` if installed, otherwise `msgspec` if installed, otherwise the standard library.
+    """
+
+    global _default_serializer
+    if _default_serializer is None:
+        if orjson is not None:
+            _default_serializer = OrjsonSerializer()
+        elif msgspec is not None:
+            _default_serializer = MsgspecSerializer()
+        else:
+            _default_serializer = StdlibJsonSerializer()
+    return _default_serializer
+
+def set_default_serializer(serializer: JsonSerializer | None):
+    r"""
+    Sets the serializer used when none is provided to an HTTP context.
+
+    Args:
+        serializer: The serializer, `None` to pick the fastest one installed.
+    """
+
+    global _default_serializer
+    _default_serializer = serializer
@@ -0,0 +1,68 @@
+"""
+dolbyio_rest_apis.core.single_flight
+~~~~~~~~~~~~~~~
+
+This module contains the helper to coalesce identical requests in flight.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    r"""
+    Coalesces identical calls made at the same time into a single one,
+    all the callers get the result, or the exception, of that call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._nb_calls = 0
+        self._nb_deduplicated = 0
+
+    @property
+    def nb_calls(self) -> int:
+        r"""Number of calls requested."""
+        return self._nb_calls
+
+    @property
+    def nb_deduplicated(self) -> int:
+        r"""Number of calls that reused the result of an identical call in flight."""
+        return self._nb_deduplicated
+
+    @property
+    def nb_in_flight(self) -> int:
+        r"""Number of distinct calls in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        r"""
+        Runs a call, or waits for the identical call already in flight.
+
+        Args:
+            key: Identifier of the call, identical calls must have the same key.
+            func: Function starting the call.
+
+        Returns:
+            The result of the call.
+        """
+
+        self._nb_calls += 1
+
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            call.add_done_callback(lambda done_call: self._on_done(key, done_call))
+        else:
+            self._nb_deduplicated += 1
+
+        # A caller being cancelled must not cancel the call for the other callers
+        return await asyncio.shield(call)
+
+    def _on_done(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+        if not call.cancelled():
+            # Mark the exception as retrieved in case all the callers were cancelled
+            call.exception()
@@ -0,0 +1,231 @@
+"""
+dolbyio_rest_apis.core.sync_client
+~~~~~~~~~~~~~~~
+
+This module contains the base class for the synchronous clients,
+running the asynchronous API calls on a background event loop.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Iterator, Optional, Type, TypeVar
+from .client import BoundModule, Client
+
+T = TypeVar('T')
+
+class EventLoopThread:
+    r"""
+    Event loop running forever in a background thread, to which coroutines can be submitted from any thread.
+    """
+
+    def __init__(self, name: str='dolbyio-rest-apis'):
+        r"""
+        Args:
+            name: (Optional) Name of the thread.
+        """
+
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        r"""The event loop."""
+        return self._loop
+
+    def submit(self, coroutine: Awaitable[T]) -> concurrent.futures.Future:
+        r"""
+        Schedules a coroutine on the event loop.
+        The coroutine sees the context variables of the caller, like the mode set by :func:`response_mode`.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The future of the result of the coroutine.
+        """
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def run(self, coroutine: Awaitable[T], timeout: float | None = None) -> T:
+        r"""
+        Runs a coroutine on the event loop and waits for its result.
+
+        Args:
+            coroutine: The coroutine to run.
+            timeout: (Optional) Maximum number of seconds to wait.
+
+        Returns:
+            The result of the coroutine.
+
+        Raises:
+            RuntimeError: If called from the thread of the event loop, which would never return.
+        """
+
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError('The synchronous client cannot be called from its own event loop.')
+
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Interrupted, or timed out, stop the call instead of letting it run in the background
+            future.cancel()
+            raise
+
+    def close(self):
+        r"""Stops the event loop and waits for its thread to end."""
+
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+_default_loop_thread: EventLoopThread | None = None
+_default_loop_thread_lock = threading.Lock()
+
+def get_default_loop_thread() -> EventLoopThread:
+    r"""
+    Gets the event loop thread shared by the synchronous clients created without one,
+    started on the first call and running until the end of the process.
+    """
+
+    global _default_loop_thread
+    with _default_loop_thread_lock:
+        if _default_loop_thread is None or _default_loop_thread.loop.is_closed():
+            _default_loop_thread = EventLoopThread()
+        return _default_loop_thread
+
+class SyncFunction:
+    r"""
+    Synchronous version of an API function bound to a client,
+    `submit` runs the call without waiting for its result.
+    """
+
+    def __init__(self, loop_thread: EventLoopThread, func: Callable[..., Awaitable[Any]]):
+        self._loop_thread = loop_thread
+        self._func = func
+        functools.update_wrapper(self, func.func if isinstance(func, functools.partial) else func)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._loop_thread.run(self._func(*args, **kwargs))
+
+    def submit(self, *args, **kwargs) -> concurrent.futures.Future:
+        r"""Starts the call and returns the future of its result."""
+        return self._loop_thread.submit(self._func(*args, **kwargs))
+
+class SyncBoundModule:
+    r"""
+    Exposes the public functions of an API module as synchronous functions,
+    the asynchronous iterators are exposed as generators.
+    """
+
+    def __init__(self, loop_thread: EventLoopThread, bound_module: BoundModule):
+        self._loop_thread = loop_thread
+        self._bound_module = bound_module
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        func = getattr(self._bound_module, name)
+        original_func = func.func if isinstance(func, functools.partial) else func
+
+        if inspect.isasyncgenfunction(original_func):
+            sync_func = self._wrap_generator(func)
+        else:
+            sync_func = SyncFunction(self._loop_thread, func)
+
+        # Cache the function for the next calls
+        setattr(self, name, sync_func)
+        return sync_func
+
+    def __dir__(self):
+        return dir(self._bound_module)
+
+    def _wrap_generator(self, func: Callable[..., Any]) -> Callable[..., Iterator[Any]]:
+        loop_thread = self._loop_thread
+
+        @functools.wraps(func.func if isinstance(func, functools.partial) else func)
+        def generator(*args, **kwargs) -> Iterator[Any]:
+            async_generator = func(*args, **kwargs)
+            try:
+                while True:
+                    try:
+                        yield loop_thread.run(anext(async_generator))
+                    except StopAsyncIteration:
+                        return
+            finally:
+                # Release the response when the caller stops early
+                loop_thread.run(async_generator.aclose())
+
+        return generator
+
+class SyncClient:
+    r"""
+    Base class for the synchronous clients.
+
+    The asynchronous client, its HTTP session and its connections live on a background event loop
+    for the lifetime of the synchronous client. The calls can be made from any thread, like the workers of a web server.
+    """
+
+    def __init__(self, client_factory: Callable[[], Client], loop_thread: EventLoopThread=None):
+        r"""
+        Args:
+            client_factory: Function creating the asynchronous client, called on the event loop.
+            loop_thread: (Optional) Event loop to run the calls on, it can be shared by several clients.
+                If not set, the event loop returned by :func:`get_default_loop_thread` is used,
+                so all the clients share the same rate limiters from a single event loop.
+        """
+
+        self._loop_thread = get_default_loop_thread() if loop_thread is None else loop_thread
+
+        async def create_client() -> Client:
+            # The HTTP session must be created on the event loop it is used on
+            return client_factory()
+
+        self._client = self._loop_thread.run(create_client())
+
+    @property
+    def client(self) -> Client:
+        r"""The asynchronous client, only to be used on :attr:`loop_thread`."""
+        return self._client
+
+    @property
+    def loop_thread(self) -> EventLoopThread:
+        r"""The event loop running the calls."""
+        return self._loop_thread
+
+    def _bind(self, bound_module: BoundModule) -> SyncBoundModule:
+        return SyncBoundModule(self._loop_thread, bound_module)
+
+    def close(self):
+        r"""Closes the asynchronous client, the event loop keeps running for the other clients."""
+
+        if self._client is not None:
+            self._loop_thread.run(self._client.close())
+            self._client = None
+
+    def __enter__(self) -> 'SyncClient':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
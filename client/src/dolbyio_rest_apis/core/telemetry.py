@@ -0,0 +1,176 @@
+"""
+dolbyio_rest_apis.core.telemetry
+~~~~~~~~~~~~~~~
+
+This module contains the optional integration with OpenTelemetry.
+
+When the `opentelemetry-api` package is installed, each API call creates a span named after the function,
+like `media.mastering.start`, with child spans for the HTTP requests and the rate limiter waits.
+The trace context is propagated to the server with the `traceparent` header.
+When the package is not installed, everything in this module does nothing.
+"""
+
+import contextlib
+import functools
+from typing import Any, Callable, Iterator, Mapping, MutableMapping, TypeVar
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError: # Optional dependency
+    propagate = None
+    trace = None
+
+# Arguments of the API functions recorded as attributes of the spans
+SPAN_ATTRIBUTE_ARGUMENTS = ('job_id', 'token_id', 'webhook_id', 'stream_id')
+
+_tracer = None
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+def is_enabled() -> bool:
+    r"""Gets if OpenTelemetry is installed and the spans are created."""
+    return trace is not None
+
+def _get_tracer():
+    global _tracer
+    if _tracer is None:
+        # The proxy tracer follows the tracer provider, even when it is set after this call
+        _tracer = trace.get_tracer('dolbyio_rest_apis')
+    return _tracer
+
+def traced(func: F=None, *, name: str | None = None, result_attribute: str | None = None) -> F:
+    r"""
+    Decorator creating a span for each call of an API function, or asynchronous generator.
+
+    Args:
+        func: The API function.
+        name: (Optional) Name of the span, by default the module and function names, like `media.mastering.start`.
+        result_attribute: (Optional) Name of the attribute where to record the result of the function,
+            or its `id`, like the identifier of the job that was started.
+    """
+
+    if func is None:
+        return functools.partial(traced, name=name, result_attribute=result_attribute)
+
+    if trace is None:
+        # Nothing to trace, keep the function as is
+        return func
+
+    import inspect
+
+    if name is None:
+        name = f'{func.__module__.removeprefix("dolbyio_rest_apis.")}.{func.__name__}'
+
+    signature = inspect.signature(func)
+    attribute_arguments = [argument for argument in SPAN_ATTRIBUTE_ARGUMENTS if argument in signature.parameters]
+
+    def get_attributes(args, kwargs) -> Mapping[str, Any]:
+        if not attribute_arguments:
+            return {}
+        bound_arguments = signature.bind_partial(*args, **kwargs).arguments
+        return {
+            f'dolbyio.{argument}': str(bound_arguments[argument])
+            for argument in attribute_arguments
+            if bound_arguments.get(argument) is not None
+        }
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def async_generator_wrapper(*args, **kwargs):
+            span = _get_tracer().start_span(name, attributes=get_attributes(args, kwargs))
+            try:
+                generator = func(*args, **kwargs)
+                while True:
+                    # Only make the span current while the generator runs, not while the caller handles an item
+                    with trace.use_span(span, end_on_exit=False):
+                        try:
+                            item = await anext(generator)
+                        except StopAsyncIteration:
+                            break
+                    yield item
+            finally:
+                span.end()
+
+        return async_generator_wrapper
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with _get_tracer().start_as_current_span(name, attributes=get_attributes(args, kwargs)) as span:
+            result = await func(*args, **kwargs)
+            if result_attribute is not None:
+                value = result if isinstance(result, (str, int)) else getattr(result, 'id', None)
+                if value is not None:
+                    span.set_attribute(f'dolbyio.{result_attribute}', str(value))
+            return result
+
+    return wrapper
+
+@contextlib.contextmanager
+def start_http_span(method: str, url: str, headers: MutableMapping[str, str], attempt: int) -> Iterator[Any]:
+    r"""
+    Creates the span of an HTTP request and adds the trace context to its headers.
+
+    Args:
+        method: HTTP method.
+        url: URL of the request.
+        headers: Headers of the request, where the `traceparent` header is added.
+        attempt: Number of the attempt, from 1, when the request is sent again after being throttled.
+
+    Returns:
+        The span, or `None` if OpenTelemetry is not installed.
+    """
+
+    if trace is None:
+        yield None
+        return
+
+    attributes = {
+        'http.request.method': method,
+        'url.full': url,
+    }
+    if attempt > 1:
+        attributes['http.request.resend_count'] = attempt - 1
+
+    with _get_tracer().start_as_current_span(method, kind=trace.SpanKind.CLIENT, attributes=attributes) as span:
+        propagate.inject(headers)
+        yield span
+
+def set_http_response(span: Any, status: int | None, attempts: int=1):
+    r"""
+    Records the response of an HTTP request in its span.
+
+    Args:
+        span: The span created by :func:`start_http_span`.
+        status: HTTP status code of the response.
+        attempts: (Optional) Number of attempts made by the retry client for this request.
+    """
+
+    if span is None:
+        return
+
+    if status is not None:
+        span.set_attribute('http.response.status_code', status)
+        if status >= 400:
+            span.set_status(trace.StatusCode.ERROR)
+    if attempts > 1:
+        span.set_attribute('dolbyio.server_error_retries', attempts - 1)
+
+def record_rate_limiter_wait(start_time_ns: int, end_time_ns: int, priority: str):
+    r"""
+    Records the time spent waiting for the rate limiter as a span, in the current span.
+
+    Args:
+        start_time_ns: When the wait started, from :func:`time.time_ns`.
+        end_time_ns: When the wait ended, from :func:`time.time_ns`.
+        priority: Lane of the rate limiter.
+    """
+
+    if trace is None:
+        return
+
+    span = _get_tracer().start_span(
+        'rate_limiter.wait',
+        start_time=start_time_ns,
+        attributes={ 'dolbyio.priority': priority },
+    )
+    span.end(end_time=end_time_ns)
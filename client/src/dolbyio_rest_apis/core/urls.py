@@ -5,6 +5,8 @@ dolbyio_rest_apis.core.urls
 This module contains the URLs to use to call the REST APIs.
 """
 
+import re
+
 API_URL = 'api.dolby.io'
 SAPI_URL = 'api.millicast.com'
 MAPI_URL = 'api.dolby.com'
@@ -17,3 +19,31 @@ def get_rts_url() -> str:
 
 def get_mapi_url() -> str:
     return f'https://{MAPI_URL}'
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+def get_endpoint_template(path: str) -> str:
+    r"""
+    Gets the template of an endpoint, where the numeric identifiers are replaced by `{id}`.
+
+    Args:
+        path: Path of the URL, like `/api/publish_token/123`.
+
+    Returns:
+        The template of the endpoint, like `/api/publish_token/{id}`.
+    """
+
+    return _ID_SEGMENT.sub('/{id}', path)
+
+def get_resource_family(path: str) -> str:
+    r"""
+    Gets the family of resources of an endpoint, used to invalidate the cached responses after a change.
+
+    Args:
+        path: Path of the URL, like `/api/publish_token/123`.
+
+    Returns:
+        The first two segments of the path, like `/api/publish_token`.
+    """
+
+    return '/'.join(path.split('/', 3)[:3])
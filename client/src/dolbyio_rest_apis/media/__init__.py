@@ -0,0 +1,32 @@
+"""
+dolbyio_rest_apis.media
+~~~~~~~~~~~~~~~
+
+This package contains the functions to work with the Media APIs,
+each module is imported on first access, like `dolbyio_rest_apis.media.enhance`.
+"""
+
+import importlib
+
+_MODULES = (
+    'analyze',
+    'analyze_music',
+    'analyze_speech',
+    'authentication',
+    'client',
+    'diagnose',
+    'enhance',
+    'io',
+    'jobs',
+    'mastering',
+    'transcode',
+    'webhooks',
+)
+
+def __getattr__(name: str): # pylint: disable=invalid-name
+    if name in _MODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__(): # pylint: disable=invalid-name
+    return sorted(list(globals()) + list(_MODULES))
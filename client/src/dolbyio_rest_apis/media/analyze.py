@@ -5,13 +5,16 @@ dolbyio_rest_apis.media.analyze
 This module contains the functions to work with the Analyze APIs.
 """
 
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_mapi_url
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 from dolbyio_rest_apis.media.models.analyze_response import AnalyzeJobResponse
 
+@traced(result_attribute='job_id')
 async def start(
         access_token: str,
         job_content: str,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Starts analyzing to learn about your media.
@@ -34,6 +37,7 @@ async def start(
         access_token: Access token to use for authentication.
         job_content: Content of the job description as a JSON payload.
             You can find the definition at this URL: https://docs.dolby.io/media-apis/reference/media-analyze-post
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         The job identifier.
@@ -42,7 +46,7 @@ async def start(
         HttpRequestError: If a client error one occurred.
         HTTPError: If one occurred.
     """
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/analyze',
@@ -52,9 +56,11 @@ async def start(
     if 'job_id' in json_response:
         return json_response['job_id']
 
+@traced
 async def get_results(
         access_token: str,
         job_id: str,
+        http_context: MediaHttpContext=None,
     ) -> AnalyzeJobResponse:
     r"""
     Gets Analyze Status.
@@ -66,6 +72,7 @@ async def get_results(
     Args:
         access_token: Access token to use for authentication.
         job_id: The job identifier.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         A :class:`AnalyzeJobResponse` object.
@@ -78,11 +85,11 @@ async def get_results(
         'job_id': job_id
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_get(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/analyze',
             params=params
         )
 
-    return AnalyzeJobResponse(job_id, json_response)
+    return http_context.build_response(json_response, AnalyzeJobResponse, job_id)
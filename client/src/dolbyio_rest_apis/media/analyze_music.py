@@ -5,13 +5,16 @@ dolbyio_rest_apis.media.analyze_music
 This module contains the functions to work with the Music Analytics APIs.
 """
 
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_mapi_url
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 from dolbyio_rest_apis.media.models.analyze_music_response import AnalyzeMusicJob
 
+@traced(result_attribute='job_id')
 async def start(
         access_token: str,
         job_content: str,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Starts analyzing to learn about music in your media.
@@ -26,6 +29,7 @@ async def start(
         access_token: Access token to use for authentication.
         job_content: Content of the job description as a JSON payload.
             You can find the definition at this URL: https://docs.dolby.io/media-apis/reference/media-analyze-music-post
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         The job identifier.
@@ -34,7 +38,7 @@ async def start(
         HttpRequestError: If a client error one occurred.
         HTTPError: If one occurred.
     """
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/analyze/music',
@@ -44,9 +48,11 @@ async def start(
     if 'job_id' in json_response:
         return json_response['job_id']
 
+@traced
 async def get_results(
         access_token: str,
         job_id: str,
+        http_context: MediaHttpContext=None,
     ) -> AnalyzeMusicJob:
     r"""
     Gets Music Analytics Status.
@@ -58,6 +64,7 @@ async def get_results(
     Args:
         access_token: Access token to use for authentication.
         job_id: The job identifier.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         A :class:`AnalyzeMusicJob` object.
@@ -70,11 +77,11 @@ async def get_results(
         'job_id': job_id
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_get(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/analyze/music',
             params=params
         )
 
-    return AnalyzeMusicJob(job_id, json_response)
+    return http_context.build_response(json_response, AnalyzeMusicJob, job_id)
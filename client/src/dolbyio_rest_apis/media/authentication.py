@@ -6,14 +6,17 @@ This module contains the functions to work with the authentication API.
 """
 
 from dolbyio_rest_apis.core.helpers import add_if_not_none
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_api_url
 from dolbyio_rest_apis.media.models.access_token import AccessToken
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 
+@traced
 async def get_api_token(
         app_key: str,
         app_secret: str,
         expires_in: int=None,
+        http_context: MediaHttpContext=None,
     ) -> AccessToken:
     r"""
     To make any API call, you must acquire a JWT (JSON Web Token) format API token.
@@ -26,6 +29,7 @@ async def get_api_token(
         expires_in: (Optional) API token expiration time in seconds.
             If no value is specified, the default is 1800, indicating 30 minutes.
             The maximum value is 86,400, indicating 24 hours.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         An :class:`AccessToken` object.
@@ -40,7 +44,7 @@ async def get_api_token(
     }
     add_if_not_none(data, 'expires_in', expires_in)
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post_basic_auth(
             app_key=app_key,
             app_secret=app_secret,
@@ -48,4 +52,4 @@ async def get_api_token(
             data=data
         )
 
-    return AccessToken(json_response)
+    return http_context.build_response(json_response, AccessToken)
@@ -0,0 +1,120 @@
+"""
+dolbyio_rest_apis.media.client
+~~~~~~~~~~~~~~~
+
+This module contains the client to work with the Media APIs.
+"""
+
+import functools
+from dolbyio_rest_apis.core.client import Client
+from dolbyio_rest_apis.core.connection_pool import ConnectionPoolConfig
+from dolbyio_rest_apis.core.metrics import MetricsRegistry
+from dolbyio_rest_apis.core.rate_limiter import Priority, RateLimiterRegistry
+from dolbyio_rest_apis.core.request_timing import RequestTimingCallback
+from dolbyio_rest_apis.core.response_mode import ResponseMode
+from dolbyio_rest_apis.core.serializer import JsonSerializer
+from dolbyio_rest_apis.core.sync_client import EventLoopThread, SyncClient
+from dolbyio_rest_apis.media import analyze, analyze_music, analyze_speech, authentication, diagnose, enhance, io, jobs, mastering, transcode, webhooks
+from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
+
+class MediaClient(Client):
+    r"""
+    Client for the Media APIs that keeps the same HTTP context, and its connections, for its lifetime.
+
+    Every function of the Media modules is available on the client, for example:
+
+    .. code-block:: python
+
+        async with MediaClient() as client:
+            job_id = await client.enhance.start(access_token, job_content)
+            result = await client.enhance.get_results(access_token, job_id)
+    """
+
+    def __init__(
+            self,
+            pool_config: ConnectionPoolConfig=None,
+            rate_limiters: RateLimiterRegistry=None,
+            priority: Priority=Priority.NORMAL,
+            coalesce_requests: bool=False,
+            serializer: JsonSerializer=None,
+            on_request_timing: RequestTimingCallback=None,
+            metrics: MetricsRegistry=None,
+            response_mode: ResponseMode=ResponseMode.MODEL,
+        ):
+        r"""
+        Args:
+            pool_config: (Optional) Settings of the connection pool.
+                If not set, :attr:`MediaHttpContext.DEFAULT_POOL_CONFIG` is used.
+            rate_limiters: (Optional) Registry of the rate limiters to use for the requests.
+                If not set, the registry shared by the whole process is used.
+            priority: (Optional) Lane of the rate limiters used by the requests of this client.
+            coalesce_requests: (Optional) Send a single request when identical GET requests are made at the same time,
+                like several coroutines polling the same job.
+            serializer: (Optional) Serializer of the JSON bodies of the requests and responses.
+                If not set, the fastest serializer installed is used.
+            on_request_timing: (Optional) Function called with the :class:`RequestTiming` of each request,
+                to see where the latency goes.
+            metrics: (Optional) Registry where to record the metrics of the requests,
+                see :class:`MetricsRegistry` to export them in the OpenMetrics format.
+            response_mode: (Optional) What the API functions return: the models, the decoded JSON or the body of the responses.
+                It can be changed for some calls with :func:`response_mode`.
+        """
+
+        super().__init__(MediaHttpContext(
+            pool_config=pool_config,
+            rate_limiters=rate_limiters,
+            priority=priority,
+            coalesce_requests=coalesce_requests,
+            serializer=serializer,
+            on_request_timing=on_request_timing,
+            metrics=metrics,
+            response_mode=response_mode,
+        ))
+
+        self.analyze = self._bind(analyze)
+        self.analyze_music = self._bind(analyze_music)
+        self.analyze_speech = self._bind(analyze_speech)
+        self.authentication = self._bind(authentication)
+        self.diagnose = self._bind(diagnose)
+        self.enhance = self._bind(enhance)
+        self.io = self._bind(io)
+        self.jobs = self._bind(jobs)
+        self.mastering = self._bind(mastering)
+        self.transcode = self._bind(transcode)
+        self.webhooks = self._bind(webhooks)
+
+class SyncMediaClient(SyncClient):
+    r"""
+    Synchronous version of :class:`MediaClient`, for the applications not using asyncio.
+
+    The calls are run on a background event loop that keeps the same HTTP session, and its connections,
+    for the lifetime of the client. The client can be shared by several threads.
+
+    .. code-block:: python
+
+        with SyncMediaClient() as client:
+            job_id = client.enhance.start(access_token, job_content)
+    """
+
+    def __init__(self, loop_thread: EventLoopThread=None, **kwargs):
+        r"""
+        Args:
+            loop_thread: (Optional) Event loop to run the calls on, it can be shared by several clients.
+                If not set, the event loop thread shared by the synchronous clients is used.
+            kwargs: Arguments of :class:`MediaClient`.
+        """
+
+        super().__init__(functools.partial(MediaClient, **kwargs), loop_thread)
+
+        client: MediaClient = self.client
+        self.analyze = self._bind(client.analyze)
+        self.analyze_music = self._bind(client.analyze_music)
+        self.analyze_speech = self._bind(client.analyze_speech)
+        self.authentication = self._bind(client.authentication)
+        self.diagnose = self._bind(client.diagnose)
+        self.enhance = self._bind(client.enhance)
+        self.io = self._bind(client.io)
+        self.jobs = self._bind(client.jobs)
+        self.mastering = self._bind(client.mastering)
+        self.transcode = self._bind(client.transcode)
+        self.webhooks = self._bind(client.webhooks)
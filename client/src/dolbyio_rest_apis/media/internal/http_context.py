@@ -5,19 +5,48 @@ dolbyio_rest_apis.media.internal.helpers
 This module contains internal helpers.
 """
 
-from aiohttp import BasicAuth, ClientResponse, ContentTypeError
+from dolbyio_rest_apis.core.connection_pool import ConnectionPoolConfig
+from dolbyio_rest_apis.core.file_transfer import DOWNLOAD_PARTS, UPLOAD_CHUNK_SIZE, TransferProgressCallback
 from dolbyio_rest_apis.core.helpers import get_value_or_default
 from dolbyio_rest_apis.core.http_context import HttpContext
 from dolbyio_rest_apis.core.http_request_error import HttpRequestError
-import json
+from dolbyio_rest_apis.core.metrics import MetricsRegistry
+from dolbyio_rest_apis.core.rate_limiter import Priority, RateLimiterRegistry
+from dolbyio_rest_apis.core.request_timing import RequestTimingCallback
+from dolbyio_rest_apis.core.response_mode import ResponseMode
+from dolbyio_rest_apis.core.serializer import JsonSerializer
 import logging
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, Mapping, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
 
 class MediaHttpContext(HttpContext):
     """HTTP Context class for Media APIs"""
 
-    def __init__(self):
-        super().__init__()
+    # Media API calls are mostly job polling and long file transfers,
+    # spread across api.dolby.com, api.dolby.io and the storage hosts
+    DEFAULT_POOL_CONFIG = ConnectionPoolConfig(
+        limit=100,
+        limit_per_host=50,
+        keepalive_timeout=30.0,
+        ttl_dns_cache=300,
+    )
+
+    API_FAMILY = 'media'
+
+    def __init__(
+            self,
+            pool_config: ConnectionPoolConfig=None,
+            rate_limiters: RateLimiterRegistry=None,
+            priority: Priority=Priority.NORMAL,
+            coalesce_requests: bool=False,
+            serializer: JsonSerializer=None,
+            on_request_timing: RequestTimingCallback=None,
+            metrics: MetricsRegistry=None,
+            response_mode: ResponseMode=ResponseMode.MODEL,
+        ):
+        super().__init__(pool_config, rate_limiters, priority, coalesce_requests, serializer, on_request_timing, metrics, response_mode)
 
         self._logger = logging.getLogger(MediaHttpContext.__name__)
 
@@ -56,7 +85,7 @@ class MediaHttpContext(HttpContext):
         if payload is None:
             payload = '{}' # The REST APIs don't support an empty payload
         elif not isinstance(payload, str):
-            payload = json.dumps(payload, indent=4)
+            payload = self._serializer.dumps(payload)
 
         return await self._send_request(
             method=method,
@@ -115,12 +144,14 @@ class MediaHttpContext(HttpContext):
             data: Content of the request.
 
         Returns:
-            The JSON response if any or None.
+            The JSON response if any or None, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
             HTTPError: If one occurred.
         """
+        from aiohttp import BasicAuth
+
         headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/x-www-form-urlencoded',
@@ -132,6 +163,7 @@ class MediaHttpContext(HttpContext):
             headers=headers,
             auth=BasicAuth(app_key, app_secret),
             data=data,
+            raw_body=self.response_mode is ResponseMode.BYTES,
         )
 
     async def requests_put(
@@ -181,7 +213,7 @@ class MediaHttpContext(HttpContext):
             params: (Optional) URL query parameters.
 
         Returns:
-            The JSON response if any or None.
+            The JSON response if any or None, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -198,6 +230,7 @@ class MediaHttpContext(HttpContext):
             url=url,
             params=params,
             headers=headers,
+            raw_body=self.response_mode is ResponseMode.BYTES,
         )
 
     async def requests_delete(
@@ -237,6 +270,8 @@ class MediaHttpContext(HttpContext):
             url: str,
             file_path: str,
             params: Mapping[str, str]=None,
+            on_progress: TransferProgressCallback=None,
+            parallel_parts: int=DOWNLOAD_PARTS,
         ) -> None:
         r"""
         Downloads a file.
@@ -246,6 +281,8 @@ class MediaHttpContext(HttpContext):
             url: Where to send the request to.
             file_path: Where to save the file.
             params: (Optional) URL query parameters.
+            on_progress: (Optional) Function called with the :class:`TransferProgress` after each chunk is written.
+            parallel_parts: (Optional) Number of byte ranges downloaded at the same time.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -261,13 +298,17 @@ class MediaHttpContext(HttpContext):
             url=url,
             params=params,
             headers=headers,
-            file_path=file_path
+            file_path=file_path,
+            on_progress=on_progress,
+            parallel_parts=parallel_parts,
         )
 
     async def upload(
             self,
             upload_url: str,
-            file_path: str
+            file_path: str,
+            on_progress: TransferProgressCallback=None,
+            chunk_size: int=UPLOAD_CHUNK_SIZE,
         ) -> None:
         r"""
         Uploads a file.
@@ -275,6 +316,8 @@ class MediaHttpContext(HttpContext):
         Args:
             upload_url: URL where to upload the file to.
             file_path: Path of the file to upload.
+            on_progress: (Optional) Function called with the :class:`TransferProgress` after each chunk is sent.
+            chunk_size: (Optional) Size of the chunks read from the file.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -283,12 +326,16 @@ class MediaHttpContext(HttpContext):
 
         await self._upload_file(
             url=upload_url,
-            file_path=file_path
+            file_path=file_path,
+            on_progress=on_progress,
+            chunk_size=chunk_size,
         )
 
-    async def _raise_for_status(self, http_response: ClientResponse):
+    async def _raise_for_status(self, http_response: 'ClientResponse'):
         r"""Raises :class:`HttpRequestError` or :class:`ClientResponseError`, if one occurred."""
 
+        from aiohttp import ContentTypeError
+
         if 400 <= http_response.status < 500:
             if 400 < http_response.status < 404:
                 self._logger.error('Unauthorized to get data from the url %s - Response code %i', http_response.url, http_response.status)
@@ -298,7 +345,7 @@ class MediaHttpContext(HttpContext):
                 self._logger.error('Did not find data at the url %s - Response code %i', http_response.url, http_response.status)
 
             try:
-                json_response = await http_response.json()
+                json_response = await self._read_json(http_response)
 
                 error_type = get_value_or_default(json_response, 'type', None)
                 error_code = get_value_or_default(json_response, 'status', 0)
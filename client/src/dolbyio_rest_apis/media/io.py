@@ -5,12 +5,16 @@ dolbyio_rest_apis.media.io
 This module contains the functions to work with the IO APIs.
 """
 
+from dolbyio_rest_apis.core.file_transfer import DOWNLOAD_PARTS, UPLOAD_CHUNK_SIZE, TransferProgressCallback
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_mapi_url
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 
+@traced
 async def get_upload_url(
         access_token: str,
         dlb_url: str,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Start Media Input
@@ -30,6 +34,7 @@ async def get_upload_url(
         access_token: Access token to use for authentication.
         dlb_url: The `url` should be in the form `dlb://object-key` where the object-key can be any alpha-numeric string.
             The object-key is unique to your account API Key so there is no risk of collision with other users.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Raises:
         HttpRequestError: If a client error one occurred.
@@ -39,7 +44,7 @@ async def get_upload_url(
         'url': dlb_url
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/input',
@@ -49,30 +54,48 @@ async def get_upload_url(
     if 'url' in json_response:
         return json_response['url']
 
+@traced
 async def upload_file(
         upload_url: str,
         file_path: str,
+        http_context: MediaHttpContext=None,
+        on_progress: TransferProgressCallback=None,
+        chunk_size: int=UPLOAD_CHUNK_SIZE,
     ) -> None:
     r"""
     Upload a file.
 
+    The file is read in a thread pool while the previous chunks are sent,
+    and the upload starts over after a connection error, a timeout or a server error.
+
     Args:
         upload_url: URL where to upload the file to.
         file_path: Local file path to upload.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
+        on_progress: (Optional) Function called with the :class:`TransferProgress` after each chunk is sent,
+            with the number of bytes sent and the throughput.
+        chunk_size: (Optional) Size of the chunks read from the file.
 
     Raises:
+        HttpRequestError: If a client error one occurred.
         HTTPError: If one occurred.
     """
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         await http_context.upload(
             upload_url=upload_url,
             file_path=file_path,
+            on_progress=on_progress,
+            chunk_size=chunk_size,
         )
 
+@traced
 async def download_file(
         access_token: str,
         dlb_url: str,
         file_path: str,
+        http_context: MediaHttpContext=None,
+        on_progress: TransferProgressCallback=None,
+        parallel_parts: int=DOWNLOAD_PARTS,
     ) -> None:
     r"""
     Start Media Download
@@ -81,6 +104,11 @@ async def download_file(
 
     The temporary storage should allow you to read and write to the dlb:// locations for a period of at least 24 hours before it is removed.
 
+    When the storage supports the `Range` header, the large files are downloaded in several byte ranges at the same time,
+    each written at its position in the file. The ranges already written are recorded in a `.dlbdownload` file
+    next to the file: a range resumes where it stopped after a connection error, a timeout or a server error,
+    and calling this function again after a failure resumes the download, if the file did not change in the storage.
+
     See: https://docs.dolby.io/media-apis/reference/media-output-get
 
     Args:
@@ -88,6 +116,11 @@ async def download_file(
         dlb_url: The `url` should be in the form `dlb://object-key` where the object-key can be any alpha-numeric string.
             The object-key is unique to your account API Key so there is no risk of collision with other users.
         file_path: Local file path where to download the file to.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
+        on_progress: (Optional) Function called with the :class:`TransferProgress` after each chunk is written,
+            with the number of bytes received and the throughput.
+        parallel_parts: (Optional) Number of byte ranges downloaded at the same time,
+            set to 1 to download the file with a single request.
 
     Raises:
         HTTPError: If one occurred.
@@ -96,10 +129,12 @@ async def download_file(
         'url': dlb_url,
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         await http_context.download(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/output',
             file_path=file_path,
             params=params,
+            on_progress=on_progress,
+            parallel_parts=parallel_parts,
         )
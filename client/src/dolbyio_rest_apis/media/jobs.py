@@ -6,7 +6,9 @@ This module contains the functions to work with the Jobs APIs.
 """
 
 from typing import List
-from dolbyio_rest_apis.core.helpers import add_if_not_none
+from dolbyio_rest_apis.core.helpers import add_if_not_none, in_and_not_none
+from dolbyio_rest_apis.core.response_mode import ResponseMode, response_mode
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_mapi_url
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 from dolbyio_rest_apis.media.models.jobs_response import JobsResponse, Job
@@ -18,27 +20,27 @@ async def _list_jobs(
         submitted_before: str=None,
         status: str=None,
         next_token: str=None,
-    ) -> JobsResponse:
+    ) -> dict:
     params = { }
     add_if_not_none(params, 'submitted_after', submitted_after)
     add_if_not_none(params, 'submitted_before', submitted_before)
     add_if_not_none(params, 'status', status)
     add_if_not_none(params, 'next_token', next_token)
 
-    json_response = await http_context.requests_get(
+    return await http_context.requests_get(
         access_token=access_token,
         url=f'{get_mapi_url()}/media/jobs',
         params=params
     )
 
-    return JobsResponse(json_response)
-
+@traced
 async def list_jobs(
         access_token: str,
         submitted_after: str=None,
         submitted_before: str=None,
         status: str=None,
         next_token: str=None,
+        http_context: MediaHttpContext=None,
     ) -> JobsResponse:
     r"""
     Query Media Jobs.
@@ -54,6 +56,7 @@ async def list_jobs(
             The `submitted_before` must be the same or later than `submitted_after`.
         status: (Optional) Query jobs that have the specified status.
         next_token: (Optional) Used when querying the next page of jobs. Specify the `next_token` that was returned in the previous call.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         A :class:`JobsResponse` object.
@@ -62,7 +65,7 @@ async def list_jobs(
         HttpRequestError: If a client error one occurred.
         HTTPError: If one occurred.
     """
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await _list_jobs(
             http_context=http_context,
             access_token=access_token,
@@ -72,13 +75,15 @@ async def list_jobs(
             next_token=next_token,
         )
 
-    return JobsResponse(json_response)
+    return http_context.build_response(json_response, JobsResponse)
 
+@traced
 async def list_all_jobs(
         access_token: str,
         submitted_after: str=None,
         submitted_before: str=None,
         status: str=None,
+        http_context: MediaHttpContext=None,
     ) -> JobsResponse:
     r"""
     Query Media Jobs.
@@ -93,9 +98,10 @@ async def list_all_jobs(
         submitted_before: (Optional) Query jobs that were submitted at or before the specified date and time (inclusive).
             The `submitted_before` must be the same or later than `submitted_after`.
         status: (Optional) Query jobs that have the specified status.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
-        A list of :class:`Job` objects.
+        A list of :class:`Job` objects, or of dictionaries if the response mode is not :attr:`ResponseMode.MODEL`.
 
     Raises:
         HttpRequestError: If a client error one occurred.
@@ -103,30 +109,39 @@ async def list_all_jobs(
     """
     jobs: List[Job] = []
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
+        build_models = http_context.response_mode is ResponseMode.MODEL
         next_token = None
-        while True:
-            page: JobsResponse = _list_jobs(
-                http_context=http_context,
-                access_token=access_token,
-                submitted_after=submitted_after,
-                submitted_before=submitted_before,
-                status=status,
-                next_token=next_token,
-            )
-
-            next_token = page.next_token
-            for job in page.jobs:
-                jobs.append(job)
-
-            if page.next_token is None or page.next_token == '':
-                break
+
+        # The pages are decoded in all the response modes, to read the token of the next page
+        with response_mode(ResponseMode.JSON):
+            while True:
+                page = await _list_jobs(
+                    http_context=http_context,
+                    access_token=access_token,
+                    submitted_after=submitted_after,
+                    submitted_before=submitted_before,
+                    status=status,
+                    next_token=next_token,
+                )
+
+                next_token = page.get('next_token')
+                if in_and_not_none(page, 'jobs'):
+                    if build_models:
+                        jobs.extend(Job(job) for job in page['jobs'])
+                    else:
+                        jobs.extend(page['jobs'])
+
+                if next_token is None or next_token == '':
+                    break
 
     return jobs
 
+@traced
 async def cancel(
         access_token: str,
         job_id: str,
+        http_context: MediaHttpContext=None,
     ) -> None:
     r"""
     Requests cancellation of a previously submitted job.
@@ -136,6 +151,7 @@ async def cancel(
     Args:
         access_token: Access token to use for authentication.
         job_id: Identifier of the job to cancel.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Raises:
         HttpRequestError: If a client error one occurred.
@@ -145,7 +161,7 @@ async def cancel(
         'job_id': job_id,
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/jobs/cancel',
@@ -5,13 +5,16 @@ dolbyio_rest_apis.media.transcode
 This module contains the functions to work with the Transcode APIs.
 """
 
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_mapi_url
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 from dolbyio_rest_apis.media.models.mastering_response import MasteringPreviewJob, MasteringJob
 
+@traced(result_attribute='job_id')
 async def start_preview(
         access_token: str,
         job_content: str,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Starts mastering preview to improve your music.
@@ -33,6 +36,7 @@ async def start_preview(
         access_token: Access token to use for authentication.
         job_content: Content of the job description as a JSON payload.
             You can find the definition at this URL: https://docs.dolby.io/media-apis/reference/media-music-mastering-preview-post
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         The job identifier.
@@ -42,7 +46,7 @@ async def start_preview(
         HTTPError: If one occurred.
     """
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/master/preview',
@@ -52,9 +56,11 @@ async def start_preview(
     if 'job_id' in json_response:
         return json_response['job_id']
 
+@traced
 async def get_preview_results(
         access_token: str,
         job_id: str,
+        http_context: MediaHttpContext=None,
     ) -> MasteringPreviewJob:
     r"""
     Gets Mastering Preview Results
@@ -67,6 +73,7 @@ async def get_preview_results(
     Args:
         access_token: Access token to use for authentication.
         job_id: The job identifier.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         An :class:`MasteringPreviewJob` object.
@@ -79,18 +86,20 @@ async def get_preview_results(
         'job_id': job_id
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_get(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/master/preview',
             params=params
         )
 
-    return MasteringPreviewJob(job_id, json_response)
+    return http_context.build_response(json_response, MasteringPreviewJob, job_id)
 
+@traced(result_attribute='job_id')
 async def start(
         access_token: str,
         job_content: str,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Starts mastering to improve your music.
@@ -110,6 +119,7 @@ async def start(
         access_token: Access token to use for authentication.
         job_content: Content of the job description as a JSON payload.
             You can find the definition at this URL: https://docs.dolby.io/media-apis/reference/media-music-mastering-post
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         The job identifier.
@@ -119,7 +129,7 @@ async def start(
         HTTPError: If one occurred.
     """
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/master',
@@ -129,9 +139,11 @@ async def start(
     if 'job_id' in json_response:
         return json_response['job_id']
 
+@traced
 async def get_results(
         access_token: str,
         job_id: str,
+        http_context: MediaHttpContext=None,
     ) -> MasteringJob:
     r"""
     Gets Mastering Results
@@ -144,6 +156,7 @@ async def get_results(
     Args:
         access_token: Access token to use for authentication.
         job_id: The job identifier.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         An :class:`MasteringJob` object.
@@ -156,11 +169,11 @@ async def get_results(
         'job_id': job_id
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_get(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/master',
             params=params
         )
 
-    return MasteringJob(job_id, json_response)
+    return http_context.build_response(json_response, MasteringJob, job_id)
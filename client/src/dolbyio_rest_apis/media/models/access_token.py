@@ -5,15 +5,14 @@ dolbyio_rest_apis.models
 This module contains the models used by the Dolby.io MEDIA APIs.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel
 
-class AccessToken(dict):
+class AccessToken(DictModel):
     """The :class:`AccessToken` object, which represents the access token."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.token_type = get_value_or_default(self, 'token_type', None)
-        self.access_token = get_value_or_default(self, 'access_token', None)
-        self.refresh_token = get_value_or_default(self, 'refresh_token', None)
-        self.expires_in_val = get_value_or_default(self, 'expires_in', 0)
+    token_type = DictField(default=None)
+    access_token = DictField(default=None)
+    refresh_token = DictField(default=None)
+    expires_in_val = DictField('expires_in', 0)
@@ -5,131 +5,100 @@ dolbyio_rest_apis.media.models.analyze_music_response
 This module contains the Analyze Music model.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default, in_and_not_none
+from .dict_model import DictField, DictModel, ListField, ModelField, ModelListField
 from .job_response import JobResponse
 
-class AnalyzeMusicJobResultMediaInfoContainer(dict):
+class AnalyzeMusicJobResultMediaInfoContainer(DictModel):
     """The :class:`AnalyzeMusicJobResultMediaInfoContainer` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.kind = get_value_or_default(dictionary, 'kind', None)
-        self.duration = get_value_or_default(dictionary, 'duration', None)
-        self.bitrate = get_value_or_default(dictionary, 'bitrate', None)
-        self.size = get_value_or_default(dictionary, 'size', None)
+    kind = DictField(default=None)
+    duration = DictField(default=None)
+    bitrate = DictField(default=None)
+    size = DictField(default=None)
 
-class AnalyzeMusicJobResultMediaInfoAudio(dict):
+class AnalyzeMusicJobResultMediaInfoAudio(DictModel):
     """The :class:`AnalyzeMusicJobResultMediaInfoAudio` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.codec = get_value_or_default(dictionary, 'codec', None)
-        self.bit_depth = get_value_or_default(dictionary, 'bit_depth', None)
-        self.channels = get_value_or_default(dictionary, 'channels', None)
-        self.sample_rate = get_value_or_default(dictionary, 'sample_rate', None)
-        self.duration = get_value_or_default(dictionary, 'duration', None)
-        self.bitrate = get_value_or_default(dictionary, 'bitrate', None)
+    codec = DictField(default=None)
+    bit_depth = DictField(default=None)
+    channels = DictField(default=None)
+    sample_rate = DictField(default=None)
+    duration = DictField(default=None)
+    bitrate = DictField(default=None)
 
-class AnalyzeMusicJobResultMediaInfoVideo(dict):
+class AnalyzeMusicJobResultMediaInfoVideo(DictModel):
     """The :class:`AnalyzeMusicJobResultMediaInfoVideo` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.codec = get_value_or_default(dictionary, 'codec', None)
-        self.frame_rate = get_value_or_default(dictionary, 'frame_rate', None)
-        self.height = get_value_or_default(dictionary, 'height', None)
-        self.width = get_value_or_default(dictionary, 'width', None)
-        self.duration = get_value_or_default(dictionary, 'duration', None)
-        self.bitrate = get_value_or_default(dictionary, 'bitrate', None)
+    codec = DictField(default=None)
+    frame_rate = DictField(default=None)
+    height = DictField(default=None)
+    width = DictField(default=None)
+    duration = DictField(default=None)
+    bitrate = DictField(default=None)
 
-class AnalyzeMusicJobResultMediaInfo(dict):
+class AnalyzeMusicJobResultMediaInfo(DictModel):
     """The :class:`AnalyzeMusicJobResultMediaInfo` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        if 'container' in dictionary:
-            self.container = AnalyzeMusicJobResultMediaInfoContainer(dictionary['container'])
-        if 'audio' in dictionary:
-            self.audio = AnalyzeMusicJobResultMediaInfoAudio(dictionary['audio'])
-        if 'container' in dictionary:
-            self.container = AnalyzeMusicJobResultMediaInfoVideo(dictionary['container'])
+    container = ModelField(AnalyzeMusicJobResultMediaInfoContainer)
+    audio = ModelField(AnalyzeMusicJobResultMediaInfoAudio)
+    video = ModelField(AnalyzeMusicJobResultMediaInfoVideo)
 
-class AnalyzeMusicJobResultProcessedRegionAudioMusicSection(dict):
+class AnalyzeMusicJobResultProcessedRegionAudioMusicSection(DictModel):
     """The :class:`AnalyzeMusicJobResultProcessedRegionAudioMusicSection` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
-
-        self.loudness = get_value_or_default(dictionary, 'loudness', None)
-        self.bpm = get_value_or_default(dictionary, 'bpm', None)
-        self.key = []
-        if in_and_not_none(self, 'key'):
-            for k in self['key']:
-                self.key.append(k)
-        self.genre = []
-        if in_and_not_none(self, 'genre'):
-            for g in self['genre']:
-                self.genre.append(g)
-        self.era = []
-        if in_and_not_none(self, 'era'):
-            for e in self['era']:
-                self.era.append(e)
-        self.instrument = []
-        if in_and_not_none(self, 'instrument'):
-            for i in self['instrument']:
-                self.era.append(i)
-
-class AnalyzeMusicJobResultProcessedRegionAudioMusic(dict):
+    __slots__ = ()
+
+    loudness = DictField(default=None)
+    bpm = DictField(default=None)
+    key = ListField()
+    genre = ListField()
+    era = ListField()
+    instrument = ListField()
+
+class AnalyzeMusicJobResultProcessedRegionAudioMusic(DictModel):
     """The :class:`AnalyzeMusicJobResultProcessedRegionAudioMusic` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.percentage = get_value_or_default(dictionary, 'percentage', None)
-        self.num_sections = get_value_or_default(dictionary, 'num_sections', None)
-        self.sections = []
-        if in_and_not_none(self, 'sections'):
-            for s in self['sections']:
-                self.sections.append(AnalyzeMusicJobResultProcessedRegionAudioMusicSection(s))
+    percentage = DictField(default=None)
+    num_sections = DictField(default=None)
+    sections = ModelListField(AnalyzeMusicJobResultProcessedRegionAudioMusicSection)
 
-class AnalyzeMusicJobResultProcessedRegionAudio(dict):
+class AnalyzeMusicJobResultProcessedRegionAudio(DictModel):
     """The :class:`AnalyzeMusicJobResultProcessedRegionAudio` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        if 'music' in dictionary:
-            self.music = AnalyzeMusicJobResultProcessedRegionAudioMusic(dictionary['music'])
+    music = ModelField(AnalyzeMusicJobResultProcessedRegionAudioMusic)
 
-class AnalyzeMusicJobResultProcessedRegion(dict):
+class AnalyzeMusicJobResultProcessedRegion(DictModel):
     """The :class:`AnalyzeMusicJobResultProcessedRegion` object."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.start = get_value_or_default(dictionary, 'start', None)
-        self.end = get_value_or_default(dictionary, 'end', None)
+    start = DictField(default=None)
+    end = DictField(default=None)
+    audio = ModelField(AnalyzeMusicJobResultProcessedRegionAudio)
 
-class AnalyzeMusicJobResult(dict):
+class AnalyzeMusicJobResult(DictModel):
     """The :class:`AnalyzeMusicJobResult` object, which represents the result for an analyze music job."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        if 'media_info' in dictionary:
-            self.media_info = AnalyzeMusicJobResultMediaInfo(dictionary['media_info'])
-        if 'processed_region' in dictionary:
-            self.media_info = AnalyzeMusicJobResultProcessedRegion(dictionary['processed_region'])
+    media_info = ModelField(AnalyzeMusicJobResultMediaInfo)
+    processed_region = ModelField(AnalyzeMusicJobResultProcessedRegion)
 
 class AnalyzeMusicJob(JobResponse):
     """The :class:`AnalyzeMusicJob` object, which represents the result for an analyze music job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = AnalyzeMusicJobResult(dictionary['result'])
+    result = ModelField(AnalyzeMusicJobResult, default=None)
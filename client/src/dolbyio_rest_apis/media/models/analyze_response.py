@@ -5,19 +5,17 @@ dolbyio_rest_apis.media.models.analyze_response
 This module contains the Analyze models.
 """
 
+from .dict_model import DictModel, ModelField
 from .job_response import JobResponse
 
-class AnalyzeJobResult(dict):
+class AnalyzeJobResult(DictModel):
     """The :class:`AnalyzeJobResult` object, which represents the result for an analyze job."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
 class AnalyzeJobResponse(JobResponse):
     """The :class:`AnalyzeJobResponse` object, which represents the result for an analyze job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = AnalyzeJobResult(dictionary['result'])
+    result = ModelField(AnalyzeJobResult, default=None)
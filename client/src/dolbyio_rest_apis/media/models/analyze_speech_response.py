@@ -5,19 +5,17 @@ dolbyio_rest_apis.media.models.analyze_speech_response
 This module contains the Analyze Speech model.
 """
 
+from .dict_model import DictModel, ModelField
 from .job_response import JobResponse
 
-class AnalyzeSpeechJobResult(dict):
+class AnalyzeSpeechJobResult(DictModel):
     """The :class:`AnalyzeSpeechJobResult` object, which represents the result for an analyze speech job."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
 class AnalyzeSpeechJob(JobResponse):
     """The :class:`AnalyzeSpeechJob` object, which represents the result for an analyze speech job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = AnalyzeSpeechJobResult(dictionary['result'])
+    result = ModelField(AnalyzeSpeechJobResult, default=None)
@@ -0,0 +1,119 @@
+"""
+dolbyio_rest_apis.media.models.dict_model
+~~~~~~~~~~~~~~~
+
+This module contains the base model of the Media responses and its fields.
+"""
+
+_MISSING = object()
+
+class DictField:
+    r"""
+    Attribute of a :class:`DictModel` that reads and writes a key of the dictionary,
+    so the value is only stored once.
+    """
+
+    __slots__ = ('name', 'key', 'default')
+
+    def __init__(self, key: str=None, default=_MISSING):
+        r"""
+        Args:
+            key: (Optional) Key of the dictionary, the name of the attribute by default.
+            default: (Optional) Value returned when the key is not in the dictionary,
+                if not set reading the attribute raises an :class:`AttributeError`.
+        """
+        self.name = key
+        self.key = key
+        self.default = default
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        if self.key is None:
+            self.key = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance[self.key]
+        except KeyError:
+            if self.default is _MISSING:
+                raise AttributeError(f'\'{type(instance).__name__}\' object has no attribute \'{self.name}\'') from None
+            return self.default
+
+    def __set__(self, instance, value):
+        instance[self.key] = value
+
+class ListField(DictField):
+    r"""
+    Attribute of a :class:`DictModel` that reads and writes a list of the dictionary,
+    an empty list is returned when the key is not in the dictionary or is `None`.
+    """
+
+    __slots__ = ()
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.get(self.key)
+        return [] if value is None else value
+
+class ModelField(DictField):
+    r"""
+    Attribute of a :class:`DictModel` that wraps a dictionary of the dictionary into a model
+    on first access, the model then replaces the dictionary so it is only built once.
+    """
+
+    __slots__ = ('model',)
+
+    def __init__(self, model: type, key: str=None, default=_MISSING):
+        r"""
+        Args:
+            model: Class of the model, built from the dictionary.
+            key: (Optional) Key of the dictionary, the name of the attribute by default.
+            default: (Optional) Value returned when the key is not in the dictionary,
+                if not set reading the attribute raises an :class:`AttributeError`.
+        """
+        DictField.__init__(self, key, default)
+        self.model = model
+
+    def __get__(self, instance, owner=None):
+        value = DictField.__get__(self, instance, owner)
+        if instance is None or value is None or isinstance(value, self.model):
+            return value
+        value = self.model(value)
+        instance[self.key] = value
+        return value
+
+class ModelListField(ListField):
+    r"""
+    Attribute of a :class:`DictModel` that wraps the dictionaries of a list of the dictionary into models
+    on first access, the list of models then replaces the list so they are only built once.
+    """
+
+    __slots__ = ('model',)
+
+    def __init__(self, model: type, key: str=None):
+        r"""
+        Args:
+            model: Class of the models, built from the dictionaries of the list.
+            key: (Optional) Key of the dictionary, the name of the attribute by default.
+        """
+        ListField.__init__(self, key)
+        self.model = model
+
+    def __get__(self, instance, owner=None):
+        values = ListField.__get__(self, instance, owner)
+        if instance is None or not values or isinstance(values[0], self.model):
+            return values
+        values = [self.model(value) for value in values]
+        instance[self.key] = values
+        return values
+
+class DictModel(dict):
+    r"""
+    Base of the Media models, a dictionary which attributes are views over its keys.
+    The models have no instance dictionary, the subclasses must declare `__slots__`.
+    """
+
+    __slots__ = ()
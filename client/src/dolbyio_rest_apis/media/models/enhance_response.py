@@ -5,22 +5,19 @@ dolbyio_rest_apis.media.models.enhance_response
 This module contains the Enhance Response model.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel, ModelField
 from .job_response import JobResponse
 
-class EnhanceJobResult(dict):
+class EnhanceJobResult(DictModel):
     """The :class:`EnhanceJobResult` object, which represents the result for an enhance job."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.version = get_value_or_default(dictionary, 'version', None)
+    version = DictField(default=None)
 
 class EnhanceJob(JobResponse):
     """The :class:`EnhanceJob` object, which represents the result for an enhance job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = EnhanceJobResult(dictionary['result'])
+    result = ModelField(EnhanceJobResult, default=None)
@@ -5,22 +5,30 @@ dolbyio_rest_apis.media.models.job_response
 This module contains the Job response base model
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel, ModelField
 from .result_error import ResultError
 
-class JobResponse(dict):
+class JobResponse(DictModel):
     """The :class:`JobResult` object, which represents the result for a job operation."""
 
+    __slots__ = ('job_id', '_result')
+
+    api_version = DictField(default=None)
+    path = DictField(default=None)
+    status = DictField(default=None)
+    progress = DictField(default=0)
+    error = ModelField(ResultError)
+
     def __init__(self, job_id, dictionary: dict):
-        dict.__init__(self, dictionary)
+        super().__init__(dictionary)
 
         self.job_id = job_id
-        self.api_version = get_value_or_default(dictionary, 'api_version', None)
-        self.path = get_value_or_default(dictionary, 'path', None)
-        self.status = get_value_or_default(dictionary, 'status', None)
-        self.progress = get_value_or_default(dictionary, 'progress', 0)
-        self.result = None
 
-        if 'error' in dictionary:
-            self.error = ResultError(dictionary['error'])
+    @property
+    def result(self):
+        r"""Result of the job, `None` unless set, the subclasses build it from the `result` of the dictionary."""
+        return getattr(self, '_result', None)
 
+    @result.setter
+    def result(self, value):
+        self._result = value
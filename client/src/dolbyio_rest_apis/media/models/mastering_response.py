@@ -5,39 +5,33 @@ dolbyio_rest_apis.media.models.mastering_response
 This module contains the Mastering Response model.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel, ModelField
 from .job_response import JobResponse
 
-class MasteringPreviewJobResult(dict):
+class MasteringPreviewJobResult(DictModel):
     """The :class:`MasteringPreviewJobResult` object, which represents the result for a mastering preview job."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.initial_level = get_value_or_default(dictionary, 'initial_level', None)
+    initial_level = DictField(default=None)
 
 class MasteringPreviewJob(JobResponse):
     """The :class:`MasteringPreviewJob` object, which represents the result for a mastering preview job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = MasteringPreviewJobResult(dictionary['result'])
+    result = ModelField(MasteringPreviewJobResult, default=None)
 
 class MasteringJobResult(MasteringPreviewJobResult):
     """The :class:`MasteringJobResult` object, which represents the result for a mastering job."""
 
-    def __init__(self, dictionary: dict):
-        MasteringPreviewJobResult.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.final_level = get_value_or_default(dictionary, 'final_level', None)
+    final_level = DictField(default=None)
 
 class MasteringJob(JobResponse):
     """The :class:`MasteringJob` object, which represents the result for a mastering job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = MasteringJobResult(dictionary['result'])
+    result = ModelField(MasteringJobResult, default=None)
@@ -5,13 +5,12 @@ dolbyio_rest_apis.media.models.paged_response
 This module contains the Paged Response base model.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel
 
-class PagedResponse(dict):
+class PagedResponse(DictModel):
     r"""Representation of a paged response."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.next_token = get_value_or_default(self, 'next_token', None)
-        self.count = get_value_or_default(self, 'count', None)
+    next_token = DictField(default=None)
+    count = DictField(default=None)
@@ -5,14 +5,13 @@ dolbyio_rest_apis.media.models.result_error
 This module contains the Result Error model.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel
 
-class ResultError(dict):
+class ResultError(DictModel):
     """The :class:`ResultError` object, which represents an enhance job error."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.type = get_value_or_default(self, 'type', None)
-        self.title = get_value_or_default(self, 'title', None)
-        self.detail = get_value_or_default(self, 'detail', None)
+    type = DictField(default=None)
+    title = DictField(default=None)
+    detail = DictField(default=None)
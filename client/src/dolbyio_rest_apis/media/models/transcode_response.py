@@ -5,22 +5,19 @@ dolbyio_rest_apis.media.models.transcode_response
 This module contains the Transcode Response model.
 """
 
-from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel, ModelField
 from .job_response import JobResponse
 
-class TranscodeJobResult(dict):
+class TranscodeJobResult(DictModel):
     """The :class:`TranscodeJobResult` object, which represents the result for a transcode job."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.version = get_value_or_default(dictionary, 'version', None)
+    version = DictField(default=None)
 
 class TranscodeJob(JobResponse):
     """The :class:`TranscodeJob` object, which represents the result for a transcode job."""
 
-    def __init__(self, job_id, dictionary: dict):
-        JobResponse.__init__(self, job_id, dictionary)
+    __slots__ = ()
 
-        if 'result' in dictionary:
-            self.result = TranscodeJobResult(dictionary['result'])
+    result = ModelField(TranscodeJobResult, default=None)
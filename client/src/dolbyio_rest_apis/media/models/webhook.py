@@ -6,17 +6,35 @@ This module contains the Webhook model.
 """
 
 from dolbyio_rest_apis.core.helpers import get_value_or_default
+from .dict_model import DictField, DictModel
 
-class Webhook(dict):
+class Webhook(DictModel):
     """The :class:`Webhook` object, which represents a webhook."""
 
-    def __init__(self, dictionary: dict):
-        dict.__init__(self, dictionary)
+    __slots__ = ()
 
-        self.webhook_id = get_value_or_default(self, 'webhook_id', None)
-        self.url = None
-        self.headers = None
-        if 'callback' in self:
-            callback = self['callback']
-            self.url = get_value_or_default(callback, 'url', None)
-            self.headers = get_value_or_default(callback, 'headers', None)
+    webhook_id = DictField(default=None)
+
+    @property
+    def url(self) -> str:
+        r"""The callback URL."""
+        return get_value_or_default(self['callback'], 'url', None) if 'callback' in self else None
+
+    @url.setter
+    def url(self, value: str):
+        self._get_callback()['url'] = value
+
+    @property
+    def headers(self) -> dict:
+        r"""The headers of the callback."""
+        return get_value_or_default(self['callback'], 'headers', None) if 'callback' in self else None
+
+    @headers.setter
+    def headers(self, value: dict):
+        self._get_callback()['headers'] = value
+
+    def _get_callback(self) -> dict:
+        callback = self.get('callback')
+        if callback is None:
+            callback = self['callback'] = {}
+        return callback
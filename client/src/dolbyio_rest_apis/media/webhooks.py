@@ -6,15 +6,18 @@ This module contains the functions to work with the Platform Webhooks APIs.
 """
 
 from dolbyio_rest_apis.core.helpers import add_if_not_none
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_mapi_url
 from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
 from dolbyio_rest_apis.media.models.webhook import Webhook
 from typing import Any, Dict
 
+@traced(result_attribute='webhook_id')
 async def register_webhook(
         access_token: str,
         url: str,
         headers: Dict[str, Any]=None,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Registers a webhook that is triggered when a job completes.
@@ -25,6 +28,7 @@ async def register_webhook(
         access_token: Access token to use for authentication.
         url: The callback url that will be called when job execution completes.
         headers: (Optional) Headers to include in the webhook call.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         The webhook identifier.
@@ -40,7 +44,7 @@ async def register_webhook(
     }
     add_if_not_none(payload['callback'], 'headers', headers)
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_post(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/webhooks',
@@ -50,11 +54,13 @@ async def register_webhook(
     if 'webhook_id' in json_response:
         return json_response['webhook_id']
 
+@traced
 async def update_webhook(
         access_token: str,
         webhook_id: str,
         url: str,
         headers: Dict[str, Any]=None,
+        http_context: MediaHttpContext=None,
     ):
     r"""
     Updates the previously registered webhook configuration.
@@ -67,6 +73,7 @@ async def update_webhook(
             or PUT response to retrieve the webhook configuration.
         url: The callback url that will be called when job execution completes.
         headers: (Optional) Headers to include in the webhook call.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Raises:
         HttpRequestError: If a client error one occurred.
@@ -83,7 +90,7 @@ async def update_webhook(
     }
     add_if_not_none(payload['callback'], 'headers', headers)
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         await http_context.requests_put(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/webhooks',
@@ -91,9 +98,11 @@ async def update_webhook(
             payload=payload,
         )
 
+@traced
 async def retrieve_webhook(
         access_token: str,
         webhook_id: str,
+        http_context: MediaHttpContext=None,
     ) -> Webhook:
     r"""
     Retrieves the previously registered webhook configuration.
@@ -104,6 +113,7 @@ async def retrieve_webhook(
         access_token: Access token to use for authentication.
         url: The callback url that will be called when job execution completes.
         headers: (Optional) Headers to include in the webhook call.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         A :class:`Webhook` object.
@@ -116,18 +126,20 @@ async def retrieve_webhook(
         'id': webhook_id
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_get(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/webhooks',
             params=params,
         )
 
-    return Webhook(json_response)
+    return http_context.build_response(json_response, Webhook)
 
+@traced
 async def delete_webhook(
         access_token: str,
         webhook_id: str,
+        http_context: MediaHttpContext=None,
     ) -> str or None:
     r"""
     Deletes a previously registered webhook configuration.
@@ -138,6 +150,7 @@ async def delete_webhook(
         access_token: Access token to use for authentication.
         webhook_id: Use the `webhook_id` returned from a previous GET, POST
             or PUT response to retrieve the webhook configuration.
+        http_context: (Optional) HTTP context to reuse across calls, see :class:`MediaClient`.
 
     Returns:
         The webhook identifier.
@@ -150,7 +163,7 @@ async def delete_webhook(
         'id': webhook_id
     }
 
-    async with MediaHttpContext() as http_context:
+    async with MediaHttpContext.use(http_context) as http_context:
         json_response = await http_context.requests_delete(
             access_token=access_token,
             url=f'{get_mapi_url()}/media/webhooks',
@@ -0,0 +1,27 @@
+"""
+dolbyio_rest_apis.streaming
+~~~~~~~~~~~~~~~
+
+This package contains the functions to work with the Real-time Streaming APIs,
+each module is imported on first access, like `dolbyio_rest_apis.streaming.publish_token`.
+"""
+
+import importlib
+
+_MODULES = (
+    'account',
+    'client',
+    'cluster',
+    'publish_token',
+    'stream',
+    'subscribe_token',
+    'webhooks',
+)
+
+def __getattr__(name: str): # pylint: disable=invalid-name
+    if name in _MODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__(): # pylint: disable=invalid-name
+    return sorted(list(globals()) + list(_MODULES))
@@ -0,0 +1,119 @@
+"""
+dolbyio_rest_apis.streaming.client
+~~~~~~~~~~~~~~~
+
+This module contains the client to work with the Dolby Millicast APIs.
+"""
+
+import functools
+from dolbyio_rest_apis.core.client import Client
+from dolbyio_rest_apis.core.connection_pool import ConnectionPoolConfig
+from dolbyio_rest_apis.core.metrics import MetricsRegistry
+from dolbyio_rest_apis.core.rate_limiter import Priority, RateLimiterRegistry
+from dolbyio_rest_apis.core.request_timing import RequestTimingCallback
+from dolbyio_rest_apis.core.response_cache import ResponseCache
+from dolbyio_rest_apis.core.response_mode import ResponseMode
+from dolbyio_rest_apis.core.serializer import JsonSerializer
+from dolbyio_rest_apis.core.sync_client import EventLoopThread, SyncClient
+from dolbyio_rest_apis.streaming import account, cluster, publish_token, stream, subscribe_token, webhooks
+from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
+from typing import Mapping
+
+class StreamingClient(Client):
+    r"""
+    Client for the Dolby Millicast APIs that keeps the same HTTP context, and its connections, for its lifetime.
+
+    Every function of the Streaming modules is available on the client, for example:
+
+    .. code-block:: python
+
+        async with StreamingClient() as client:
+            token = await client.publish_token.read(api_secret, token_id)
+    """
+
+    def __init__(
+            self,
+            pool_config: ConnectionPoolConfig=None,
+            rate_limiters: RateLimiterRegistry=None,
+            priority: Priority=Priority.NORMAL,
+            coalesce_requests: bool=False,
+            serializer: JsonSerializer=None,
+            on_request_timing: RequestTimingCallback=None,
+            metrics: MetricsRegistry=None,
+            response_cache: ResponseCache=None,
+            cache_ttls: Mapping[str, float]=None,
+            response_mode: ResponseMode=ResponseMode.MODEL,
+        ):
+        r"""
+        Args:
+            pool_config: (Optional) Settings of the connection pool.
+                If not set, :attr:`StreamingHttpContext.DEFAULT_POOL_CONFIG` is used.
+            rate_limiters: (Optional) Registry of the rate limiters to use for the requests.
+                If not set, the registry shared by the whole process is used.
+            priority: (Optional) Lane of the rate limiters used by the requests of this client.
+            coalesce_requests: (Optional) Send a single request when identical GET requests are made at the same time,
+                like several coroutines polling the same job.
+            serializer: (Optional) Serializer of the JSON bodies of the requests and responses.
+                If not set, the fastest serializer installed is used.
+            on_request_timing: (Optional) Function called with the :class:`RequestTiming` of each request,
+                to see where the latency goes.
+            metrics: (Optional) Registry where to record the metrics of the requests,
+                see :class:`MetricsRegistry` to export them in the OpenMetrics format.
+            response_cache: (Optional) Cache for the responses of the read-mostly endpoints,
+                like :class:`MemoryResponseCache`.
+            cache_ttls: (Optional) Number of seconds the responses are cached, per endpoint.
+                If not set, :attr:`StreamingHttpContext.DEFAULT_CACHE_TTLS` is used.
+            response_mode: (Optional) What the API functions return: the models, the decoded JSON or the body of the responses.
+                It can be changed for some calls with :func:`response_mode`.
+        """
+
+        super().__init__(StreamingHttpContext(
+            pool_config=pool_config,
+            rate_limiters=rate_limiters,
+            priority=priority,
+            coalesce_requests=coalesce_requests,
+            serializer=serializer,
+            on_request_timing=on_request_timing,
+            metrics=metrics,
+            response_cache=response_cache,
+            cache_ttls=cache_ttls,
+            response_mode=response_mode,
+        ))
+
+        self.account = self._bind(account)
+        self.cluster = self._bind(cluster)
+        self.publish_token = self._bind(publish_token)
+        self.stream = self._bind(stream)
+        self.subscribe_token = self._bind(subscribe_token)
+        self.webhooks = self._bind(webhooks)
+
+class SyncStreamingClient(SyncClient):
+    r"""
+    Synchronous version of :class:`StreamingClient`, for the applications not using asyncio.
+
+    The calls are run on a background event loop that keeps the same HTTP session, and its connections,
+    for the lifetime of the client. The client can be shared by several threads.
+
+    .. code-block:: python
+
+        with SyncStreamingClient() as client:
+            token = client.publish_token.read(api_secret, token_id)
+    """
+
+    def __init__(self, loop_thread: EventLoopThread=None, **kwargs):
+        r"""
+        Args:
+            loop_thread: (Optional) Event loop to run the calls on, it can be shared by several clients.
+                If not set, the event loop thread shared by the synchronous clients is used.
+            kwargs: Arguments of :class:`StreamingClient`.
+        """
+
+        super().__init__(functools.partial(StreamingClient, **kwargs), loop_thread)
+
+        client: StreamingClient = self.client
+        self.account = self._bind(client.account)
+        self.cluster = self._bind(client.cluster)
+        self.publish_token = self._bind(client.publish_token)
+        self.stream = self._bind(client.stream)
+        self.subscribe_token = self._bind(client.subscribe_token)
+        self.webhooks = self._bind(client.webhooks)
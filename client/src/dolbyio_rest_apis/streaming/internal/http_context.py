@@ -5,21 +5,92 @@ dolbyio_rest_apis.streaming.internal.helpers
 This module contains internal helpers.
 """
 
-from aiohttp import ClientResponse, ContentTypeError
+from dolbyio_rest_apis.core.connection_pool import ConnectionPoolConfig
 from dolbyio_rest_apis.core.http_context import HttpContext
 from dolbyio_rest_apis.core.http_request_error import HttpRequestError
+from dolbyio_rest_apis.core.json_stream import iter_json_array
+from dolbyio_rest_apis.core.metrics import MetricsRegistry
+from dolbyio_rest_apis.core.rate_limiter import Priority, RateLimiterRegistry
+from dolbyio_rest_apis.core.request_timing import RequestTimingCallback
+from dolbyio_rest_apis.core.response_cache import ResponseCache
+from dolbyio_rest_apis.core.response_mode import ResponseMode
+from dolbyio_rest_apis.core.serializer import JsonSerializer
+from dolbyio_rest_apis.core.urls import get_endpoint_template, get_resource_family
 from dolbyio_rest_apis.streaming.models.core import BaseResponse, Error
-import json
+import hashlib
 import logging
-from typing import Any, Mapping
+from typing import Any, AsyncIterator, Mapping, TYPE_CHECKING
+from urllib.parse import urlencode, urlsplit
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
 
 class StreamingHttpContext(HttpContext):
     """HTTP Context class for Dolby Millicast APIs"""
 
-    def __init__(self):
-        super().__init__()
+    # All the calls go to api.millicast.com, allow the whole pool on that single host
+    DEFAULT_POOL_CONFIG = ConnectionPoolConfig(
+        limit=100,
+        limit_per_host=100,
+        keepalive_timeout=60.0,
+        ttl_dns_cache=300,
+    )
+
+    API_FAMILY = 'streaming'
+
+    # Number of seconds the responses of the read-mostly endpoints are kept, when a response cache is used.
+    # The numeric identifiers of the paths are replaced by {id}.
+    DEFAULT_CACHE_TTLS: Mapping[str, float] = {
+        '/api/cluster': 300.0,
+        '/api/account/geo_cascade': 300.0,
+        '/api/geo/account': 300.0,
+        '/api/publish_token/{id}': 60.0,
+    }
+
+    def __init__(
+            self,
+            pool_config: ConnectionPoolConfig=None,
+            rate_limiters: RateLimiterRegistry=None,
+            priority: Priority=Priority.NORMAL,
+            coalesce_requests: bool=False,
+            serializer: JsonSerializer=None,
+            on_request_timing: RequestTimingCallback=None,
+            metrics: MetricsRegistry=None,
+            response_cache: ResponseCache=None,
+            cache_ttls: Mapping[str, float]=None,
+            response_mode: ResponseMode=ResponseMode.MODEL,
+        ):
+        r"""
+        Args:
+            pool_config: (Optional) Settings of the connection pool.
+                If not set, :attr:`DEFAULT_POOL_CONFIG` is used.
+            rate_limiters: (Optional) Registry of the rate limiters to use for the requests.
+                If not set, the registry shared by the whole process is used.
+            priority: (Optional) Lane of the rate limiters used by the requests.
+            coalesce_requests: (Optional) Send a single request when identical GET requests are made at the same time.
+            serializer: (Optional) Serializer of the JSON bodies of the requests and responses.
+            on_request_timing: (Optional) Function called with the :class:`RequestTiming` of each request.
+            metrics: (Optional) Registry where to record the metrics of the requests.
+            response_cache: (Optional) Cache for the responses of the read-mostly endpoints.
+                The cached responses of a family of resources, like `/api/publish_token`,
+                are invalidated when a request modifies one of them.
+            cache_ttls: (Optional) Number of seconds the responses are cached, per endpoint.
+                If not set, :attr:`DEFAULT_CACHE_TTLS` is used.
+            response_mode: (Optional) What the API functions return, the models by default.
+                In the :attr:`ResponseMode.BYTES` mode, the body includes the `status` and `data` envelope
+                and the responses are not cached.
+        """
+
+        super().__init__(pool_config, rate_limiters, priority, coalesce_requests, serializer, on_request_timing, metrics, response_mode)
 
         self._logger = logging.getLogger(StreamingHttpContext.__name__)
+        self._response_cache = response_cache
+        self._cache_ttls = self.DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        r"""The cache for the responses of the read-mostly endpoints, or `None` if the responses are not cached."""
+        return self._response_cache
 
     async def _requests_with_payload(
             self,
@@ -40,7 +111,7 @@ class StreamingHttpContext(HttpContext):
             params: (Optional) URL query parameters.
 
         Returns:
-            The JSON response.
+            The data of the JSON response, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -54,17 +125,21 @@ class StreamingHttpContext(HttpContext):
         }
 
         if not isinstance(payload, str):
-            payload = json.dumps(payload, indent=4)
-
-        json_response = await self._send_request(
-            method=method,
-            url=url,
-            params=params,
-            headers=headers,
-            data=payload,
-        )
-
-        return BaseResponse.from_dict(json_response).data
+            payload = self._serializer.dumps(payload)
+
+        try:
+            json_response = await self._send_request(
+                method=method,
+                url=url,
+                params=params,
+                headers=headers,
+                data=payload,
+                raw_body=self.response_mode is ResponseMode.BYTES,
+            )
+        finally:
+            self._invalidate_cache(api_secret, url)
+
+        return self._get_data(json_response)
 
     async def requests_post(
             self,
@@ -83,7 +158,7 @@ class StreamingHttpContext(HttpContext):
             params: (Optional) URL query parameters.
 
         Returns:
-            The JSON response.
+            The data of the JSON response, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -115,7 +190,7 @@ class StreamingHttpContext(HttpContext):
             params: (Optional) URL query parameters.
 
         Returns:
-            The JSON response.
+            The data of the JSON response, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -147,7 +222,7 @@ class StreamingHttpContext(HttpContext):
             params: (Optional) URL query parameters.
 
         Returns:
-            The JSON response.
+            The data of the JSON response, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
@@ -169,7 +244,8 @@ class StreamingHttpContext(HttpContext):
             params: Mapping[str, str]=None,
         ) -> dict:
         r"""
-        Sends a GET request.
+        Sends a GET request, or gets its response from the response cache.
+        The cached responses are shared by the callers and must not be modified.
 
         Args:
             api_secret: API secret to use for authentication.
@@ -177,13 +253,24 @@ class StreamingHttpContext(HttpContext):
             params: (Optional) URL query parameters.
 
         Returns:
-            The JSON response.
+            The data of the JSON response, or its body in the :attr:`ResponseMode.BYTES` mode.
 
         Raises:
             HttpRequestError: If a client error one occurred.
             HTTPError: If one occurred.
         """
 
+        raw_body = self.response_mode is ResponseMode.BYTES
+
+        cache_key = None
+        if self._response_cache is not None and not raw_body:
+            ttl = self._cache_ttls.get(get_endpoint_template(urlsplit(url).path))
+            if ttl is not None:
+                cache_key = self._get_cache_key(api_secret, url, params)
+                data = self._response_cache.get(cache_key)
+                if data is not None:
+                    return data
+
         headers = {
             'Accept': 'application/json',
             'Authorization': f'Bearer {api_secret}',
@@ -194,9 +281,52 @@ class StreamingHttpContext(HttpContext):
             url=url,
             params=params,
             headers=headers,
+            raw_body=raw_body,
         )
 
-        return BaseResponse.from_dict(json_response).data
+        data = self._get_data(json_response)
+        if cache_key is not None and data is not None:
+            self._response_cache.set(cache_key, data, ttl, (self._get_cache_tag(api_secret, url),))
+
+        return data
+
+    async def requests_get_items(
+            self,
+            api_secret: str,
+            url: str,
+            params: Mapping[str, str]=None,
+        ) -> AsyncIterator[dict]:
+        r"""
+        Sends a GET request to an endpoint returning a list,
+        and provides the items of the list as they are received.
+
+        Args:
+            api_secret: API secret to use for authentication.
+            url: Where to send the request to.
+            params: (Optional) URL query parameters.
+
+        Returns:
+            An asynchronous iterator over the items of the list.
+
+        Raises:
+            HttpRequestError: If a client error one occurred.
+            HTTPError: If one occurred.
+            ValueError: If the response is not a valid JSON document.
+        """
+
+        if params is None:
+            self._logger.debug('GET %s', url)
+        else:
+            self._logger.debug('GET %s %s', url, params)
+
+        headers = self._add_default_headers({
+            'Accept': 'application/json',
+            'Authorization': f'Bearer {api_secret}',
+        })
+
+        async with self._request('GET', url, headers, params) as http_response:
+            async for item in iter_json_array(self._iter_body(http_response), 'data'):
+                yield item
 
     async def requests_delete(
             self,
@@ -222,18 +352,49 @@ class StreamingHttpContext(HttpContext):
             'Authorization': f'Bearer {api_secret}',
         }
 
-        json_response = await self._send_request(
-            method='DELETE',
-            url=url,
-            params=params,
-            headers=headers,
-        )
-
+        try:
+            json_response = await self._send_request(
+                method='DELETE',
+                url=url,
+                params=params,
+                headers=headers,
+                raw_body=self.response_mode is ResponseMode.BYTES,
+            )
+        finally:
+            self._invalidate_cache(api_secret, url)
+
+        return self._get_data(json_response)
+
+    @staticmethod
+    def _get_data(json_response: Any) -> Any:
+        # The body of the response is returned as is, with its envelope
+        if isinstance(json_response, bytes):
+            return json_response
         return BaseResponse.from_dict(json_response).data
 
-    async def _raise_for_status(self, http_response: ClientResponse):
+    @staticmethod
+    def _get_cache_tag(api_secret: str, url: str) -> str:
+        # Do not keep the API secret in the cache
+        fingerprint = hashlib.sha256(api_secret.encode('utf-8')).hexdigest()
+        url_parts = urlsplit(url)
+        return f'{fingerprint} {url_parts.scheme}://{url_parts.netloc}{get_resource_family(url_parts.path)}'
+
+    @staticmethod
+    def _get_cache_key(api_secret: str, url: str, params: Mapping[str, str] | None) -> str:
+        fingerprint = hashlib.sha256(api_secret.encode('utf-8')).hexdigest()
+        if not params:
+            return f'{fingerprint} {url}'
+        return f'{fingerprint} {url}?{urlencode(sorted(params.items()))}'
+
+    def _invalidate_cache(self, api_secret: str, url: str):
+        if self._response_cache is not None:
+            self._response_cache.invalidate(self._get_cache_tag(api_secret, url))
+
+    async def _raise_for_status(self, http_response: 'ClientResponse'):
         r"""Raises :class:`HttpRequestError` or :class:`ClientResponseError`, if one occurred."""
 
+        from aiohttp import ContentTypeError
+
         if 400 <= http_response.status < 500:
             if 400 < http_response.status < 404:
                 self._logger.error('Unauthorized to get data from the url %s - Response code %i', http_response.url, http_response.status)
@@ -243,7 +404,7 @@ class StreamingHttpContext(HttpContext):
                 self._logger.error('Did not find data at the url %s - Response code %i', http_response.url, http_response.status)
 
             try:
-                json_response = await http_response.json()
+                json_response = await self._read_json(http_response)
                 base_response = BaseResponse.from_dict(json_response)
                 err = Error.from_dict(base_response.data)
 
@@ -6,7 +6,7 @@ This module contains the models used by the Account module.
 """
 
 from dataclasses import dataclass, field
-from dataclasses_json import LetterCase, dataclass_json
+from dolbyio_rest_apis.core.dataclass_json import LetterCase, dataclass_json
 
 @dataclass_json(letter_case=LetterCase.CAMEL)
 @dataclass
@@ -6,7 +6,7 @@ This module contains the models used by the Cluster module.
 """
 
 from dataclasses import dataclass
-from dataclasses_json import LetterCase, dataclass_json
+from dolbyio_rest_apis.core.dataclass_json import LetterCase, dataclass_json
 
 @dataclass
 class ClusterLocation:
@@ -4,7 +4,7 @@ dolbyio_rest_apis.streaming.models.core
 """
 
 from dataclasses import dataclass
-from dataclasses_json import dataclass_json
+from dolbyio_rest_apis.core.dataclass_json import dataclass_json
 
 @dataclass_json
 @dataclass
@@ -6,36 +6,44 @@ This module contains the functions to work with the Publish Token APIs.
 """
 
 from dolbyio_rest_apis.core.helpers import add_if_not_none
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_rts_url
 from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
 from dolbyio_rest_apis.streaming.models.publish_token import PublishToken, UpdatePublishToken, CreatePublishToken, ActivePublishToken, DisablePublishTokenResponse
+from typing import AsyncIterator
 
+@traced
 async def read(
         api_secret: str,
         token_id: int,
+        http_context: StreamingHttpContext | None = None,
     ) -> PublishToken:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/{token_id}',
         )
 
-    return PublishToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, PublishToken.from_dict)
 
+@traced
 async def delete(
         api_secret: str,
         token_id: int,
+        http_context: StreamingHttpContext | None = None,
     ) -> None:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         await http_context.requests_delete(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/{token_id}',
         )
 
+@traced
 async def update(
         api_secret: str,
         token_id: int,
         token: UpdatePublishToken,
+        http_context: StreamingHttpContext | None = None,
     ) -> PublishToken:
     payload = {}
     add_if_not_none(payload, 'label', token.label)
@@ -84,21 +92,23 @@ async def update(
             }
             payload['updateRestream'].append(restream_obj)
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_put(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/{token_id}',
             payload=payload,
         )
 
-    return PublishToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, PublishToken.from_dict)
 
+@traced
 async def list_tokens(
         api_secret: str,
         sort_by: str,
         page: int,
         items_on_page: int,
         is_descending: bool = False,
+        http_context: StreamingHttpContext | None = None,
     ) -> list[PublishToken]:
     params = {
         'sortBy': sort_by,
@@ -107,21 +117,44 @@ async def list_tokens(
         'isDescending': str(is_descending),
     }
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/list',
             params=params,
         )
 
-    tokens = []
-    for token in dict_data:
-        tokens.append(PublishToken.from_dict(token))
-    return tokens
+    return http_context.build_response(dict_data, lambda tokens: [PublishToken.from_dict(token) for token in tokens])
 
+@traced
+async def iter_tokens(
+        api_secret: str,
+        sort_by: str,
+        page: int,
+        items_on_page: int,
+        is_descending: bool = False,
+        http_context: StreamingHttpContext | None = None,
+    ) -> AsyncIterator[PublishToken]:
+    params = {
+        'sortBy': sort_by,
+        'page': str(page),
+        'itemsOnPage': str(items_on_page),
+        'isDescending': str(is_descending),
+    }
+
+    async with StreamingHttpContext.use(http_context) as http_context:
+        async for dict_data in http_context.requests_get_items(
+            api_secret=api_secret,
+            url=f'{get_rts_url()}/api/publish_token/list',
+            params=params,
+        ):
+            yield http_context.build_response(dict_data, PublishToken.from_dict)
+
+@traced(result_attribute='token_id')
 async def create(
         api_secret: str,
         token: CreatePublishToken,
+        http_context: StreamingHttpContext | None = None,
     ) -> PublishToken:
     payload = {
         'label': token.label,
@@ -159,54 +192,60 @@ async def create(
             'key': restream.key,
         }
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_post(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token',
             payload=payload,
         )
 
-    return PublishToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, PublishToken.from_dict)
 
+@traced
 async def get_active_publish_token_id(
         api_secret: str,
         stream_id: str,
+        http_context: StreamingHttpContext | None = None,
     ) -> ActivePublishToken:
     params = {
         'streamId': stream_id,
     }
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/active',
             params=params,
         )
 
-    return ActivePublishToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, ActivePublishToken.from_dict)
 
+@traced
 async def get_all_active_publish_token_id(
         api_secret: str,
+        http_context: StreamingHttpContext | None = None,
     ) -> ActivePublishToken:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/active/all',
         )
 
-    return ActivePublishToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, ActivePublishToken.from_dict)
 
+@traced
 async def disable(
         api_secret: str,
         token_ids: list[int],
+        http_context: StreamingHttpContext | None = None,
     ) -> DisablePublishTokenResponse:
     payload = {
         'tokenIds': token_ids,
     }
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_patch(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/publish_token/disable',
             payload=payload,
         )
 
-    return DisablePublishTokenResponse.from_dict(dict_data)
+    return http_context.build_response(dict_data, DisablePublishTokenResponse.from_dict)
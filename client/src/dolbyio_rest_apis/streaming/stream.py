@@ -5,34 +5,39 @@ dolbyio_rest_apis.streaming.stream
 This module contains the functions to work with the Stream APIs.
 """
 
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_rts_url
 from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
 from dolbyio_rest_apis.streaming.models.stream import StreamStoppingLevel
 
+@traced
 async def stop(
         api_secret: str,
         stream_id: str,
+        http_context: StreamingHttpContext | None = None,
     ) -> None:
     payload = {
         'streamId': stream_id,
     }
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_post(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/stream/stop',
             payload=payload,
         )
 
-    return StreamStoppingLevel.from_dict(dict_data)
+    return http_context.build_response(dict_data, StreamStoppingLevel.from_dict)
 
+@traced
 async def stop_all(
         api_secret: str,
+        http_context: StreamingHttpContext | None = None,
     ) -> None:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_post(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/stream/stop/all',
         )
 
-    return StreamStoppingLevel.from_dict(dict_data)
+    return http_context.build_response(dict_data, StreamStoppingLevel.from_dict)
@@ -6,36 +6,44 @@ This module contains the functions to work with the Subscribe Token APIs.
 """
 
 from dolbyio_rest_apis.core.helpers import add_if_not_none
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_rts_url
 from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
 from dolbyio_rest_apis.streaming.models.subscribe_token import SubscribeToken, UpdateSubscribeToken, CreateSubscribeToken
+from typing import AsyncIterator
 
+@traced
 async def read(
         api_secret: str,
         token_id: int,
+        http_context: StreamingHttpContext | None = None,
     ) -> SubscribeToken:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/subscribe_token/{token_id}',
         )
 
-    return SubscribeToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, SubscribeToken.from_dict)
 
+@traced
 async def delete(
         api_secret: str,
         token_id: int,
+        http_context: StreamingHttpContext | None = None,
     ) -> None:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         await http_context.requests_delete(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/subscribe_token/{token_id}',
         )
 
+@traced
 async def update(
         api_secret: str,
         token_id: int,
         token: UpdateSubscribeToken,
+        http_context: StreamingHttpContext | None = None,
     ) -> SubscribeToken:
     payload = {}
     add_if_not_none(payload, 'label', token.label)
@@ -64,21 +72,23 @@ async def update(
     add_if_not_none(payload, 'updateDeniedCountries', token.update_denied_countries)
     add_if_not_none(payload, 'updateOriginCluster', token.update_origin_cluster)
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_put(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/subscribe_token/{token_id}',
             payload=payload,
         )
 
-    return SubscribeToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, SubscribeToken.from_dict)
 
+@traced
 async def list_tokens(
         api_secret: str,
         sort_by: str,
         page: int,
         items_on_page: int,
         is_descending: bool = False,
+        http_context: StreamingHttpContext | None = None,
     ) -> list[SubscribeToken]:
     params = {
         'sortBy': sort_by,
@@ -87,21 +97,44 @@ async def list_tokens(
         'isDescending': str(is_descending),
     }
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/subscribe_token/list',
             params=params,
         )
 
-    tokens = []
-    for token in dict_data:
-        tokens.append(SubscribeToken.from_dict(token))
-    return tokens
+    return http_context.build_response(dict_data, lambda tokens: [SubscribeToken.from_dict(token) for token in tokens])
 
+@traced
+async def iter_tokens(
+        api_secret: str,
+        sort_by: str,
+        page: int,
+        items_on_page: int,
+        is_descending: bool = False,
+        http_context: StreamingHttpContext | None = None,
+    ) -> AsyncIterator[SubscribeToken]:
+    params = {
+        'sortBy': sort_by,
+        'page': str(page),
+        'itemsOnPage': str(items_on_page),
+        'isDescending': str(is_descending),
+    }
+
+    async with StreamingHttpContext.use(http_context) as http_context:
+        async for dict_data in http_context.requests_get_items(
+            api_secret=api_secret,
+            url=f'{get_rts_url()}/api/subscribe_token/list',
+            params=params,
+        ):
+            yield http_context.build_response(dict_data, SubscribeToken.from_dict)
+
+@traced(result_attribute='token_id')
 async def create(
         api_secret: str,
         token: CreateSubscribeToken,
+        http_context: StreamingHttpContext | None = None,
     ) -> SubscribeToken:
     payload = {
         'label': token.label,
@@ -125,11 +158,11 @@ async def create(
             'trackingId': token.tracking_id,
         }
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_post(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/subscribe_token',
             payload=payload,
         )
 
-    return SubscribeToken.from_dict(dict_data)
+    return http_context.build_response(dict_data, SubscribeToken.from_dict)
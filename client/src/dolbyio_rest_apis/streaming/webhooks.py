@@ -6,36 +6,44 @@ This module contains the functions to work with the Webhooks APIs.
 """
 
 from dolbyio_rest_apis.core.helpers import add_if_not_none
+from dolbyio_rest_apis.core.telemetry import traced
 from dolbyio_rest_apis.core.urls import get_rts_url
 from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
 from dolbyio_rest_apis.streaming.models.webhooks import CreateWebhook, UpdateWebhook, Webhook
+from typing import AsyncIterator
 
+@traced
 async def read(
         api_secret: str,
         webhook_id: int,
+        http_context: StreamingHttpContext | None = None,
     ) -> Webhook:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/webhooks/{webhook_id}',
         )
 
-    return Webhook.from_dict(dict_data)
+    return http_context.build_response(dict_data, Webhook.from_dict)
 
+@traced
 async def delete(
         api_secret: str,
         webhook_id: int,
+        http_context: StreamingHttpContext | None = None,
     ) -> None:
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         await http_context.requests_delete(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/webhooks/{webhook_id}',
         )
 
+@traced
 async def update(
         api_secret: str,
         webhook_id: int,
         webhook: UpdateWebhook,
+        http_context: StreamingHttpContext | None = None,
     ) -> Webhook:
     payload = {}
     add_if_not_none(payload, 'url', webhook.url)
@@ -46,20 +54,22 @@ async def update(
     add_if_not_none(payload, 'isTranscoderHooks', webhook.is_transcoder_hooks)
     add_if_not_none(payload, 'isClipHooks', webhook.is_clip_hooks)
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_put(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/webhooks/{webhook_id}',
             payload=payload,
         )
 
-    return Webhook.from_dict(dict_data)
+    return http_context.build_response(dict_data, Webhook.from_dict)
 
+@traced
 async def list_webhooks(
         api_secret: str,
         starting_id: int,
         item_count: int = 10,
         is_descending: bool = False,
+        http_context: StreamingHttpContext | None = None,
     ) -> list[Webhook]:
     params = {
         'startingId': str(starting_id),
@@ -67,21 +77,42 @@ async def list_webhooks(
         'isDescending': str(is_descending),
     }
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_get(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/webhooks/list',
             params=params,
         )
 
-    webhooks = []
-    for webhook in dict_data:
-        webhooks.append(Webhook.from_dict(webhook))
-    return webhooks
+    return http_context.build_response(dict_data, lambda webhooks: [Webhook.from_dict(webhook) for webhook in webhooks])
 
+@traced
+async def iter_webhooks(
+        api_secret: str,
+        starting_id: int,
+        item_count: int = 10,
+        is_descending: bool = False,
+        http_context: StreamingHttpContext | None = None,
+    ) -> AsyncIterator[Webhook]:
+    params = {
+        'startingId': str(starting_id),
+        'item_count': str(item_count),
+        'isDescending': str(is_descending),
+    }
+
+    async with StreamingHttpContext.use(http_context) as http_context:
+        async for dict_data in http_context.requests_get_items(
+            api_secret=api_secret,
+            url=f'{get_rts_url()}/api/webhooks/list',
+            params=params,
+        ):
+            yield http_context.build_response(dict_data, Webhook.from_dict)
+
+@traced(result_attribute='webhook_id')
 async def create(
         api_secret: str,
         webhook: CreateWebhook,
+        http_context: StreamingHttpContext | None = None,
     ) -> Webhook:
     payload = {
         'url': webhook.url,
@@ -92,11 +123,11 @@ async def create(
     add_if_not_none(payload, 'isTranscoderHooks', webhook.is_transcoder_hooks)
     add_if_not_none(payload, 'isClipHooks', webhook.is_clip_hooks)
 
-    async with StreamingHttpContext() as http_context:
+    async with StreamingHttpContext.use(http_context) as http_context:
         dict_data = await http_context.requests_post(
             api_secret=api_secret,
             url=f'{get_rts_url()}/api/webhooks',
             payload=payload,
         )
 
-    return Webhook.from_dict(dict_data)
+    return http_context.build_response(dict_data, Webhook.from_dict)
@@ -0,0 +1,131 @@
+"""
+Tests of dolbyio_rest_apis.core.compression
+"""
+
+import gzip
+import json
+import unittest
+from unittest import mock
+import zlib
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from dolbyio_rest_apis.core import compression
+from dolbyio_rest_apis.core.compression import CompressionStats, ContentDecoder
+from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
+
+BODY = json.dumps({ 'status': 'success', 'data': [ { 'id': i, 'name': f'stream {i}' } for i in range(200) ] }).encode('utf-8')
+
+def deflate(data: bytes, wbits: int) -> bytes:
+    compressor = zlib.compressobj(wbits=wbits)
+    return compressor.compress(data) + compressor.flush()
+
+def decode(encoding: str | None, data: bytes, chunk_size: int) -> bytes:
+    decoder = ContentDecoder(encoding)
+    decoded = b''.join(decoder.decompress(data[offset:offset + chunk_size]) for offset in range(0, len(data), chunk_size))
+    return decoded + decoder.flush()
+
+class ContentDecoderTest(unittest.TestCase):
+
+    def test_identity(self):
+        for encoding in (None, 'identity', ' Identity '):
+            with self.subTest(encoding=encoding):
+                self.assertEqual(decode(encoding, BODY, 100), BODY)
+
+    def test_gzip(self):
+        data = gzip.compress(BODY)
+        for chunk_size in (1, 10, len(data)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(decode('gzip', data, chunk_size), BODY)
+        self.assertEqual(decode('x-gzip', data, 100), BODY)
+
+    def test_deflate(self):
+        r"""The deflate bodies are decoded with or without the zlib header."""
+
+        for name, wbits in (('zlib', zlib.MAX_WBITS), ('raw', -zlib.MAX_WBITS)):
+            data = deflate(BODY, wbits)
+            for chunk_size in (1, 2, 10, len(data)):
+                with self.subTest(format=name, chunk_size=chunk_size):
+                    self.assertEqual(decode('deflate', data, chunk_size), BODY)
+
+    def test_invalid_deflate(self):
+        with self.assertRaises(zlib.error):
+            decode('deflate', b'\xff' * 10, 1)
+
+    def test_brotli_missing(self):
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(compression.get_accept_encoding(), 'gzip')
+            with self.assertRaises(ValueError):
+                ContentDecoder('br')
+
+    @unittest.skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_brotli(self):
+        data = compression.brotli.compress(BODY)
+        self.assertEqual(compression.get_accept_encoding(), 'br, gzip')
+        self.assertEqual(decode('br', data, 10), BODY)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            ContentDecoder('compress')
+
+class CompressionStatsTest(unittest.TestCase):
+
+    def test_record(self):
+        stats = CompressionStats()
+        stats.record('gzip', 100, 1000)
+        stats.record('identity', 50, 50)
+        stats.record('gzip', 10, 30)
+
+        self.assertEqual(stats.nb_responses, 3)
+        self.assertEqual(stats.nb_compressed_responses, 2)
+        self.assertEqual(stats.wire_bytes, 160)
+        self.assertEqual(stats.decoded_bytes, 1080)
+        self.assertEqual(stats.saved_bytes, 920)
+        self.assertEqual(stats.wire_bytes_per_encoding, { 'gzip': 110, 'identity': 50 })
+        self.assertEqual(stats.decoded_bytes_per_encoding, { 'gzip': 1030, 'identity': 50 })
+
+class CompressedResponsesTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.accept_encodings = []
+
+        async def handle(request: web.Request) -> web.Response:
+            self.accept_encodings.append(request.headers.get('Accept-Encoding'))
+            encoding = request.match_info['encoding']
+            if encoding == 'gzip':
+                body = gzip.compress(BODY)
+            elif encoding == 'deflate':
+                body = deflate(BODY, -zlib.MAX_WBITS)
+            else:
+                body = BODY
+            headers = { 'Content-Type': 'application/json' }
+            if encoding != 'identity':
+                headers['Content-Encoding'] = encoding
+            return web.Response(body=body, headers=headers)
+
+        app = web.Application()
+        app.router.add_get('/api/{encoding}', handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_saved_bytes(self):
+        async with StreamingHttpContext() as http_context:
+            for encoding in ('gzip', 'deflate', 'identity'):
+                data = await http_context.requests_get('secret', str(self.server.make_url(f'/api/{encoding}')))
+                self.assertEqual(data, json.loads(BODY)['data'])
+
+            stats = http_context.compression_stats
+
+        gzip_size = len(gzip.compress(BODY))
+        deflate_size = len(deflate(BODY, -zlib.MAX_WBITS))
+        self.assertEqual(self.accept_encodings, [ compression.get_accept_encoding() ] * 3)
+        self.assertEqual(stats.nb_responses, 3)
+        self.assertEqual(stats.nb_compressed_responses, 2)
+        self.assertEqual(stats.wire_bytes_per_encoding, { 'gzip': gzip_size, 'deflate': deflate_size, 'identity': len(BODY) })
+        self.assertEqual(stats.decoded_bytes_per_encoding, { 'gzip': len(BODY), 'deflate': len(BODY), 'identity': len(BODY) })
+        self.assertEqual(stats.saved_bytes, 2 * len(BODY) - gzip_size - deflate_size)
+
+if __name__ == '__main__':
+    unittest.main()
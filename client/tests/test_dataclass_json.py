@@ -0,0 +1,80 @@
+"""
+Tests of dolbyio_rest_apis.core.dataclass_json
+"""
+
+import dataclasses
+from typing import Any, Dict, List, Optional
+import unittest
+import warnings
+import dataclasses_json
+from dolbyio_rest_apis.core.dataclass_json import LetterCase, dataclass_json
+
+def _create_models(decorator):
+    @decorator
+    @dataclasses.dataclass
+    class Child:
+        name: str = None
+        value: int = 0
+
+    @decorator
+    @dataclasses.dataclass
+    class Parent:
+        children: List[Child] = dataclasses.field(default_factory=list)
+        optional_children: List[Optional[Child]] = dataclasses.field(default_factory=list)
+        nested_children: List[List[Child]] = dataclasses.field(default_factory=list)
+        dictionaries: List[dict] = dataclasses.field(default_factory=list)
+        names: List[str] = dataclasses.field(default_factory=list)
+        child: Optional[Child] = None
+
+    return Parent
+
+class DataclassJsonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.generated_model = _create_models(lambda cls: dataclass_json(cls, letter_case=LetterCase.CAMEL))
+        self.dataclasses_json_model = _create_models(
+            lambda cls: dataclasses_json.dataclass_json(cls, letter_case=dataclasses_json.LetterCase.CAMEL),
+        )
+
+    def _decode(self, model: type, payload: Dict[str, Any], infer_missing: bool) -> Any:
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            result = model.from_dict(payload, infer_missing=infer_missing)
+        return repr(result), [str(warning.message) for warning in caught_warnings]
+
+    def test_null_items(self):
+        r"""The null items in the lists of nested models are decoded like dataclasses_json."""
+
+        payloads = [
+            { 'children': [None, { 'name': 'child', 'value': '1' }] },
+            { 'optionalChildren': [None, { 'name': 'child' }] },
+            { 'nestedChildren': [[None, { 'value': 2 }], None] },
+            { 'dictionaries': [None, { 'key': 'value' }] },
+            { 'names': ['name', 1] },
+            { 'child': { 'name': None } },
+        ]
+
+        for payload in payloads:
+            for infer_missing in (False, True):
+                with self.subTest(payload=payload, infer_missing=infer_missing):
+                    self.assertEqual(
+                        self._decode(self.generated_model, payload, infer_missing),
+                        self._decode(self.dataclasses_json_model, payload, infer_missing),
+                    )
+
+    def test_fallback(self):
+        r"""The classes the generated functions do not support are converted by dataclasses_json."""
+
+        @dataclass_json(letter_case=LetterCase.CAMEL)
+        @dataclasses.dataclass
+        class Renamed:
+            first_name: str = dataclasses.field(default=None, metadata=dataclasses_json.config(field_name='name'))
+            last_name: str = None
+
+        model = Renamed.from_dict({ 'name': 'first', 'lastName': 'last' })
+        self.assertEqual(model, Renamed('first', 'last'))
+        self.assertEqual(model.to_dict(), { 'name': 'first', 'lastName': 'last' })
+        self.assertEqual(model.to_json(), '{"name": "first", "lastName": "last"}')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,365 @@
+"""
+Tests of the file uploads and downloads of dolbyio_rest_apis.core.http_context
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+from aiohttp import ClientPayloadError, ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from dolbyio_rest_apis.core import http_context
+from dolbyio_rest_apis.core.file_transfer import DownloadManifest, TransferProgress
+from dolbyio_rest_apis.media.internal.http_context import MediaHttpContext
+
+CHUNK_SIZE = 64 * 1024
+FILE_CONTENT = os.urandom(4 * CHUNK_SIZE + 1000)
+
+class DownloadManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, 'file.bin')
+
+    def test_add(self):
+        r"""The overlapping and adjacent ranges are merged."""
+
+        manifest = DownloadManifest(self.file_path, 'source', 100)
+        manifest.add(50, 60)
+        manifest.add(10, 20)
+        self.assertEqual(manifest.ranges, [[10, 20], [50, 60]])
+
+        manifest.add(20, 30)
+        self.assertEqual(manifest.ranges, [[10, 30], [50, 60]])
+
+        manifest.add(25, 55)
+        self.assertEqual(manifest.ranges, [[10, 60]])
+
+        manifest.add(0, 5)
+        manifest.add(70, 80)
+        manifest.add(15, 75)
+        self.assertEqual(manifest.ranges, [[0, 5], [10, 80]])
+        self.assertEqual(manifest.completed_bytes, 75)
+
+    def test_missing_ranges(self):
+        manifest = DownloadManifest(self.file_path, 'source', 100)
+        self.assertEqual(manifest.missing_ranges(), [(0, 100)])
+
+        manifest.add(0, 10)
+        manifest.add(40, 50)
+        self.assertEqual(manifest.missing_ranges(), [(10, 40), (50, 100)])
+
+        manifest.add(90, 100)
+        self.assertEqual(manifest.missing_ranges(), [(10, 40), (50, 90)])
+
+        manifest.add(10, 90)
+        self.assertEqual(manifest.missing_ranges(), [])
+
+    def test_matches(self):
+        manifest = DownloadManifest(self.file_path, 'source', 100, '"etag"', 'date')
+        self.assertTrue(manifest.matches('source', 100, '"etag"', 'date'))
+        self.assertFalse(manifest.matches('other', 100, '"etag"', 'date'))
+        self.assertFalse(manifest.matches('source', 101, '"etag"', 'date'))
+        self.assertFalse(manifest.matches('source', 100, '"changed"', 'date'))
+        self.assertFalse(manifest.matches('source', 100, None, 'date'))
+        self.assertFalse(manifest.matches('source', 100, '"etag"', 'other date'))
+
+    def test_save(self):
+        with open(self.file_path, 'wb') as file:
+            file.truncate(100)
+
+        manifest = DownloadManifest(self.file_path, 'source', 100, '"etag"')
+        manifest.add(40, 50)
+        manifest.add(0, 10)
+        manifest.save()
+
+        loaded = DownloadManifest.load(self.file_path)
+        self.assertEqual(
+            (loaded.source, loaded.size, loaded.etag, loaded.last_modified, loaded.ranges),
+            ('source', 100, '"etag"', None, [[0, 10], [40, 50]]),
+        )
+
+        # The ranges given are saved instead of the current ones
+        manifest.add(10, 20)
+        manifest.save([[0, 5]])
+        self.assertEqual(DownloadManifest.load(self.file_path).ranges, [[0, 5]])
+
+        manifest.delete()
+        self.assertFalse(os.path.exists(manifest.manifest_path))
+        self.assertIsNone(DownloadManifest.load(self.file_path))
+        manifest.delete()
+
+    def test_load_rejected(self):
+        r"""The manifest is ignored when the file on disk does not have the size of the file downloaded."""
+
+        with open(self.file_path, 'wb') as file:
+            file.truncate(99)
+        manifest = DownloadManifest(self.file_path, 'source', 100)
+        manifest.save()
+        self.assertIsNone(DownloadManifest.load(self.file_path))
+
+        with open(manifest.manifest_path, 'w', encoding='utf-8') as manifest_file:
+            manifest_file.write('{ "version": 1')
+        self.assertIsNone(DownloadManifest.load(self.file_path))
+
+class FileTransferTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        temp_dir = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, 'file.bin')
+
+        # No waiting between the attempts
+        patcher = mock.patch.object(http_context, 'RETRY_START_TIMEOUT', 0.0)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        self.app = web.Application()
+        self.server = TestServer(self.app)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+class UploadTest(FileTransferTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        with open(self.file_path, 'wb') as file:
+            file.write(FILE_CONTENT)
+
+        self.bodies = []
+        self.statuses = [503, 200]
+
+        async def handle(request: web.Request) -> web.Response:
+            self.bodies.append(await request.read())
+            return web.Response(status=self.statuses[len(self.bodies) - 1])
+
+        self.app.router.add_put('/upload', handle)
+        await self.server.start_server()
+
+    async def test_upload(self):
+        self.statuses = [200]
+        async with MediaHttpContext() as media_http_context:
+            await media_http_context.upload(str(self.server.make_url('/upload')), self.file_path, chunk_size=CHUNK_SIZE)
+
+        self.assertEqual(self.bodies, [FILE_CONTENT])
+
+    async def test_retry_after_server_error(self):
+        r"""The body is sent again from the start after a server error, and the progress starts over."""
+
+        events = []
+        def on_progress(progress: TransferProgress):
+            events.append((progress.attempt, progress.transferred_bytes, progress.total_bytes))
+
+        with self.assertLogs('MediaHttpContext', 'WARNING') as logs:
+            async with MediaHttpContext() as media_http_context:
+                await media_http_context.upload(
+                    str(self.server.make_url('/upload')), self.file_path, on_progress=on_progress, chunk_size=CHUNK_SIZE,
+                )
+
+        self.assertIn('failed with the status 503, attempt 1 out of', logs.output[0])
+
+        self.assertEqual(self.bodies, [FILE_CONTENT, FILE_CONTENT])
+
+        size = len(FILE_CONTENT)
+        expected_bytes = [CHUNK_SIZE, 2 * CHUNK_SIZE, 3 * CHUNK_SIZE, 4 * CHUNK_SIZE, size]
+        self.assertEqual(events, [(1, nb_bytes, size) for nb_bytes in expected_bytes] + [(2, nb_bytes, size) for nb_bytes in expected_bytes])
+
+class DownloadTest(FileTransferTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+
+        # Small ranges, to download the file in several parts
+        for name, value in (('DOWNLOAD_PART_MIN_SIZE', CHUNK_SIZE), ('DOWNLOAD_CHUNK_SIZE', CHUNK_SIZE // 4)):
+            patcher = mock.patch.object(http_context, name, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+        self.ranges = []
+        self.served_bytes = 0
+        self.etag = '"1"'
+        self.ignore_range = False
+        self.bad_range_requests = set()
+        self.dropped_requests = set()
+
+        self.app.router.add_get('/download', self.handle)
+        await self.server.start_server()
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        index = len(self.ranges)
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', request.headers.get('Range', ''))
+        if self.ignore_range or match is None:
+            self.ranges.append(None)
+            self.served_bytes += len(FILE_CONTENT)
+            return web.Response(body=FILE_CONTENT, headers={ 'ETag': self.etag })
+
+        start = int(match.group(1))
+        end = min(int(match.group(2)) + 1 if match.group(2) else len(FILE_CONTENT), len(FILE_CONTENT))
+        self.ranges.append((start, end))
+        body = FILE_CONTENT[start:end]
+        self.served_bytes += len(body)
+        if index in self.bad_range_requests:
+            start += 1
+        headers = { 'Content-Range': f'bytes {start}-{end - 1}/{len(FILE_CONTENT)}', 'ETag': self.etag }
+
+        if index not in self.dropped_requests:
+            return web.Response(status=206, body=body, headers=headers)
+
+        # Half of the range is sent before the connection is closed
+        response = web.StreamResponse(status=206, headers=headers)
+        response.content_length = len(body)
+        await response.prepare(request)
+        await response.write(body[:len(body) // 2])
+        await asyncio.sleep(0.1)
+        request.transport.close()
+        return response
+
+    async def download(self, parallel_parts: int=4, on_progress=None):
+        async with MediaHttpContext() as media_http_context:
+            await media_http_context.download(
+                'token', str(self.server.make_url('/download')), self.file_path, on_progress=on_progress, parallel_parts=parallel_parts,
+            )
+
+    async def cancel_download(self) -> DownloadManifest:
+        r"""Cancels a download once half of the file is written, and gets the manifest left."""
+
+        def on_progress(progress: TransferProgress):
+            if progress.transferred_bytes >= len(FILE_CONTENT) // 2:
+                task.cancel()
+
+        task = asyncio.ensure_future(self.download(on_progress=on_progress))
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        manifest = DownloadManifest.load(self.file_path)
+        self.assertIsNotNone(manifest)
+        self.assertTrue(0 < manifest.completed_bytes < len(FILE_CONTENT))
+        return manifest
+
+    def assert_downloaded(self):
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(file.read(), FILE_CONTENT)
+
+    async def test_ranges(self):
+        await self.download()
+
+        self.assert_downloaded()
+        self.assertEqual(self.ranges[0], (0, CHUNK_SIZE))
+        self.assertGreater(len(self.ranges), 2)
+        # Each byte is requested once
+        ranges = sorted(self.ranges)
+        self.assertEqual(ranges[-1][1], len(FILE_CONTENT))
+        for previous, current in zip(ranges, ranges[1:]):
+            self.assertEqual(previous[1], current[0])
+
+    async def test_single_request(self):
+        await self.download(parallel_parts=1)
+
+        self.assert_downloaded()
+        self.assertEqual(self.ranges, [(0, len(FILE_CONTENT))])
+
+    async def test_range_ignored(self):
+        r"""The whole file is written from the first response when the server ignores the `Range` header."""
+
+        self.ignore_range = True
+        await self.download()
+
+        self.assert_downloaded()
+        self.assertEqual(self.ranges, [None])
+
+    async def test_bad_content_range(self):
+        self.bad_range_requests.add(0)
+        with self.assertRaises(ClientPayloadError):
+            await self.download()
+
+        self.bad_range_requests = { 1 }
+        self.ranges.clear()
+        with self.assertRaises(ClientResponseError):
+            await self.download()
+
+    async def test_connection_dropped(self):
+        r"""A range resumes from the last byte written when the connection is closed."""
+
+        self.dropped_requests.add(1)
+        with self.assertLogs('MediaHttpContext', 'WARNING'):
+            await self.download()
+
+        self.assert_downloaded()
+        start, end = self.ranges[1]
+        retries = [ (retry_start, retry_end) for retry_start, retry_end in self.ranges[2:] if retry_end == end ]
+        self.assertEqual(len(retries), 1)
+        self.assertGreater(retries[0][0], start)
+        self.assertLess(retries[0][0], end)
+
+    async def test_resume(self):
+        r"""A download cancelled halfway only fetches the missing ranges when it is resumed."""
+
+        manifest = await self.cancel_download()
+        self.served_bytes = 0
+        self.ranges.clear()
+
+        events = []
+        await self.download(on_progress=lambda progress: events.append((progress.resumed_bytes, progress.transferred_bytes)))
+
+        self.assert_downloaded()
+        self.assertEqual(self.served_bytes, len(FILE_CONTENT) - manifest.completed_bytes)
+        # The ranges requested cover the missing ranges, and nothing else
+        requested = []
+        for start, end in sorted(self.ranges):
+            if requested and requested[-1][1] == start:
+                start = requested.pop()[0]
+            requested.append((start, end))
+        self.assertEqual(requested, manifest.missing_ranges())
+        self.assertEqual(events[-1], (manifest.completed_bytes, len(FILE_CONTENT)))
+        self.assertFalse(os.path.exists(manifest.manifest_path))
+
+    async def test_resume_changed_file(self):
+        r"""The download starts over when the ETag of the file changed on the server."""
+
+        await self.cancel_download()
+        self.etag = '"2"'
+        self.served_bytes = 0
+
+        with self.assertLogs('MediaHttpContext', 'INFO'):
+            await self.download()
+
+        self.assert_downloaded()
+        # The first range of the resumed download, then the whole file
+        self.assertGreater(self.served_bytes, len(FILE_CONTENT))
+        self.assertIsNone(DownloadManifest.load(self.file_path))
+
+    async def test_complete_manifest(self):
+        r"""A complete file left with its manifest is kept, once its ETag is checked."""
+
+        with open(self.file_path, 'wb') as file:
+            file.write(FILE_CONTENT)
+        source = str(self.server.make_url('/download'))
+
+        DownloadManifest(self.file_path, source, len(FILE_CONTENT), '"1"', ranges=[[0, len(FILE_CONTENT)]]).save()
+        await self.download()
+        self.assertEqual(self.ranges, [(0, 1)])
+        self.assertIsNone(DownloadManifest.load(self.file_path))
+
+        # Without ETag, the file is kept without any request
+        self.ranges.clear()
+        DownloadManifest(self.file_path, source, len(FILE_CONTENT), ranges=[[0, len(FILE_CONTENT)]]).save()
+        await self.download()
+        self.assertEqual(self.ranges, [])
+        self.assertIsNone(DownloadManifest.load(self.file_path))
+        self.assert_downloaded()
+
+        # The file changed on the server, it is downloaded again
+        with open(self.file_path, 'wb') as file:
+            file.truncate(len(FILE_CONTENT))
+        DownloadManifest(self.file_path, source, len(FILE_CONTENT), '"0"', ranges=[[0, len(FILE_CONTENT)]]).save()
+        with self.assertLogs('MediaHttpContext', 'INFO'):
+            await self.download()
+        self.assertEqual(self.ranges[0], (0, 1))
+        self.assert_downloaded()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests of dolbyio_rest_apis.core.json_stream
+"""
+
+import asyncio
+import json
+import unittest
+from dolbyio_rest_apis.core.json_stream import JsonArrayParser, iter_json_array
+
+DOCUMENT = json.dumps({
+    'status': 'success',
+    'meta': { 'list': [ 1, 2, 3 ], 'text': 'not the data ]' },
+    'data': [
+        { 'name': 'a]b,c', 'quote': 'say \"hi\" \\ ]', 'unicode': 'café ✓' },
+        [ 1, [ 2, [ 3, {} ] ], [] ],
+        { 'nested': { 'list': [ { 'x': '}' }, { 'y': '[' } ] } },
+        'a string, with ] in it',
+        -12.5e3,
+        1234567,
+        True,
+        None,
+        [],
+        {},
+    ],
+    'after': [ 'ignored' ],
+}, ensure_ascii=False).encode('utf-8')
+
+EXPECTED = json.loads(DOCUMENT)['data']
+
+def parse(document: bytes, chunk_size: int, key: str | None='data') -> list:
+    parser = JsonArrayParser(key)
+    items = []
+    for offset in range(0, len(document), chunk_size):
+        items.extend(parser.feed(document[offset:offset + chunk_size]))
+    items.extend(parser.close())
+    return items
+
+class JsonArrayParserTest(unittest.TestCase):
+
+    def test_any_split(self):
+        r"""The items are the same whatever the size of the chunks, even when they split a UTF-8 character."""
+
+        for chunk_size in (1, 2, 3, 7, 64, len(DOCUMENT)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(parse(DOCUMENT, chunk_size), EXPECTED)
+
+    def test_items_as_received(self):
+        parser = JsonArrayParser()
+        self.assertEqual(parser.feed(b'{"data": [{"a": 1}, {"b"'), [ { 'a': 1 } ])
+        self.assertEqual(parser.feed(b': 2}, 3'), [ { 'b': 2 } ])
+        # The number may continue in the next part
+        self.assertEqual(parser.feed(b'4'), [])
+        self.assertEqual(parser.feed(b']'), [ 34 ])
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.feed(b', "after": 1}'), [])
+        self.assertEqual(parser.close(), [])
+
+    def test_number_at_the_end(self):
+        parser = JsonArrayParser(None)
+        self.assertEqual(parser.feed(b'[1.5, 2'), [ 1.5 ])
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_empty_array(self):
+        self.assertEqual(parse(b'{"data": []}', 1), [])
+        self.assertEqual(parse(b'[ ]', 1, None), [])
+
+    def test_top_level_array(self):
+        document = json.dumps(EXPECTED).encode('utf-8')
+        self.assertEqual(parse(document, 5, None), EXPECTED)
+
+    def test_missing_key(self):
+        parser = JsonArrayParser()
+        self.assertEqual(parser.feed(b'{"status": "fail", "data": {"message": "x"}, "other": [1]}'), [])
+        self.assertEqual(parser.close(), [])
+        self.assertTrue(parser.done)
+
+    def test_truncated(self):
+        array_end = DOCUMENT.index(b'], "after"')
+        for end in (0, 1, 10, array_end // 2, array_end):
+            with self.subTest(end=end):
+                with self.assertRaises(ValueError):
+                    parse(DOCUMENT[:end], 16)
+
+    def test_end_after_the_array(self):
+        r"""The end of the document after the array is not needed."""
+
+        array_end = DOCUMENT.index(b'], "after"') + 1
+        self.assertEqual(parse(DOCUMENT[:array_end], 16), EXPECTED)
+
+    def test_truncated_string(self):
+        with self.assertRaises(ValueError):
+            parse(b'{"data": ["abc', 4)
+        with self.assertRaises(ValueError):
+            parse(b'{"da', 4)
+
+    def test_invalid(self):
+        for document in (b'[1]', b'{"data": [1 2]}', b'{"data": [1,, 2]}', b'{"data" [1]}', b'{1: [1]}'):
+            with self.subTest(document=document):
+                with self.assertRaises(ValueError):
+                    parse(document, 1)
+
+    def test_iter_json_array(self):
+        async def chunks():
+            for offset in range(0, len(DOCUMENT), 10):
+                yield DOCUMENT[offset:offset + 10]
+
+        async def collect():
+            return [ item async for item in iter_json_array(chunks()) ]
+
+        self.assertEqual(asyncio.run(collect()), EXPECTED)
+
+if __name__ == '__main__':
+    unittest.main()
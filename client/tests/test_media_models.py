@@ -0,0 +1,54 @@
+"""
+Tests of dolbyio_rest_apis.media.models
+"""
+
+import unittest
+from dolbyio_rest_apis.media.models.job_response import JobResponse
+from dolbyio_rest_apis.media.models.transcode_response import TranscodeJob, TranscodeJobResult
+from dolbyio_rest_apis.media.models.webhook import Webhook
+
+class WebhookTest(unittest.TestCase):
+
+    def test_read(self):
+        webhook = Webhook({ 'webhook_id': 'id', 'callback': { 'url': 'https://example.com', 'headers': { 'a': 'b' } } })
+        self.assertEqual(webhook.webhook_id, 'id')
+        self.assertEqual(webhook.url, 'https://example.com')
+        self.assertEqual(webhook.headers, { 'a': 'b' })
+
+        self.assertIsNone(Webhook({}).url)
+        self.assertIsNone(Webhook({}).headers)
+
+    def test_write(self):
+        r"""The callback attributes are written in the callback of the dictionary."""
+
+        webhook = Webhook({ 'webhook_id': 'id' })
+        webhook.url = 'https://example.com'
+        webhook.headers = { 'a': 'b' }
+        self.assertEqual(webhook, { 'webhook_id': 'id', 'callback': { 'url': 'https://example.com', 'headers': { 'a': 'b' } } })
+
+        webhook.url = 'https://example.org'
+        self.assertEqual(webhook.url, 'https://example.org')
+        self.assertEqual(webhook['callback']['headers'], { 'a': 'b' })
+
+class JobResponseTest(unittest.TestCase):
+
+    def test_result(self):
+        r"""The base job response has no result, even when the dictionary has one."""
+
+        job = JobResponse('job', { 'status': 'Success', 'result': { 'version': '1' } })
+        self.assertEqual(job.job_id, 'job')
+        self.assertEqual(job.status, 'Success')
+        self.assertIsNone(job.result)
+
+        job.result = 'value'
+        self.assertEqual(job.result, 'value')
+        self.assertEqual(job['result'], { 'version': '1' })
+
+    def test_subclass_result(self):
+        job = TranscodeJob('job', { 'status': 'Success', 'result': { 'version': '1' } })
+        self.assertIsInstance(job.result, TranscodeJobResult)
+        self.assertEqual(job.result.version, '1')
+        self.assertIsNone(TranscodeJob('job', {}).result)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+"""
+Tests of dolbyio_rest_apis.core.metrics
+"""
+
+import unittest
+from dolbyio_rest_apis.core.metrics import HttpMetrics, MAX_LABEL_VALUES, MetricsRegistry, OTHER_LABEL_VALUE
+
+class HttpMetricsTest(unittest.TestCase):
+
+    def test_endpoint_template(self):
+        metrics = HttpMetrics(MetricsRegistry())
+        self.assertEqual(metrics.get_endpoint('/api/token/1234'), metrics.get_endpoint('/api/token/5678'))
+
+    def test_endpoint_cardinality(self):
+        r"""The paths that are not API endpoints, like the paths of the storage, are grouped once the limit is reached."""
+
+        registry = MetricsRegistry()
+        metrics = HttpMetrics(registry)
+        endpoints = {metrics.get_endpoint(f'/storage/file-{i}.mp4') for i in range(2 * MAX_LABEL_VALUES)}
+        self.assertEqual(len(endpoints), MAX_LABEL_VALUES + 1)
+        self.assertIn(OTHER_LABEL_VALUE, endpoints)
+
+        # The limit is shared by the HTTP contexts using the same registry
+        self.assertEqual(HttpMetrics(registry).get_endpoint('/storage/another-file.mp4'), OTHER_LABEL_VALUE)
+        self.assertNotEqual(metrics.get_endpoint('/storage/file-0.mp4'), OTHER_LABEL_VALUE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests of dolbyio_rest_apis.core.rate_limiter
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from dolbyio_rest_apis.core.rate_limiter import RateLimiter, RateLimiterRegistry, SharedRateLimiter
+from dolbyio_rest_apis.core.rate_limiter_backends import FileRateLimiterBackend
+
+try:
+    import fcntl
+except ImportError: # Not available on Windows
+    fcntl = None
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_shared_between_event_loops(self):
+        r"""Two threads, each with its own event loop, share the same limiter."""
+
+        limiter = RateLimiter(rate=10, burst=1)
+        nb_requests = 10
+        errors = []
+
+        async def send_requests():
+            for _ in range(nb_requests):
+                await asyncio.wait_for(limiter.wait_until_allowed(), timeout=5.0)
+
+        def run():
+            try:
+                # The debug mode raises when a future is used from another thread
+                asyncio.run(send_requests(), debug=True)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                errors.append(e)
+
+        threads = [ threading.Thread(target=run) for _ in range(2) ]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(errors, [])
+        # 20 requests at 10 requests per second, the first one goes through at once
+        self.assertGreater(elapsed, 1.5)
+        self.assertLess(elapsed, 3.0)
+
+    def test_single_event_loop(self):
+        limiter = RateLimiter(rate=20, burst=5)
+
+        async def send_requests():
+            await asyncio.gather(*(limiter.wait_until_allowed() for _ in range(25)))
+
+        start = time.monotonic()
+        asyncio.run(send_requests())
+        elapsed = time.monotonic() - start
+
+        # 5 requests at once, then 20 requests at 20 requests per second
+        self.assertGreater(elapsed, 0.8)
+        self.assertLess(elapsed, 1.5)
+
+@unittest.skipIf(fcntl is None, 'The file backend requires a POSIX system.')
+class SharedRateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self._backend = FileRateLimiterBackend(self._directory.name)
+
+    def tearDown(self):
+        self._backend.close()
+        self._directory.cleanup()
+
+    def test_locked_bucket_does_not_block_the_event_loop(self):
+        r"""A bucket locked by another process is retried while the event loop keeps running."""
+
+        limiter = SharedRateLimiter(self._backend, 'host:key', rate=10, burst=1, adaptive=False)
+
+        # Lock the bucket from another open file, like another process would
+        bucket_path = os.path.join(self._directory.name, hashlib.sha256(b'host:key').hexdigest())
+        other_fd = os.open(bucket_path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(other_fd, fcntl.LOCK_EX)
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def send_request() -> float:
+            ticker = asyncio.create_task(tick())
+            asyncio.get_running_loop().call_later(0.2, fcntl.flock, other_fd, fcntl.LOCK_UN)
+            start = time.monotonic()
+            await asyncio.wait_for(limiter.wait_until_allowed(), timeout=5.0)
+            ticker.cancel()
+            return time.monotonic() - start
+
+        try:
+            elapsed = asyncio.run(send_request())
+        finally:
+            os.close(other_fd)
+
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertGreater(len(ticks), 10)
+
+    def test_shared_budget(self):
+        r"""Two limiters on the same key, like two processes, share the same budget."""
+
+        limiters = [ SharedRateLimiter(self._backend, 'host:key', rate=20, burst=1) for _ in range(2) ]
+
+        async def send_requests():
+            await asyncio.gather(*(limiter.wait_until_allowed() for limiter in limiters for _ in range(5)))
+
+        start = time.monotonic()
+        asyncio.run(send_requests())
+        elapsed = time.monotonic() - start
+
+        # 10 requests at 20 requests per second, the first one goes through at once
+        self.assertGreater(elapsed, 0.4)
+        self.assertLess(elapsed, 1.0)
+
+    def test_fixed_rate(self):
+        registry = RateLimiterRegistry(rate=10, adaptive=False, backend=self._backend)
+        fixed = registry.get('host', 'secret')
+        adaptive = SharedRateLimiter(self._backend, 'host:other', rate=10)
+
+        async def throttle():
+            fixed.on_throttled(0.1)
+            adaptive.on_throttled(0.1)
+            # Let the pauses reach the backend
+            await asyncio.sleep(0.01)
+
+        asyncio.run(throttle())
+
+        self.assertIsInstance(fixed, SharedRateLimiter)
+        self.assertFalse(fixed.adaptive)
+        self.assertEqual(fixed.rate, 10.0)
+        self.assertTrue(adaptive.adaptive)
+        self.assertEqual(adaptive.rate, 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
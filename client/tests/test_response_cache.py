@@ -0,0 +1,171 @@
+"""
+Tests of dolbyio_rest_apis.core.response_cache
+"""
+
+import unittest
+from unittest import mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from dolbyio_rest_apis.core.response_cache import MemoryResponseCache
+from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
+
+class MemoryResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('dolbyio_rest_apis.core.response_cache.time')
+        self.addCleanup(patcher.stop)
+        patcher.start().monotonic.side_effect = lambda: self.now
+
+    def test_ttl(self):
+        cache = MemoryResponseCache()
+        cache.set('key', { 'value': 1 }, 10.0)
+
+        self.now += 9.9
+        self.assertEqual(cache.get('key'), { 'value': 1 })
+
+        self.now += 0.1
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.nb_hits, 1)
+        self.assertEqual(cache.nb_misses, 1)
+
+    def test_lru_eviction(self):
+        cache = MemoryResponseCache(max_entries=2)
+        cache.set('a', 1, 10.0)
+        cache.set('b', 2, 10.0)
+
+        # Reading a makes b the least recently used
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3, 10.0)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_replace(self):
+        cache = MemoryResponseCache()
+        cache.set('key', 1, 10.0, ('old',))
+        cache.set('key', 2, 10.0, ('new',))
+
+        # The tags of the replaced response no longer apply
+        cache.invalidate('old')
+        self.assertEqual(cache.get('key'), 2)
+
+    def test_invalidate(self):
+        cache = MemoryResponseCache()
+        cache.set('a', 1, 10.0, ('family', 'a'))
+        cache.set('b', 2, 10.0, ('family',))
+        cache.set('c', 3, 10.0, ('other',))
+
+        cache.invalidate('family')
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+        # The keys of the removed responses are no longer tracked by their other tags
+        cache.set('a', 4, 10.0)
+        cache.invalidate('a')
+        self.assertEqual(cache.get('a'), 4)
+
+    def test_clear(self):
+        cache = MemoryResponseCache()
+        cache.set('a', 1, 10.0, ('family',))
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get('a'))
+
+class StreamingResponseCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.nb_requests = 0
+
+        async def handle(request: web.Request) -> web.Response:
+            self.nb_requests += 1
+            return web.json_response({
+                'status': 'success',
+                'data': { 'request': self.nb_requests, 'authorization': request.headers.get('Authorization') },
+            })
+
+        app = web.Application()
+        app.router.add_route('*', '/{path:.*}', handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.cache = MemoryResponseCache()
+        self.http_context = StreamingHttpContext(response_cache=self.cache)
+
+    async def asyncTearDown(self):
+        await self.http_context.close()
+        await self.server.close()
+
+    def url(self, path: str) -> str:
+        return str(self.server.make_url(path))
+
+    async def test_cached_endpoints(self):
+        token_url = self.url('/api/publish_token/1')
+        first = await self.http_context.requests_get('secret', token_url)
+        second = await self.http_context.requests_get('secret', token_url)
+        self.assertIs(first, second)
+        self.assertEqual(self.nb_requests, 1)
+
+        # The query parameters are part of the key
+        await self.http_context.requests_get('secret', token_url, params={ 'a': '1' })
+        self.assertEqual(self.nb_requests, 2)
+
+        # Endpoints without a TTL are never cached
+        await self.http_context.requests_get('secret', self.url('/api/stream_stats/1'))
+        await self.http_context.requests_get('secret', self.url('/api/stream_stats/1'))
+        self.assertEqual(self.nb_requests, 4)
+
+    async def test_invalidate_on_change(self):
+        r"""The requests modifying a resource invalidate the cached responses of its family."""
+
+        token_url = self.url('/api/publish_token/1')
+        cluster_url = self.url('/api/cluster')
+        changes = [
+            lambda: self.http_context.requests_post('secret', self.url('/api/publish_token'), {}),
+            lambda: self.http_context.requests_put('secret', self.url('/api/publish_token/1'), {}),
+            lambda: self.http_context.requests_patch('secret', self.url('/api/publish_token/2'), {}),
+            lambda: self.http_context.requests_delete('secret', self.url('/api/publish_token/1')),
+        ]
+
+        await self.http_context.requests_get('secret', cluster_url)
+        for change in changes:
+            await self.http_context.requests_get('secret', token_url)
+            nb_requests = self.nb_requests
+            await change()
+            await self.http_context.requests_get('secret', token_url)
+
+            # The change and the new GET request
+            self.assertEqual(self.nb_requests, nb_requests + 2)
+
+        # The other families are kept
+        nb_requests = self.nb_requests
+        await self.http_context.requests_get('secret', cluster_url)
+        self.assertEqual(self.nb_requests, nb_requests)
+
+    async def test_credentials(self):
+        r"""The responses are cached per credential, and invalidated for that credential only."""
+
+        token_url = self.url('/api/publish_token/1')
+        response_a = await self.http_context.requests_get('secret_a', token_url)
+        response_b = await self.http_context.requests_get('secret_b', token_url)
+        self.assertEqual(self.nb_requests, 2)
+        self.assertEqual(response_a['authorization'], 'Bearer secret_a')
+        self.assertEqual(response_b['authorization'], 'Bearer secret_b')
+
+        # The secrets are not kept in the cache
+        # pylint: disable-next=protected-access
+        for key in self.cache._entries:
+            self.assertNotIn('secret_', key)
+
+        await self.http_context.requests_delete('secret_a', token_url)
+        self.assertIsNot(await self.http_context.requests_get('secret_a', token_url), response_a)
+        self.assertIs(await self.http_context.requests_get('secret_b', token_url), response_b)
+
+if __name__ == '__main__':
+    unittest.main()
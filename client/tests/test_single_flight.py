@@ -0,0 +1,168 @@
+"""
+Tests of dolbyio_rest_apis.core.single_flight
+"""
+
+import asyncio
+import unittest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from dolbyio_rest_apis.core.single_flight import SingleFlight
+from dolbyio_rest_apis.streaming.internal.http_context import StreamingHttpContext
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_identical_calls(self):
+        r"""The calls made while an identical call is in flight share its result."""
+
+        single_flight = SingleFlight()
+        nb_calls = 0
+        release = asyncio.Event()
+
+        async def call():
+            nonlocal nb_calls
+            nb_calls += 1
+            await release.wait()
+            return { 'value': 42 }
+
+        callers = [ asyncio.ensure_future(single_flight.do('key', call)) for _ in range(5) ]
+        await asyncio.sleep(0)
+        self.assertEqual(single_flight.nb_in_flight, 1)
+
+        release.set()
+        results = await asyncio.gather(*callers)
+
+        self.assertEqual(nb_calls, 1)
+        self.assertEqual(results, [ { 'value': 42 } ] * 5)
+        self.assertIs(results[0], results[4])
+        self.assertEqual(single_flight.nb_calls, 5)
+        self.assertEqual(single_flight.nb_deduplicated, 4)
+        self.assertEqual(single_flight.nb_in_flight, 0)
+
+        # The call is done, the next one is sent again
+        await single_flight.do('key', call)
+        self.assertEqual(nb_calls, 2)
+
+    async def test_different_keys(self):
+        single_flight = SingleFlight()
+        keys = []
+
+        async def call(key: str):
+            keys.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            single_flight.do('a', lambda: call('a')),
+            single_flight.do('b', lambda: call('b')),
+        )
+
+        self.assertEqual(results, [ 'a', 'b' ])
+        self.assertEqual(keys, [ 'a', 'b' ])
+        self.assertEqual(single_flight.nb_deduplicated, 0)
+
+    async def test_exception(self):
+        r"""The exception of the call is raised to every caller."""
+
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            raise ValueError('failed')
+
+        callers = [ asyncio.ensure_future(single_flight.do('key', call)) for _ in range(3) ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        self.assertIs(results[0], results[2])
+        self.assertEqual(single_flight.nb_in_flight, 0)
+
+    async def test_cancelled_caller(self):
+        r"""Cancelling a caller does not cancel the call for the other callers."""
+
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        completed = False
+
+        async def call():
+            nonlocal completed
+            await release.wait()
+            completed = True
+            return 'done'
+
+        cancelled = asyncio.ensure_future(single_flight.do('key', call))
+        waiting = asyncio.ensure_future(single_flight.do('key', call))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+
+        release.set()
+        self.assertEqual(await waiting, 'done')
+        self.assertTrue(completed)
+
+    async def test_all_callers_cancelled(self):
+        r"""The call keeps running when all its callers are cancelled."""
+
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        completed = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            completed.set()
+
+        caller = asyncio.ensure_future(single_flight.do('key', call))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+
+        release.set()
+        await asyncio.wait_for(completed.wait(), timeout=1.0)
+
+class CoalescedRequestsTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.nb_requests = 0
+
+        async def handle(request: web.Request) -> web.Response:
+            self.nb_requests += 1
+            # Keep the request in flight while the other callers arrive
+            await asyncio.sleep(0.1)
+            return web.json_response({
+                'status': 'success',
+                'data': { 'path': request.path, 'authorization': request.headers.get('Authorization') },
+            })
+
+        app = web.Application()
+        app.router.add_get('/{path:.*}', handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_identical_get_requests(self):
+        r"""Concurrent identical GET requests share a single request to the server."""
+
+        url = str(self.server.make_url('/api/item'))
+        async with StreamingHttpContext(coalesce_requests=True) as http_context:
+            results = await asyncio.gather(
+                *(http_context.requests_get('a', url) for _ in range(5)),
+                http_context.requests_get('b', url),
+            )
+
+            self.assertEqual(self.nb_requests, 2)
+            self.assertEqual(results[0], { 'path': '/api/item', 'authorization': 'Bearer a' })
+            self.assertIs(results[0], results[4])
+            self.assertEqual(results[5]['authorization'], 'Bearer b')
+            self.assertEqual(http_context.single_flight.nb_deduplicated, 4)
+
+if __name__ == '__main__':
+    unittest.main()
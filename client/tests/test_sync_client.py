@@ -0,0 +1,43 @@
+"""
+Tests of dolbyio_rest_apis.core.sync_client
+"""
+
+import unittest
+from dolbyio_rest_apis.core.sync_client import EventLoopThread
+from dolbyio_rest_apis.streaming.client import SyncStreamingClient
+
+class SyncClientTest(unittest.TestCase):
+
+    def test_shared_event_loop(self):
+        r"""The clients created without an event loop share the same one, which keeps running when a client is closed."""
+
+        with SyncStreamingClient() as client1, SyncStreamingClient() as client2:
+            self.assertIs(client1.loop_thread, client2.loop_thread)
+            loop_thread = client1.loop_thread
+
+        self.assertFalse(loop_thread.loop.is_closed())
+        with SyncStreamingClient() as client3:
+            self.assertIs(client3.loop_thread, loop_thread)
+
+    def test_own_event_loop(self):
+        loop_thread = EventLoopThread()
+        try:
+            with SyncStreamingClient(loop_thread=loop_thread) as client:
+                self.assertIs(client.loop_thread, loop_thread)
+            self.assertFalse(loop_thread.loop.is_closed())
+        finally:
+            loop_thread.close()
+        self.assertTrue(loop_thread.loop.is_closed())
+
+    def test_generator(self):
+        async def numbers(count: int):
+            for i in range(count):
+                yield i
+
+        with SyncStreamingClient() as client:
+            # pylint: disable-next=protected-access
+            generator = client.publish_token._wrap_generator(numbers)
+            self.assertEqual(list(generator(3)), [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()